@@ -0,0 +1,72 @@
+"""
+bench_agent_construction.py
+
+This module measures how long it takes to build the Google Flights and Kayak agents.
+It exits with a non-zero status when the mean construction time exceeds the budget,
+so it can guard against sleeps or network calls creeping back into the factories.
+
+Usage:
+    poetry run python -m benchmarks.bench_agent_construction [iterations] [budget_seconds]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.main_google_flights import google_flights_search_agent  # noqa: E402
+from src.main_kayak_flights import kayak_flights_search_agent  # noqa: E402
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_BUDGET_SECONDS = 0.5
+
+
+async def measure_construction(agent_factory, iterations: int) -> float:
+    """
+    Build an agent repeatedly and return the mean construction time.
+
+    Args:
+        agent_factory (Callable): Coroutine function that builds the agent.
+        iterations (int): Number of agents to build.
+
+    Returns:
+        float: Mean seconds per construction.
+    """
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        agent = await agent_factory("SFO", "JFK", "2025-10-10", "2025-11-10")
+        if agent is None:
+            raise RuntimeError(f"{agent_factory.__name__} returned no agent")
+    return (time.perf_counter() - started_at) / iterations
+
+
+async def main() -> int:
+    """
+    Run the construction benchmark for every agent factory.
+
+    Returns:
+        int: Process exit status, 0 when every factory is within budget.
+    """
+
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BUDGET_SECONDS
+    exit_status = 0
+
+    for agent_factory in (google_flights_search_agent, kayak_flights_search_agent):
+        mean_seconds = await measure_construction(agent_factory, iterations)
+        is_within_budget = mean_seconds <= budget
+        print(
+            f"{agent_factory.__name__}: {mean_seconds * 1000:.1f} ms/agent "
+            f"(budget {budget * 1000:.0f} ms) {'ok' if is_within_budget else 'FAIL'}"
+        )
+        if not is_within_budget:
+            exit_status = 1
+
+    return exit_status
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
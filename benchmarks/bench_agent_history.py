@@ -0,0 +1,185 @@
+"""
+bench_agent_history.py
+
+This module measures the memory agent runs hold under each history policy, fully
+offline. Hundreds of searches are simulated in one process: every search builds a real
+Kayak agent and records steps with a synthetic screenshot and DOM snapshot through the
+agent's own history method, as a browser run would, then logs its history to the
+rotating agent log. The memory held by a finished run and the traced memory of the
+process across searches are reported, and the process exits non-zero when `summary` or
+`none` hold more than a tenth of `full`, when memory keeps growing from search to
+search, or when the agent log outgrows its rotation bound.
+
+Usage:
+    poetry run python -m benchmarks.bench_agent_history [searches] [steps]
+"""
+
+import asyncio
+import base64
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+SEARCHES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+STEPS = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+SCREENSHOT_BYTES = 150_000
+MAX_GROWTH_BYTES = 2 * 1024 * 1024
+LOG_MAX_BYTES = 256 * 1024
+LOG_BACKUP_COUNT = 2
+
+WORK_DIR = Path(tempfile.mkdtemp(prefix="bench_agent_history_"))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ["AGENT_LOG_PATH"] = str(WORK_DIR / "logs" / "agent.log")
+os.environ["AGENT_LOG_MAX_BYTES"] = str(LOG_MAX_BYTES)
+os.environ["AGENT_LOG_BACKUP_COUNT"] = str(LOG_BACKUP_COUNT)
+
+from browser_use.agent.views import ActionResult, AgentBrain  # noqa: E402
+from browser_use.browser.views import BrowserState, TabInfo  # noqa: E402
+from browser_use.dom.views import DOMElementNode  # noqa: E402
+
+from src.lib.history import (  # noqa: E402
+    HISTORY_POLICIES,
+    HistoryRetention,
+    log_agent_history,
+)
+from src.main_kayak_flights import kayak_flights_search_agent  # noqa: E402
+
+
+def build_browser_state(step: int) -> BrowserState:
+    """
+    Build the page state of one step with a screenshot and a clickable element.
+
+    Args:
+        step (int): The step number, used to vary the state.
+
+    Returns:
+        BrowserState: The synthetic page state.
+    """
+
+    element = DOMElementNode(
+        tag_name="button",
+        xpath=f"html/body/div[{step}]/button",
+        attributes={"class": "show-more-button", "aria-label": "Show more results"},
+        children=[],
+        is_visible=True,
+        parent=None,
+        highlight_index=1,
+    )
+    screenshot = base64.b64encode(os.urandom(SCREENSHOT_BYTES)).decode("ascii")
+    return BrowserState(
+        element_tree=element,
+        selector_map={1: element},
+        url="https://www.kayak.com/flights/SFO-JFK/2025-10-10",
+        title="SFO to JFK",
+        tabs=[TabInfo(page_id=0, url="https://www.kayak.com", title="Kayak")],
+        screenshot=screenshot,
+    )
+
+
+async def simulate_search(policy: str) -> int:
+    """
+    Record the steps of one search and log its history.
+
+    Args:
+        policy (str): The history policy of the run.
+
+    Returns:
+        int: Bytes of traced memory the finished run still holds.
+    """
+
+    agent = await kayak_flights_search_agent("SFO", "JFK", "2025-10-10")
+    gc.collect()
+    held_before = tracemalloc.get_traced_memory()[0]
+
+    retention = HistoryRetention(agent, policy, WORK_DIR / "history")
+    for step in range(1, STEPS + 1):
+        model_output = agent.AgentOutput(
+            current_state=AgentBrain(
+                page_summary="Flight results",
+                evaluation_previous_goal="Success",
+                memory=f"Clicked show more {step} times",
+                next_goal="Load more results",
+            ),
+            action=[agent.ActionModel(click_element={"index": 1})],
+        )
+        result = [ActionResult(extracted_content=f"Clicked {step}")]
+        agent._make_history_item(model_output, build_browser_state(step), result)
+    retention.finish()
+    log_agent_history(agent, agent.history)
+
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - held_before
+
+
+async def measure_policy(policy: str) -> tuple[float, int]:
+    """
+    Simulate the searches under one policy.
+
+    Args:
+        policy (str): The history policy.
+
+    Returns:
+        tuple[float, int]: Mean bytes held per finished run, and the growth of traced
+            memory from the first tenth of the searches to the end.
+    """
+
+    held = []
+    baseline = None
+    for index in range(SEARCHES):
+        held.append(await simulate_search(policy))
+        gc.collect()
+        if index == SEARCHES // 10:
+            baseline = tracemalloc.get_traced_memory()[0]
+
+    return sum(held) / len(held), tracemalloc.get_traced_memory()[0] - baseline
+
+
+async def main() -> int:
+    """
+    Run the history memory benchmark for every policy.
+
+    Returns:
+        int: Process exit status, 0 when memory is bounded under every policy.
+    """
+
+    tracemalloc.start()
+    exit_status = 0
+    held_by_policy = {}
+
+    for policy in reversed(HISTORY_POLICIES):
+        held, growth = await measure_policy(policy)
+        held_by_policy[policy] = held
+        is_steady = growth <= MAX_GROWTH_BYTES
+        print(
+            f"{policy}: {held / 1024:.0f} KiB held per run, "
+            f"{growth / 1024:+.0f} KiB over {SEARCHES} searches "
+            f"{'ok' if is_steady else 'GROWING'}"
+        )
+        exit_status |= not is_steady
+
+    for policy in ("summary", "none"):
+        if held_by_policy[policy] > held_by_policy["full"] / 10:
+            print(f"{policy} holds more than a tenth of full: FAIL")
+            exit_status = 1
+
+    spilled = sum(path.stat().st_size for path in (WORK_DIR / "history").rglob("*"))
+    log_bytes = sum(path.stat().st_size for path in (WORK_DIR / "logs").iterdir())
+    is_log_bounded = log_bytes <= LOG_MAX_BYTES * (LOG_BACKUP_COUNT + 1)
+    print(
+        f"spilled {spilled / 2**20:.0f} MiB, agent log {log_bytes / 1024:.0f} KiB "
+        f"{'ok' if is_log_bounded else 'UNBOUNDED'}"
+    )
+    exit_status |= not is_log_bounded
+
+    return int(exit_status)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
@@ -0,0 +1,93 @@
+"""
+bench_dom_extraction.py
+
+This module checks the DOM extraction fast path against saved results pages and
+measures it. Each fixture is loaded into a headless Chromium page, extracted with the
+provider extractor and compared with its expected JSON output. The report shows the
+extraction latency and the task prompt tokens the LLM agent would have sent per step.
+
+Usage:
+    poetry run python -m benchmarks.bench_dom_extraction [iterations]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from benchmarks.tokens import count_tokens
+from src.lib.google_flights import google_flights_build_url
+from src.lib.google_flights_extractor import extract_google_flights
+from src.lib.kayak_flights import kayak_flights_build_url
+from src.lib.kayak_flights_extractor import extract_kayak_flights
+from src.tasks.google_flights_task import get_google_flights_task
+from src.tasks.kayak_flights_task import get_kayak_flights_task
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DEFAULT_ITERATIONS = 10
+
+CASES = [
+    (
+        "google_flights",
+        extract_google_flights,
+        get_google_flights_task(
+            google_flights_build_url("SFO", "JFK", "2025-10-10"), "SFO", "JFK"
+        ),
+    ),
+    (
+        "kayak_flights",
+        extract_kayak_flights,
+        get_kayak_flights_task(
+            kayak_flights_build_url("SFO", "JFK", "2025-10-10"), "SFO", "JFK"
+        ),
+    ),
+]
+
+
+async def main() -> int:
+    """
+    Run every fixture through its extractor and report latency and tokens avoided.
+
+    Returns:
+        int: Process exit status, 0 when every extraction matches its expected output.
+    """
+
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+    exit_status = 0
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+
+        for name, extractor, task in CASES:
+            html = (FIXTURES_DIR / f"{name}_results.html").read_text(encoding="utf-8")
+            expected = json.loads(
+                (FIXTURES_DIR / f"{name}_results.json").read_text(encoding="utf-8")
+            )
+            await page.set_content(html)
+
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                output = await extractor(page, "SFO-JFK")
+            mean_ms = (time.perf_counter() - started_at) / iterations * 1000
+
+            is_matching = output.model_dump() == expected
+            flights = sum(len(airline.flights) for airline in output.airlines)
+            print(
+                f"{name}: {flights} flights in {mean_ms:.1f} ms, 0 LLM tokens "
+                f"(agent sends {count_tokens(task)} task tokens per step) "
+                f"{'ok' if is_matching else 'MISMATCH'}"
+            )
+            if not is_matching:
+                exit_status = 1
+
+        await browser.close()
+
+    return exit_status
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
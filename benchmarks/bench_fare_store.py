@@ -0,0 +1,163 @@
+"""
+bench_fare_store.py
+
+This module measures the fare history on millions of rows, fully offline. Synthetic
+searches of several routes, travel dates and providers, every few hours over three
+months, are bulk inserted into a temporary fare store, and the insert rate is
+reported. Cheapest-fare trends and price-drop queries are then timed for a whole route
+and for one travel date. The process exits non-zero when a query takes longer than the
+latency bound or returns no result.
+
+Usage:
+    poetry run python -m benchmarks.bench_fare_store [searches_per_date]
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from src.lib.fare_store import FareStore
+from src.lib.flight_records import FlightRecord
+from src.typings import FlightQuery
+
+SEARCHES_PER_DATE = int(sys.argv[1]) if len(sys.argv) > 1 else 720
+ROUTES = ("SFO-JFK", "SFO-LAX", "JFK-LHR", "LAX-NRT", "BOS-ORD")
+TRAVEL_DATES = 30
+PROVIDERS = ("google_flights", "kayak")
+FLIGHTS_PER_SEARCH = 10
+AIRLINES = ("United", "Delta", "American", "JetBlue", "Alaska")
+SEARCH_INTERVAL_SECONDS = 3 * 3600
+FIRST_DATE = date(2025, 10, 1)
+MAX_QUERY_SECONDS = 0.5
+REPEATS = 5
+
+
+def generate_searches(store: FareStore, started_at: float) -> int:
+    """
+    Add every synthetic search to the store, each with its flights.
+
+    Args:
+        store (FareStore): The store the searches are added to.
+        started_at (float): Unix time of the first search.
+
+    Returns:
+        int: The number of fares added.
+    """
+
+    random.seed(0)
+    fares = 0
+    for route in ROUTES:
+        departure, destination = route.split("-")
+        for day in range(TRAVEL_DATES):
+            travel_date = FIRST_DATE + timedelta(days=day)
+            query = FlightQuery(
+                departure=departure,
+                destination=destination,
+                date=travel_date.isoformat(),
+            )
+            departure_at = datetime.combine(travel_date, datetime.min.time())
+            for provider in PROVIDERS:
+                base_price = random.randint(15_000, 60_000)
+                for search in range(SEARCHES_PER_DATE):
+                    drift = random.uniform(0.8, 1.2)
+                    records = [
+                        FlightRecord(
+                            provider,
+                            AIRLINES[flight % len(AIRLINES)],
+                            route,
+                            departure_at + timedelta(hours=flight),
+                            departure_at + timedelta(hours=flight + 5),
+                            300,
+                            int(base_price * drift) + flight * 1_000,
+                            "USD",
+                        )
+                        for flight in range(FLIGHTS_PER_SEARCH)
+                    ]
+                    searched_at = started_at + search * SEARCH_INTERVAL_SECONDS
+                    fares += store.add_search(
+                        provider, query, records, searched_at=searched_at
+                    )
+    store.flush()
+    return fares
+
+
+def time_query(label: str, query) -> bool:
+    """
+    Time a query and print its median latency.
+
+    Args:
+        label (str): Names the query in the output.
+        query (Callable[[], list]): The query to run.
+
+    Returns:
+        bool: Whether the query returned rows within the latency bound.
+    """
+
+    timings = []
+    for _ in range(REPEATS):
+        started_at = time.perf_counter()
+        rows = query()
+        timings.append(time.perf_counter() - started_at)
+
+    seconds = statistics.median(timings)
+    is_ok = bool(rows) and seconds <= MAX_QUERY_SECONDS
+    print(
+        f"{label}: {len(rows)} rows in {seconds * 1000:.1f} ms "
+        f"{'ok' if is_ok else 'FAIL'}"
+    )
+    return is_ok
+
+
+def main() -> int:
+    """
+    Fill a temporary fare store and time the trend and price-drop queries.
+
+    Returns:
+        int: Process exit status, 0 when every query stays within the bound.
+    """
+
+    started_at = time.time() - SEARCHES_PER_DATE * SEARCH_INTERVAL_SECONDS
+    route = ROUTES[0]
+    travel_date = FIRST_DATE.isoformat()
+    last_week = time.time() - 7 * 86400
+
+    with tempfile.TemporaryDirectory() as directory:
+        with FareStore(Path(directory) / "fares.sqlite3") as store:
+            insert_started_at = time.perf_counter()
+            fares = generate_searches(store, started_at)
+            insert_seconds = time.perf_counter() - insert_started_at
+            print(
+                f"inserted {fares} fares of {store.stats()['searches']} searches in "
+                f"{insert_seconds:.1f}s ({fares / insert_seconds:,.0f} fares/s, "
+                "flight record generation included)"
+            )
+
+            queries = {
+                "route trend": lambda: store.cheapest_fares(route),
+                "route trend, last week hourly": lambda: store.cheapest_fares(
+                    route, since=last_week, bucket_seconds=3600
+                ),
+                "travel date trend": lambda: store.cheapest_fares(route, travel_date),
+                "travel date trend, one airline": lambda: store.cheapest_fares(
+                    route, travel_date, airline=AIRLINES[0]
+                ),
+                "route price drops >= 10%": lambda: store.price_drops(
+                    route, min_drop_percent=10
+                ),
+                "travel date price drops": lambda: store.price_drops(
+                    route, travel_date
+                ),
+            }
+            exit_status = 0
+            for label, query in queries.items():
+                exit_status |= not time_query(label, query)
+
+    return int(exit_status)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+bench_flight_records.py
+
+This module checks the flight record normalization against the saved provider outputs
+and measures it. The fixtures are normalized and spot-checked, then replicated into a
+large set of records that is normalized and sorted by price and duration.
+
+Usage:
+    poetry run python -m benchmarks.bench_flight_records [records]
+"""
+
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from src.lib.flight_records import (
+    fare_sort_key,
+    normalize_google_flights,
+    normalize_kayak_flights,
+)
+from src.typings import GoogleControllerOutput, KayakControllerOutput
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DEFAULT_RECORDS = 100_000
+DEPARTURE_DATE = date(2025, 10, 10)
+
+# Departure and arrival of the first overnight ("+1") flight in each fixture
+EXPECTED_OVERNIGHT = {
+    "google_flights": (datetime(2025, 10, 10, 22, 33), datetime(2025, 10, 11, 7, 10)),
+    "kayak": (datetime(2025, 10, 10, 22, 33), datetime(2025, 10, 11, 7, 10)),
+}
+
+
+def main() -> int:
+    """
+    Normalize the fixtures, spot-check them and time normalizing and sorting.
+
+    Returns:
+        int: Process exit status, 0 when every record parsed as expected.
+    """
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS
+    google_output = GoogleControllerOutput.model_validate_json(
+        (FIXTURES_DIR / "google_flights_results.json").read_text(encoding="utf-8")
+    )
+    kayak_output = KayakControllerOutput.model_validate_json(
+        (FIXTURES_DIR / "kayak_flights_results.json").read_text(encoding="utf-8")
+    )
+    records = [
+        *normalize_google_flights(google_output, DEPARTURE_DATE),
+        *normalize_kayak_flights(kayak_output, DEPARTURE_DATE),
+    ]
+
+    exit_status = 0
+    for record in records:
+        if None in (
+            record.departure_at,
+            record.arrival_at,
+            record.duration_minutes,
+            record.price_cents,
+            record.currency,
+        ):
+            print(f"unparsed field: {record}")
+            exit_status = 1
+    for provider, expected in EXPECTED_OVERNIGHT.items():
+        overnight = next(
+            record
+            for record in records
+            if record.provider == provider and record.arrival_at.day == 11
+        )
+        if (overnight.departure_at, overnight.arrival_at) != expected:
+            print(f"{provider}: wrong day rollover {overnight}")
+            exit_status = 1
+
+    copies = size // len(records) + 1
+    started_at = time.perf_counter()
+    for _ in range(copies):
+        list(normalize_google_flights(google_output, DEPARTURE_DATE))
+        list(normalize_kayak_flights(kayak_output, DEPARTURE_DATE))
+    normalize_ms = (time.perf_counter() - started_at) * 1000
+
+    fares = (records * copies)[:size]
+    started_at = time.perf_counter()
+    fares.sort(key=fare_sort_key)
+    sort_ms = (time.perf_counter() - started_at) * 1000
+
+    print(
+        f"{len(records)} fixture records {'ok' if exit_status == 0 else 'MISMATCH'}, "
+        f"normalized {len(records) * copies} in {normalize_ms:.0f} ms, "
+        f"sorted {size} by price and duration in {sort_ms:.0f} ms"
+    )
+    return exit_status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
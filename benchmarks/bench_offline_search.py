@@ -0,0 +1,185 @@
+"""
+bench_offline_search.py
+
+This module benchmarks complete provider searches fully offline. The recorded Google
+Flights and Kayak results pages are served from a local HTTP server, the provider URLs
+point at it, and the agents built by `google_flights_search_agent` and
+`kayak_flights_search_agent` are driven by a deterministic replay LLM in a headless
+browser. Each query is run through the orchestrator (which answers from the DOM
+extractor) and through the LLM agent, and the end-to-end latency, steps and tokens are
+reported. The replay LLM answers with the agent output recorded on each page, and the
+process exits non-zero when a search does not return the page's expected result.
+
+Usage:
+    poetry run python -m benchmarks.bench_offline_search [iterations] [port]
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+HOST = "127.0.0.1"
+PORT = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ["BROWSER_HEADLESS"] = "true"
+os.environ["GOOGLE_FLIGHTS_BASE_URL"] = f"http://{HOST}:{PORT}/travel/flights"
+os.environ["KAYAK_FLIGHTS_BASE_URL"] = f"http://{HOST}:{PORT}/flights"
+os.environ["GOOGLE_FLIGHTS_MIN_INTERVAL_SECONDS"] = "0"
+os.environ["KAYAK_FLIGHTS_MIN_INTERVAL_SECONDS"] = "0"
+
+from benchmarks.replay import (  # noqa: E402
+    ReplayChatModel,
+    load_recorded_answer,
+    serve_recorded_pages,
+)
+from src.lib.browser_pool import BrowserPool  # noqa: E402
+from src.lib.instrumentation import AgentInstrumentation  # noqa: E402
+from src.lib.orchestrator import run_provider  # noqa: E402
+from src.lib.providers import get_provider  # noqa: E402
+from src.lib.streaming import stream_agent  # noqa: E402
+from src.main_google_flights import google_flights_search_agent  # noqa: E402
+from src.main_kayak_flights import kayak_flights_search_agent  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+QUERY = ("SFO", "JFK", "2025-10-10")
+
+CASES = [
+    ("google_flights", google_flights_search_agent, "google_flights"),
+    ("kayak", kayak_flights_search_agent, "kayak_flights"),
+]
+
+
+def is_recorded_result(provider: str, result: str | None, expected: dict) -> bool:
+    """
+    Check a search result against the expected output of the recorded page.
+
+    Args:
+        provider (str): The provider name.
+        result (str | None): The JSON result of the search.
+        expected (dict): The expected output.
+
+    Returns:
+        bool: Whether the result validates and equals the expected output.
+    """
+
+    if result is None:
+        return False
+    output = get_provider(provider).output_model.model_validate_json(result)
+    return output.model_dump() == expected
+
+
+async def search_with_agent(
+    provider: str, agent_factory, llm: ReplayChatModel, browser_pool: BrowserPool
+) -> tuple[str | None, float, str]:
+    """
+    Run one search through the LLM agent only, bypassing the DOM fast path but
+    streaming the flights the agent extracts and stopping early once the result list
+    is complete, as the orchestrator does.
+
+    Args:
+        provider (str): The provider name.
+        agent_factory (Callable): Coroutine function that builds the provider agent.
+        llm (ReplayChatModel): The replay LLM.
+        browser_pool (BrowserPool): Pool providing the browser context.
+
+    Returns:
+        tuple[str | None, float, str]: The result, the seconds taken and a summary of
+            the time to the first flights, the steps and the tokens.
+    """
+
+    started_at = time.perf_counter()
+    async with browser_pool.context() as browser_context:
+        agent = await agent_factory(*QUERY, browser_context=browser_context, llm=llm)
+        agent.generate_gif = False
+        instrumentation = AgentInstrumentation(agent, provider)
+        first_batch_seconds = None
+        with contextlib.redirect_stdout(io.StringIO()):
+            async for _ in stream_agent(
+                agent,
+                f"{QUERY[0]}-{QUERY[1]}",
+                result_count_selector=get_provider(provider).result_count_selector,
+            ):
+                if first_batch_seconds is None:
+                    first_batch_seconds = time.perf_counter() - started_at
+        metrics = instrumentation.finish()
+        result = agent.history.final_result()
+
+    summary = (
+        f"first flights after {(first_batch_seconds or 0) * 1000:.0f} ms, "
+        f"{metrics.steps} steps, "
+        f"{metrics.prompt_tokens}+{metrics.completion_tokens} tokens"
+    )
+    return result, time.perf_counter() - started_at, summary
+
+
+async def main() -> int:
+    """
+    Serve the recorded pages and benchmark every provider through both paths.
+
+    Returns:
+        int: Process exit status, 0 when every search returned the expected result.
+    """
+
+    server = await serve_recorded_pages(
+        {
+            "/travel/flights": FIXTURES_DIR / "google_flights_results.html",
+            "/flights/": FIXTURES_DIR / "kayak_flights_results.html",
+        },
+        HOST,
+        PORT,
+    )
+    exit_status = 0
+
+    async with server, BrowserPool(size=1) as browser_pool:
+        for provider, agent_factory, fixture in CASES:
+            expected = json.loads(
+                (FIXTURES_DIR / f"{fixture}_results.json").read_text(encoding="utf-8")
+            )
+            llm = ReplayChatModel(
+                search_url=get_provider(provider).build_url(*QUERY),
+                recorded_output=load_recorded_answer(
+                    FIXTURES_DIR / f"{fixture}_results.html"
+                ),
+            )
+
+            for iteration in range(1, ITERATIONS + 1):
+                provider_result = await run_provider(
+                    provider,
+                    partial(agent_factory, llm=llm),
+                    *QUERY,
+                    browser_pool=browser_pool,
+                )
+                is_matching = is_recorded_result(
+                    provider, provider_result.result, expected
+                )
+                print(
+                    f"{provider} #{iteration} orchestrator: "
+                    f"{provider_result.elapsed_seconds * 1000:.0f} ms, "
+                    f"{provider_result.extraction_method or provider_result.error} "
+                    f"{'ok' if is_matching else 'MISMATCH'}"
+                )
+                exit_status |= not is_matching
+
+                result, seconds, summary = await search_with_agent(
+                    provider, agent_factory, llm, browser_pool
+                )
+                is_matching = is_recorded_result(provider, result, expected)
+                print(
+                    f"{provider} #{iteration} agent: {seconds * 1000:.0f} ms, "
+                    f"{summary} {'ok' if is_matching else 'MISMATCH'}"
+                )
+                exit_status |= not is_matching
+
+    return int(exit_status)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
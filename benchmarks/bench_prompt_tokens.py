@@ -0,0 +1,94 @@
+"""
+bench_prompt_tokens.py
+
+This module reports the prompt tokens spent on the task description in each prompt mode.
+It builds each provider agent in `full`, `compact` and `structured` mode and counts the
+tokens of the messages the agent resends on every step (system prompt, task and memory
+header, excluding the page state), plus the total over a run of the given step count.
+
+Usage:
+    poetry run python -m benchmarks.bench_prompt_tokens [steps]
+"""
+
+import os
+import sys
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from browser_use import Agent, Controller  # noqa: E402
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from benchmarks.tokens import count_tokens  # noqa: E402
+from src.constants import OPENAPI_MODEL_NAME  # noqa: E402
+from src.lib.google_flights import google_flights_build_url  # noqa: E402
+from src.lib.kayak_flights import kayak_flights_build_url  # noqa: E402
+from src.tasks.google_flights_task import get_google_flights_task  # noqa: E402
+from src.tasks.kayak_flights_task import get_kayak_flights_task  # noqa: E402
+from src.typings import GoogleControllerOutput, KayakControllerOutput  # noqa: E402
+
+DEFAULT_STEPS = 10
+PROMPT_MODES = ("full", "compact", "structured")
+
+PROVIDERS = [
+    (
+        "google_flights",
+        google_flights_build_url,
+        get_google_flights_task,
+        GoogleControllerOutput,
+    ),
+    ("kayak", kayak_flights_build_url, get_kayak_flights_task, KayakControllerOutput),
+]
+
+
+def count_message_tokens(agent: Agent) -> int:
+    """
+    Count the tokens of the text messages an agent sends before any page state.
+
+    Args:
+        agent (Agent): A freshly built agent.
+
+    Returns:
+        int: Tokens resent on every step.
+    """
+
+    return sum(
+        count_tokens(message.content)
+        for message in agent.message_manager.get_messages()
+        if isinstance(message.content, str)
+    )
+
+
+def main() -> int:
+    """
+    Print tokens per step and per run for every provider and prompt mode.
+
+    Returns:
+        int: Process exit status.
+    """
+
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STEPS
+    llm = ChatOpenAI(model=OPENAPI_MODEL_NAME)
+
+    print(f"{'provider':<16}{'mode':<12}{'task':>8}{'per step':>10}{'total':>10}")
+
+    for provider, build_url, get_task, output_model in PROVIDERS:
+        url = build_url("SFO", "JFK", "2025-10-10", "2025-11-10")
+        for prompt_mode in PROMPT_MODES:
+            task = get_task(url, "SFO", "JFK", prompt_mode)
+            agent = Agent(
+                task=task,
+                llm=llm,
+                controller=Controller(output_model=output_model),
+                generate_gif=False,
+            )
+            per_step = count_message_tokens(agent)
+            print(
+                f"{provider:<16}{prompt_mode:<12}{count_tokens(task):>8}"
+                f"{per_step:>10}{per_step * steps:>10}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
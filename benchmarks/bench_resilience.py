@@ -0,0 +1,166 @@
+"""
+bench_resilience.py
+
+This module measures batch throughput under a partial outage, fully offline. Two
+providers are searched concurrently, each by a fixed number of workers, as a batch
+run does: the runs of one provider fail transiently at a fixed rate, and every run of
+the other fails (as against a captcha or block page) after spending as long as a good
+run. Runs are simulated by timed attempts through the same `retry` and
+`CircuitBreaker` the orchestrator uses, without retries, with retries only, and with
+retries and the circuit breaker. The process exits non-zero when retries do not
+recover the transient failures or when the circuit breaker does not keep the blocked
+provider from stalling the batch.
+
+Usage:
+    poetry run python -m benchmarks.bench_resilience [searches] [workers]
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from src.lib.resilience import CircuitBreaker, RetryPolicy, retry
+
+SEARCHES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+ATTEMPT_SECONDS = 0.02
+TRANSIENT_FAILURE_RATE = 0.3
+MIN_RECOVERED_RATE = 0.95
+MIN_SPEEDUP = 1.5
+
+SCENARIOS = {
+    "no retries": (RetryPolicy(1, 0.01, 0.04), 0),
+    "retries": (RetryPolicy(3, 0.01, 0.04), 0),
+    "retries + circuit breaker": (RetryPolicy(3, 0.01, 0.04), 5),
+}
+
+
+async def attempt_search(failure_rate: float) -> str:
+    """
+    Simulate one attempt of an agent run.
+
+    Args:
+        failure_rate (float): Probability that the attempt fails.
+
+    Returns:
+        str: The result of the attempt.
+    """
+
+    await asyncio.sleep(ATTEMPT_SECONDS)
+    if random.random() < failure_rate:
+        raise RuntimeError("Blocked by a captcha page")
+    return "ok"
+
+
+async def run_provider(
+    failure_rate: float, policy: RetryPolicy, circuit_breaker: CircuitBreaker
+) -> tuple[int, float]:
+    """
+    Search one provider with a pool of workers, as the orchestrator runs a search.
+
+    Args:
+        failure_rate (float): Probability that an attempt fails.
+        policy (RetryPolicy): The provider's retry policy.
+        circuit_breaker (CircuitBreaker): The provider domain's circuit breaker.
+
+    Returns:
+        tuple[int, float]: Successful searches and the seconds until the last one ended.
+    """
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(SEARCHES):
+        queue.put_nowait(index)
+    successes = 0
+    started_at = time.perf_counter()
+
+    async def work() -> None:
+        nonlocal successes
+        while not queue.empty():
+            queue.get_nowait()
+            if not circuit_breaker.allow():
+                continue
+            try:
+                await retry(policy, lambda _: attempt_search(failure_rate))
+            except RuntimeError:
+                circuit_breaker.record_failure()
+            else:
+                circuit_breaker.record_success()
+                successes += 1
+
+    async with asyncio.TaskGroup() as task_group:
+        for _ in range(WORKERS):
+            task_group.create_task(work())
+
+    return successes, time.perf_counter() - started_at
+
+
+async def run_scenario(
+    policy: RetryPolicy, failure_threshold: int
+) -> tuple[int, float, float]:
+    """
+    Run a batch against a flaky and a blocked provider concurrently.
+
+    Args:
+        policy (RetryPolicy): The retry policy of both providers.
+        failure_threshold (int): Failures that open a circuit; 0 never opens it.
+
+    Returns:
+        tuple[int, float, float]: Successful searches of the flaky provider, the seconds
+            it took, and the seconds the whole batch took.
+    """
+
+    random.seed(0)
+    started_at = time.perf_counter()
+    (successes, flaky_seconds), _ = await asyncio.gather(
+        run_provider(
+            TRANSIENT_FAILURE_RATE, policy, CircuitBreaker(failure_threshold, 60)
+        ),
+        run_provider(1.0, policy, CircuitBreaker(failure_threshold, 60)),
+    )
+    return successes, flaky_seconds, time.perf_counter() - started_at
+
+
+async def main() -> int:
+    """
+    Run the batch under every scenario.
+
+    Returns:
+        int: Process exit status, 0 when retries and the circuit breaker pay off.
+    """
+
+    results = {}
+    for scenario, (policy, failure_threshold) in SCENARIOS.items():
+        successes, flaky_seconds, batch_seconds = await run_scenario(
+            policy, failure_threshold
+        )
+        results[scenario] = (successes, batch_seconds)
+        print(
+            f"{scenario}: {successes}/{SEARCHES} flaky searches ok in "
+            f"{flaky_seconds:.2f}s, batch {batch_seconds:.2f}s, "
+            f"{2 * SEARCHES / batch_seconds:.0f} searches/s"
+        )
+
+    exit_status = 0
+
+    recovered = results["retries"][0] / SEARCHES
+    is_recovered = recovered >= MIN_RECOVERED_RATE
+    print(
+        f"retries recover {recovered:.0%} of flaky searches "
+        f"{'ok' if is_recovered else 'FAIL'}"
+    )
+    exit_status |= not is_recovered
+
+    speedup = results["retries"][1] / results["retries + circuit breaker"][1]
+    is_faster = speedup >= MIN_SPEEDUP
+    print(
+        f"circuit breaker speeds up the batch {speedup:.1f}x "
+        f"{'ok' if is_faster else 'FAIL'}"
+    )
+    exit_status |= not is_faster
+
+    return int(exit_status)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
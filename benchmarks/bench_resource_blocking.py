@@ -0,0 +1,208 @@
+"""
+bench_resource_blocking.py
+
+This module compares page loading with and without the providers' resource profiles,
+fully offline. The recorded Google Flights and Kayak results pages are served from a
+local HTTP server with the weight of a live results page added: images, a video, a web
+font, a first-party script and a large third-party script (served from `localhost`
+while the page is on `127.0.0.1`), each answered after a delay. Every page is loaded
+in a headless browser context from the pool as an agent step sees it (navigation, then
+browser-use's wait for the page and network to settle), and the page-ready time and
+the bytes the server sent are reported. The process exits non-zero when the DOM
+extractor no longer returns the recorded result under the profile, or when the
+profile does not cut both the bytes and the ready time.
+
+Usage:
+    poetry run python -m benchmarks.bench_resource_blocking [iterations] [port]
+"""
+
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+HOST = "127.0.0.1"
+PORT = int(sys.argv[2]) if len(sys.argv) > 2 else 8768
+ASSET_DELAY_SECONDS = 0.3
+MAX_BYTES_RATIO = 0.5
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ["BROWSER_HEADLESS"] = "true"
+os.environ["GOOGLE_FLIGHTS_BASE_URL"] = f"http://{HOST}:{PORT}/travel/flights"
+os.environ["KAYAK_FLIGHTS_BASE_URL"] = f"http://{HOST}:{PORT}/flights"
+
+from aiohttp import web  # noqa: E402
+
+from src.lib.browser_pool import BrowserPool  # noqa: E402
+from src.lib.providers import get_provider  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+QUERY = ("SFO", "JFK", "2025-10-10")
+FIXTURES = {"google_flights": "google_flights", "kayak": "kayak_flights"}
+
+ASSETS = {
+    **{
+        f"logo-{index}.png": ("image/png", b"\x89PNG" + bytes(40_000))
+        for index in range(20)
+    },
+    "hero.mp4": ("video/mp4", bytes(1_000_000)),
+    "brand.woff2": ("font/woff2", bytes(150_000)),
+    "app.js": ("application/javascript", b"window.appLoaded = true;"),
+    "tracker.js": (
+        "application/javascript",
+        b"/*" + b" " * 300_000 + b"*/ window.tracked = true;",
+    ),
+}
+
+EXTERNAL_URL_PATTERN = re.compile(r"https?://[^\s\"'()<>]+")
+
+HEAVY_MARKUP = "\n".join(
+    [
+        "<style>@font-face { font-family: Brand; src: url(/assets/brand.woff2); }"
+        " body { font-family: Brand, sans-serif; }</style>",
+        *(f'<img src="/assets/logo-{index}.png" alt="">' for index in range(20)),
+        '<video src="/assets/hero.mp4" autoplay muted></video>',
+        '<script src="/assets/app.js"></script>',
+        f'<script src="http://localhost:{PORT}/assets/tracker.js" async></script>',
+    ]
+)
+
+
+async def serve_heavy_pages() -> tuple[web.AppRunner, dict[str, int]]:
+    """
+    Serve the recorded results pages with heavy assets, counting the bytes sent.
+
+    Returns:
+        tuple[web.AppRunner, dict[str, int]]: The runner to clean up, and a counter
+            whose `bytes` entry holds the response body bytes sent so far.
+    """
+
+    sent = {"bytes": 0}
+    pages = {}
+    for prefix, fixture in (
+        ("/travel/flights", "google_flights"),
+        ("/flights/", "kayak_flights"),
+    ):
+        html = (FIXTURES_DIR / f"{fixture}_results.html").read_text(encoding="utf-8")
+        # Point the recorded page's external images and styles at a local asset
+        html = EXTERNAL_URL_PATTERN.sub("/assets/logo-0.png", html)
+        pages[prefix] = html.replace("</body>", f"{HEAVY_MARKUP}</body>").encode()
+
+    async def handle_page(request: web.Request) -> web.Response:
+        body = next(
+            page for prefix, page in pages.items() if request.path.startswith(prefix)
+        )
+        sent["bytes"] += len(body)
+        return web.Response(body=body, content_type="text/html")
+
+    async def handle_asset(request: web.Request) -> web.Response:
+        content_type, body = ASSETS[request.match_info["name"]]
+        await asyncio.sleep(ASSET_DELAY_SECONDS)
+        sent["bytes"] += len(body)
+        return web.Response(body=body, content_type=content_type)
+
+    app = web.Application()
+    app.router.add_get("/assets/{name}", handle_asset)
+    app.router.add_get("/travel/flights", handle_page)
+    app.router.add_get("/flights/{tail:.*}", handle_page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+    return runner, sent
+
+
+async def load_page(
+    browser_pool: BrowserPool, provider: str, is_blocking: bool
+) -> tuple[float, dict]:
+    """
+    Load a provider's results page as an agent step does, and extract it.
+
+    Args:
+        browser_pool (BrowserPool): Pool providing the browser context.
+        provider (str): The provider name.
+        is_blocking (bool): Whether to apply the provider's resource profile.
+
+    Returns:
+        tuple[float, dict]: The seconds until the page was ready, and the extracted
+            flights.
+    """
+
+    spec = get_provider(provider)
+    resource_profile = spec.resource_profile if is_blocking else None
+
+    async with browser_pool.context(resource_profile) as browser_context:
+        page = await browser_context.get_current_page()
+        started_at = time.perf_counter()
+        await page.goto(spec.build_url(*QUERY), wait_until="domcontentloaded")
+        await browser_context._wait_for_page_and_frames_load()
+        ready_seconds = time.perf_counter() - started_at
+
+        output = await spec.extractor(page, f"{QUERY[0]}-{QUERY[1]}")
+
+    return ready_seconds, output.model_dump()
+
+
+async def main() -> int:
+    """
+    Load every provider's page with and without its resource profile.
+
+    Returns:
+        int: Process exit status, 0 when the profiles keep the recorded results and
+            cut both the bytes and the page-ready time.
+    """
+
+    runner, sent = await serve_heavy_pages()
+    exit_status = 0
+
+    try:
+        async with BrowserPool(size=1) as browser_pool:
+            for provider, fixture in FIXTURES.items():
+                expected = json.loads(
+                    (FIXTURES_DIR / f"{fixture}_results.json").read_text(
+                        encoding="utf-8"
+                    )
+                )
+                totals = {}
+
+                for is_blocking in (False, True):
+                    ready_seconds = []
+                    bytes_before = sent["bytes"]
+                    for _ in range(ITERATIONS):
+                        seconds, output = await load_page(
+                            browser_pool, provider, is_blocking
+                        )
+                        ready_seconds.append(seconds)
+                        if output != expected:
+                            print(f"{provider}: extracted flights MISMATCH")
+                            exit_status = 1
+
+                    mode = "blocking" if is_blocking else "loading all"
+                    page_bytes = (sent["bytes"] - bytes_before) / ITERATIONS
+                    totals[is_blocking] = (statistics.median(ready_seconds), page_bytes)
+                    print(
+                        f"{provider} {mode}: ready in "
+                        f"{totals[is_blocking][0] * 1000:.0f} ms, "
+                        f"{page_bytes / 1024:.0f} KiB transferred"
+                    )
+
+                is_lighter = totals[True][1] <= totals[False][1] * MAX_BYTES_RATIO
+                is_faster = totals[True][0] < totals[False][0]
+                print(
+                    f"{provider}: {totals[True][1] / totals[False][1]:.0%} of the "
+                    f"bytes, {totals[True][0] / totals[False][0]:.0%} of the ready "
+                    f"time {'ok' if is_lighter and is_faster else 'FAIL'}"
+                )
+                exit_status |= not (is_lighter and is_faster)
+    finally:
+        await runner.cleanup()
+
+    return int(exit_status)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,166 @@
+"""
+bench_search_service.py
+
+This module benchmarks the search service end to end, fully offline. The recorded
+results pages are served from a local HTTP server, the service runs in-process with a
+warm browser pool and agents driven by the deterministic replay LLM (the DOM fast path
+is disabled, so every search goes through an agent), and searches are submitted and
+polled over HTTP. The replay LLM answers with the agent output recorded on each page.
+The submit-to-result latency of each job is reported, and the process exits non-zero
+when a job does not return the pages' expected results.
+
+Usage:
+    poetry run python -m benchmarks.bench_search_service [jobs] [workers]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+JOBS = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+HOST = "127.0.0.1"
+PAGES_PORT = 8766
+SERVICE_PORT = 8767
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ["BROWSER_HEADLESS"] = "true"
+os.environ["DOM_EXTRACTION_ENABLED"] = "false"
+os.environ["GOOGLE_FLIGHTS_BASE_URL"] = f"http://{HOST}:{PAGES_PORT}/travel/flights"
+os.environ["KAYAK_FLIGHTS_BASE_URL"] = f"http://{HOST}:{PAGES_PORT}/flights"
+os.environ["GOOGLE_FLIGHTS_MIN_INTERVAL_SECONDS"] = "0"
+os.environ["KAYAK_FLIGHTS_MIN_INTERVAL_SECONDS"] = "0"
+
+import aiohttp  # noqa: E402
+
+from benchmarks.replay import (  # noqa: E402
+    ReplayChatModel,
+    load_recorded_answer,
+    serve_recorded_pages,
+)
+from src.lib.browser_pool import BrowserPool  # noqa: E402
+from src.lib.providers import get_provider  # noqa: E402
+from src.lib.search_jobs import SearchJobQueue  # noqa: E402
+from src.lib.search_service import serve_search_service  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+QUERY = {"departure": "SFO", "destination": "JFK", "date": "2025-10-10"}
+FIXTURES = {"google_flights": "google_flights", "kayak": "kayak_flights"}
+
+
+def load_expected_outputs() -> dict[str, dict]:
+    """
+    Load the expected output of every provider's recorded page.
+
+    Returns:
+        dict[str, dict]: The expected outputs by provider name.
+    """
+
+    return {
+        provider: json.loads(
+            (FIXTURES_DIR / f"{fixture}_results.json").read_text(encoding="utf-8")
+        )
+        for provider, fixture in FIXTURES.items()
+    }
+
+
+async def run_job(session: aiohttp.ClientSession, query: dict) -> tuple[dict, float]:
+    """
+    Submit a search and poll it until its result is ready.
+
+    Args:
+        session (aiohttp.ClientSession): A session bound to the service URL.
+        query (dict): The flight query.
+
+    Returns:
+        tuple[dict, float]: The finished job and the seconds from submit to result.
+    """
+
+    started_at = time.perf_counter()
+    async with session.post("/searches", json=query) as response:
+        response.raise_for_status()
+        job_id = (await response.json())["job_id"]
+
+    while True:
+        async with session.get(f"/searches/{job_id}/result") as response:
+            if response.status == 200:
+                return await response.json(), time.perf_counter() - started_at
+        await asyncio.sleep(0.05)
+
+
+async def main() -> int:
+    """
+    Serve the recorded pages and the search service, and run the jobs through it.
+
+    Returns:
+        int: Process exit status, 0 when every job returned the expected results.
+    """
+
+    expected = load_expected_outputs()
+    providers = {
+        provider: partial(
+            get_provider(provider).build_agent,
+            llm=ReplayChatModel(
+                search_url=get_provider(provider).build_url(*QUERY.values()),
+                recorded_output=load_recorded_answer(
+                    FIXTURES_DIR / f"{fixture}_results.html"
+                ),
+            ),
+        )
+        for provider, fixture in FIXTURES.items()
+    }
+    pages_server = await serve_recorded_pages(
+        {
+            "/travel/flights": FIXTURES_DIR / "google_flights_results.html",
+            "/flights/": FIXTURES_DIR / "kayak_flights_results.html",
+        },
+        HOST,
+        PAGES_PORT,
+    )
+    exit_status = 0
+
+    async with pages_server, BrowserPool(size=WORKERS * len(providers)) as pool:
+        async with SearchJobQueue(WORKERS, providers, browser_pool=pool) as job_queue:
+            runner = await serve_search_service(job_queue, HOST, SERVICE_PORT)
+            try:
+                async with aiohttp.ClientSession(
+                    f"http://{HOST}:{SERVICE_PORT}"
+                ) as session:
+                    jobs = await asyncio.gather(
+                        *(run_job(session, QUERY) for _ in range(JOBS))
+                    )
+            finally:
+                await runner.cleanup()
+
+    for index, (job, seconds) in enumerate(jobs, start=1):
+        is_matching = job["status"] == "done" and all(
+            result["result"] is not None
+            and get_provider(result["provider"])
+            .output_model.model_validate_json(result["result"])
+            .model_dump()
+            == expected[result["provider"]]
+            for result in job["results"]
+        )
+        coalesced = sum(result["is_coalesced"] for result in job["results"])
+        print(
+            f"job #{index}: {seconds * 1000:.0f} ms, {job['flights_found']} flights, "
+            f"{coalesced} coalesced {'ok' if is_matching else 'MISMATCH'}"
+        )
+        exit_status |= not is_matching
+
+    latencies = [seconds for _, seconds in jobs]
+    print(
+        f"{JOBS} jobs on {WORKERS} workers: "
+        f"p50 {statistics.median(latencies) * 1000:.0f} ms, "
+        f"max {max(latencies) * 1000:.0f} ms"
+    )
+    return int(exit_status)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,158 @@
+"""
+bench_startup.py
+
+This module measures the startup of every entry point, fully offline. Each entry point
+is started in a fresh interpreter under `python -X importtime`, as `--help` where it
+has a command line and as a plain import otherwise, next to building a provider search
+URL and building an agent. The wall time, the total import time and the slowest
+imports of each are reported. The process exits non-zero when a path that runs no
+agent imports browser-use, LangChain's OpenAI client, OpenAI or Playwright, when
+building an agent no longer imports browser-use, or when the `.env` file is loaded
+more than once. The same checks run in the test suite, in `tests/test_startup.py`.
+
+Usage:
+    poetry run python -m benchmarks.bench_startup [slowest_imports]
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+HEAVY_PACKAGES = ("browser_use", "langchain_openai", "openai", "playwright")
+
+BUILD_AGENT = (
+    "import asyncio; from src.lib.providers import get_provider; "
+    "asyncio.run(get_provider('kayak').build_agent('SFO', 'JFK', '2025-10-10'))"
+)
+
+COUNT_DOTENV_LOADS = (
+    "import dotenv; loads = []; load_dotenv = dotenv.load_dotenv; "
+    "dotenv.load_dotenv = lambda *a, **k: loads.append(1) or load_dotenv(*a, **k); "
+    "import main, src.main_batch, src.main_sweep, src.main_service, src.main_fares, "
+    "src.main_google_flights, src.main_kayak_flights; print(len(loads))"
+)
+
+# Name, interpreter arguments, and whether the path runs an agent
+ENTRY_POINTS = (
+    ("main.py", ["-c", "import main"], False),
+    ("main_batch --help", ["-m", "src.main_batch", "--help"], False),
+    ("main_sweep --help", ["-m", "src.main_sweep", "--help"], False),
+    ("main_service --help", ["-m", "src.main_service", "--help"], False),
+    ("main_fares --help", ["-m", "src.main_fares", "--help"], False),
+    ("main_google_flights", ["-c", "import src.main_google_flights"], False),
+    ("main_kayak_flights", ["-c", "import src.main_kayak_flights"], False),
+    (
+        "build search URL",
+        [
+            "-c",
+            "from src.lib.providers import get_provider; "
+            "get_provider('kayak').build_url('SFO', 'JFK', '2025-10-10')",
+        ],
+        False,
+    ),
+    ("build agent", ["-c", BUILD_AGENT], True),
+)
+
+
+def parse_importtime(report: str) -> dict[str, tuple[int, int]]:
+    """
+    Parse a `-X importtime` report.
+
+    Args:
+        report (str): The interpreter's stderr.
+
+    Returns:
+        dict[str, tuple[int, int]]: Self and cumulative microseconds by module name.
+    """
+
+    imports = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        imports[name.strip()] = (int(self_us), int(cumulative_us))
+    return imports
+
+
+def start(arguments: list[str]) -> tuple[float, dict[str, tuple[int, int]], str]:
+    """
+    Run an entry point in a fresh interpreter with import timing.
+
+    Args:
+        arguments (list[str]): The interpreter arguments.
+
+    Returns:
+        tuple[float, dict[str, tuple[int, int]], str]: The wall seconds, the parsed
+            import report, and stdout.
+    """
+
+    environment = {**os.environ, "OPENAI_API_KEY": "sk-benchmark"}
+    started_at = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        capture_output=True,
+        text=True,
+        env=environment,
+    )
+    seconds = time.perf_counter() - started_at
+    if completed.returncode:
+        raise RuntimeError(f"{' '.join(arguments)} failed:\n{completed.stderr[-2000:]}")
+    return seconds, parse_importtime(completed.stderr), completed.stdout
+
+
+def main(slowest_imports: int = 5) -> int:
+    """
+    Start every entry point and check which packages each one imports.
+
+    Args:
+        slowest_imports (int): The slowest imports reported per entry point.
+
+    Returns:
+        int: Process exit status, 0 when only agent runs import the heavy packages and
+            the `.env` file is loaded once.
+    """
+
+    exit_status = 0
+
+    for name, arguments, runs_agent in ENTRY_POINTS:
+        seconds, imports, _ = start(arguments)
+        # Top-level entries of the report add up to the total import time
+        import_seconds = sum(self_us for self_us, _ in imports.values()) / 1e6
+        heavy = sorted(
+            {
+                module.split(".")[0]
+                for module in imports
+                if module.split(".")[0] in HEAVY_PACKAGES
+            }
+        )
+        is_ok = bool(heavy) if runs_agent else not heavy
+        print(
+            f"{name}: {seconds * 1000:.0f} ms wall, {import_seconds * 1000:.0f} ms "
+            f"importing {len(imports)} modules, heavy packages "
+            f"{', '.join(heavy) or 'none'} {'ok' if is_ok else 'FAIL'}"
+        )
+        # The slowest packages, leaving out the project's own modules
+        packages = [
+            (module, cumulative_us)
+            for module, (_, cumulative_us) in imports.items()
+            if "." not in module and module not in ("src", "main")
+        ]
+        packages.sort(key=lambda package: -package[1])
+        for module, cumulative_us in packages[:slowest_imports]:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+        exit_status |= not is_ok
+
+    _, _, loads = start(["-c", COUNT_DOTENV_LOADS])
+    is_loaded_once = loads.strip() == "1"
+    print(
+        f".env loaded {loads.strip()} time(s) by all entry points "
+        f"{'ok' if is_loaded_once else 'FAIL'}"
+    )
+    exit_status |= not is_loaded_once
+
+    return int(exit_status)
+
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:2])))
@@ -0,0 +1,65 @@
+"""
+capture_fixture.py
+
+This module saves a live results page as an extraction fixture. The provider search
+is opened in Chromium, the page is left to render its results, and the rendered HTML
+and a full-page screenshot are written to `benchmarks/fixtures/` as
+`<fixture>_<DEPARTURE>-<DESTINATION>_<date>.html` and `.png`. The expected result is
+not derived from the page by the extractor under test: write the matching `.json`
+file by hand from the screenshot, in the provider's controller output format. The
+extraction tests pick up every fixture that has its expected result. To replay the
+page in the offline benchmarks, also save the result of a live agent run on the same
+search as `<fixture>_agent.json`.
+
+Usage:
+    poetry run python -m benchmarks.capture_fixture google_flights SFO JFK 2025-10-10
+    poetry run python -m benchmarks.capture_fixture kayak SFO JFK 2025-10-10
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from src.lib.providers import get_provider
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+FIXTURE_NAMES = {"google_flights": "google_flights", "kayak": "kayak_flights"}
+RENDER_SECONDS = 15
+
+
+async def main() -> int:
+    """
+    Open a live provider search and save its rendered page and screenshot.
+
+    Returns:
+        int: Process exit status, 0 once the page is saved.
+    """
+
+    if len(sys.argv) < 5 or sys.argv[1] not in FIXTURE_NAMES:
+        print(__doc__)
+        return 1
+
+    provider, departure, destination, date = sys.argv[1:5]
+    url = get_provider(provider).build_url(departure, destination, date)
+    fixture = f"{FIXTURE_NAMES[provider]}_{departure}-{destination}_{date}"
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=False)
+        page = await browser.new_page()
+        await page.goto(url, wait_until="domcontentloaded")
+        # Results keep streaming in after the first ones render
+        await page.wait_for_timeout(RENDER_SECONDS * 1000)
+
+        html_path = FIXTURES_DIR / f"{fixture}.html"
+        html_path.write_text(await page.content(), encoding="utf-8")
+        await page.screenshot(path=FIXTURES_DIR / f"{fixture}.png", full_page=True)
+        await browser.close()
+
+    print(f"saved {html_path}; write the expected result to {html_path.stem}.json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
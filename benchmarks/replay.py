@@ -0,0 +1,195 @@
+"""
+replay.py
+
+This module provides the offline replay pieces of the search benchmark: a local HTTP
+server answering provider search URLs with recorded results pages, and a deterministic
+chat model that drives a browser-use agent like a real LLM would (navigate to the
+search URL, extract the flights from the page, then complete the task with the
+recorded answer) and reports token usage estimated from the prompt it receives. The
+recorded answer is the `done` output of a live agent run on the recorded page, saved
+as `<fixture>_agent.json` next to it; the benchmarks check it against the fixture's
+expected `.json`, written by hand from the page, so the agent path is not compared
+with its own input.
+"""
+
+import asyncio
+import json
+import re
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmarks.tokens import count_tokens
+
+CURRENT_URL_PATTERN = re.compile(r"Current url: (\S+)")
+EXTRACTION_PROMPT_MARKER = "Extraction goal:"
+EXTRACTED_CONTENT_MARKER = "Extracted from page"
+RECORDED_ANSWER_SUFFIX = "_agent.json"
+
+
+def load_recorded_answer(page_path: Path) -> dict[str, Any]:
+    """
+    Load the agent answer recorded on a results page.
+
+    Args:
+        page_path (Path): The recorded HTML page.
+
+    Returns:
+        dict[str, Any]: The `done` output of the live agent run on that page.
+    """
+
+    answer_path = page_path.with_name(page_path.stem + RECORDED_ANSWER_SUFFIX)
+    return json.loads(answer_path.read_text(encoding="utf-8"))
+
+
+async def serve_recorded_pages(
+    routes: dict[str, Path], host: str, port: int
+) -> asyncio.Server:
+    """
+    Start an HTTP server answering GET requests with recorded pages.
+
+    Args:
+        routes (dict[str, Path]): Recorded HTML files by URL path prefix.
+        host (str): The interface to bind.
+        port (int): The port to bind.
+
+    Returns:
+        asyncio.Server: The started server; close it to stop serving.
+    """
+
+    pages = {prefix: path.read_bytes() for prefix, path in routes.items()}
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            parts = request_line.decode("latin-1").split()
+            path = parts[1] if len(parts) >= 2 else ""
+            body = next(
+                (page for prefix, page in pages.items() if path.startswith(prefix)),
+                None,
+            )
+            status = "200 OK" if body is not None else "404 Not Found"
+            body = body if body is not None else b"Not Found"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/html; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+def message_text(message: BaseMessage) -> str:
+    """
+    Return the text parts of a chat message.
+
+    Args:
+        message (BaseMessage): A text or multi-part (text and image) message.
+
+    Returns:
+        str: The concatenated text.
+    """
+
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(
+        part.get("text", "") for part in message.content if isinstance(part, dict)
+    )
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    A deterministic chat model that replays a three-step agent run.
+
+    Bound to the agent's output schema as a tool, it answers with a `go_to_url` action
+    for the search URL until the page state shows the results page, then with an
+    `extract_content` action, and once the extraction is in its history with a `done`
+    action carrying the recorded output. As the page extraction model, it answers the
+    extraction prompt with the recorded output too.
+    """
+
+    search_url: str
+    recorded_output: dict[str, Any]
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def bind_tools(self, tools: list[Any], **kwargs: Any) -> Any:
+        return self.bind(tools=tools, **kwargs)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        prompt = "".join(message_text(message) for message in messages)
+        if EXTRACTION_PROMPT_MARKER in message_text(messages[-1]):
+            return self._reply(messages, json.dumps(self.recorded_output))
+
+        search_url = urlsplit(self.search_url)
+        results_prefix = f"{search_url.scheme}://{search_url.netloc}{search_url.path}"
+        current_url = CURRENT_URL_PATTERN.search(message_text(messages[-1]))
+        is_on_results = current_url is not None and current_url[1].startswith(
+            results_prefix
+        )
+
+        if is_on_results and EXTRACTED_CONTENT_MARKER in prompt:
+            next_goal = "Return the recorded flights"
+            action = {"done": self.recorded_output}
+        elif is_on_results:
+            next_goal = "Extract the flights"
+            action = {"extract_content": {"goal": "all flights in the output format"}}
+        else:
+            next_goal = "Open the flight search results"
+            action = {"go_to_url": {"url": self.search_url}}
+
+        arguments = {
+            "current_state": {
+                "page_summary": "",
+                "evaluation_previous_goal": "Success",
+                "memory": "",
+                "next_goal": next_goal,
+            },
+            "action": [action],
+        }
+        tools = kwargs.get("tools") or []
+        if not tools:
+            return self._reply(messages, json.dumps(arguments))
+        tool_name = getattr(tools[0], "__name__", "AgentOutput")
+        tool_call = {"name": tool_name, "args": arguments, "id": "replay"}
+        return self._reply(messages, "", [tool_call], json.dumps(arguments))
+
+    def _reply(
+        self,
+        messages: list[BaseMessage],
+        content: str,
+        tool_calls: list[dict[str, Any]] | None = None,
+        completion: str | None = None,
+    ) -> ChatResult:
+        prompt_tokens = sum(count_tokens(message_text(message)) for message in messages)
+        completion_tokens = count_tokens(content if completion is None else completion)
+        message = AIMessage(
+            content=content,
+            tool_calls=tool_calls or [],
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,46 @@
+"""
+tokens.py
+
+This module counts prompt tokens for the benchmarks. It uses the `o200k_base` tiktoken
+encoding when it is available and falls back to a four-characters-per-token estimate
+when the encoding cannot be loaded (e.g. offline, since tiktoken downloads it lazily).
+"""
+
+from functools import lru_cache
+from typing import Callable
+
+import tiktoken
+
+CHARACTERS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def get_token_counter() -> Callable[[str], int]:
+    """
+    Load the token counter once.
+
+    Returns:
+        Callable[[str], int]: A function returning the token count of a text.
+    """
+
+    try:
+        encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"tiktoken encoding unavailable ({type(e).__name__}), estimating tokens")
+        return lambda text: len(text) // CHARACTERS_PER_TOKEN
+
+    return lambda text: len(encoding.encode(text))
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text.
+
+    Args:
+        text (str): The text to count.
+
+    Returns:
+        int: The token count, exact or estimated.
+    """
+
+    return get_token_counter()(text)
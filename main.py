@@ -1,28 +1,36 @@
 """
 main.py
 
-This module executes flight search agents for Google Flights and Kayak.
+This module executes flight search agents for Google Flights and Kayak concurrently.
 It expects command line arguments for departure, destination, date, and optional return date.
-The results from both agents are printed in a structured format.
+Flights are printed as soon as either agent finds them. The results from both agents
+are printed in a structured format, followed by a cross-provider fare comparison and
+per-provider timings. Searched fares are recorded in the fare history
+(`FARE_STORE_PATH`).
 """
 
 import asyncio
+import contextlib
 import sys
 
-from dotenv import load_dotenv
-
-from src.lib.run import run_agent
-from src.lib.utils import print_structured_result
-from src.main_google_flights import google_flights_search_agent
-from src.main_kayak_flights import kayak_flights_search_agent
-
-# Load environment variables from .env
-load_dotenv(override=True)
+from src.constants import FARE_STORE_PATH, RESULT_CACHE_TTL_SECONDS, STREAM_JSONL_PATH
+from src.lib.compare import compare_fares
+from src.lib.fare_store import record_results
+from src.lib.flight_records import normalize_run_result
+from src.lib.orchestrator import search_flights_concurrently
+from src.lib.result_cache import ResultCache
+from src.lib.streaming import jsonl_batch_sink
+from src.lib.utils import (
+    print_fare_comparison,
+    print_flight_batch,
+    print_provider_timings,
+    print_structured_result,
+)
 
 
 async def main():
     """
-    Main function to execute flight search agents for Google Flights and Kayak.
+    Main function to execute flight search agents for Google Flights and Kayak concurrently.
 
     Expects command line arguments for departure, destination, date, and optional return date.
 
@@ -42,23 +50,53 @@ async def main():
     date = sys.argv[3]
     return_date = sys.argv[4] if len(sys.argv) > 4 else None
 
-    # Run Google Flights Agent
-    google_flights_agent = await google_flights_search_agent(
-        departure, destination, date, return_date
-    )
-
-    google_flights_run_result = await run_agent(google_flights_agent)
-
-    # Run Kayak Flights Agent
-    kayak_flights_agent = await kayak_flights_search_agent(
-        departure, destination, date, return_date
-    )
-
-    kayak_flights_run_result = await run_agent(kayak_flights_agent)
+    # Run Google Flights and Kayak Flights Agents concurrently, printing (and
+    # optionally saving) new flights as they are found
+    with contextlib.ExitStack() as stack:
+        # Serve repeated searches from the result cache, closed when the search ends
+        result_cache = ResultCache() if RESULT_CACHE_TTL_SECONDS > 0 else None
+        if result_cache:
+            stack.callback(result_cache.close)
+
+        stream_sink = (
+            jsonl_batch_sink(
+                stack.enter_context(open(STREAM_JSONL_PATH, "a", encoding="utf-8"))
+            )
+            if STREAM_JSONL_PATH
+            else None
+        )
+
+        def on_batch(provider, batch):
+            print_flight_batch(provider, batch)
+            if stream_sink:
+                stream_sink(provider, batch)
+
+        provider_results = await search_flights_concurrently(
+            departure,
+            destination,
+            date,
+            return_date,
+            result_cache=result_cache,
+            on_batch=on_batch,
+        )
+
+    # Record the searched fares in the fare history
+    if FARE_STORE_PATH:
+        record_results(provider_results)
 
     # Print Google and Kayak Flights results
-    print_structured_result(google_flights_run_result)
-    print_structured_result(kayak_flights_run_result)
+    for provider_result in provider_results:
+        print_structured_result(provider_result.result or provider_result.error)
+
+    # Match the same flights across providers and report the cheapest source
+    records = [
+        record
+        for provider_result in provider_results
+        for record in normalize_run_result(provider_result)
+    ]
+    print_fare_comparison(compare_fares(records))
+
+    print_provider_timings(provider_results)
 
 
 if __name__ == "__main__":
@@ -1,30 +1,99 @@
 """
 constants.py
 
-It loads environment variables from a .env file and sets default values for various
-API keys and model names. Additionally, it defines JSON schemas for flight search
-results from Google and Kayak.
+It exposes the settings loaded from the environment and the .env file, see
+`src/settings.py`, under their module-level names. Additionally, it defines JSON
+schemas for flight search results from Google and Kayak.
 """
 
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env
-load_dotenv(override=True)
+from src.settings import get_settings
+
+# Load .env and the settings; every entry point relies on this single load
+settings = get_settings()
 
 # Set default environment variables
 os.environ["ANONYMIZED_TELEMETRY"] = "false"
 
-# OpenAI API Key
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Settings under the names the modules import, see `src/settings.py`
+OPENAI_API_KEY = settings.openai_api_key
+OPENAPI_MODEL_NAME = settings.openapi_model_name
+OLLAMA_MODEL_NAME = settings.ollama_model_name
+OLLAMA_BASE_URL = settings.ollama_base_url
+OLLAMA_TEMPERATURE = settings.ollama_temperature
+OLLAMA_KEEP_ALIVE = settings.ollama_keep_alive
+AGENT_LLM = settings.agent_llm
+PAGE_EXTRACTION_LLM = settings.page_extraction_llm
+LLM_MAX_CONNECTIONS = settings.llm_max_connections
+LLM_KEEPALIVE_SECONDS = settings.llm_keepalive_seconds
+PROVIDER_TIMEOUT_SECONDS = settings.provider_timeout_seconds
+PROVIDER_MODULES = list(settings.provider_modules)
 
-# LLM Model Name
-OPENAPI_MODEL_NAME = os.getenv("OPENAPI_MODEL_NAME", "gpt-4o-mini")
+# Provider domains
+GOOGLE_FLIGHTS_DOMAIN = "www.google.com"
+KAYAK_FLIGHTS_DOMAIN = "www.kayak.com"
 
-# OLLAMA Model Name
-OLLAMA_MODEL_NAME = os.getenv("OLLAMA_MODEL_NAME", "phi4:latest")
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-OLLAMA_TEMPERATURE = os.getenv("OLLAMA_TEMPERATURE", "0.1")
+GOOGLE_FLIGHTS_BASE_URL = settings.google_flights_base_url
+KAYAK_FLIGHTS_BASE_URL = settings.kayak_flights_base_url
+POLITENESS_MIN_INTERVAL_SECONDS = {
+    GOOGLE_FLIGHTS_DOMAIN: settings.google_flights_min_interval_seconds,
+    KAYAK_FLIGHTS_DOMAIN: settings.kayak_flights_min_interval_seconds,
+}
+PROVIDER_CONCURRENCY = {
+    "google_flights": settings.google_flights_concurrency,
+    "kayak": settings.kayak_flights_concurrency,
+}
+BATCH_QUEUE_SIZE = settings.batch_queue_size
+SWEEP_FLEX_DAYS = settings.sweep_flex_days
+KAYAK_FLEXIBLE_DAYS = settings.kayak_flexible_days
+SERVICE_HOST = settings.service_host
+SERVICE_PORT = settings.service_port
+SERVICE_WORKERS = settings.service_workers
+SERVICE_QUEUE_SIZE = settings.service_queue_size
+SERVICE_MAX_JOBS = settings.service_max_jobs
+BROWSER_POOL_SIZE = settings.browser_pool_size
+BROWSER_MAX_USES = settings.browser_max_uses
+BROWSER_HEADLESS = settings.browser_headless
+RESOURCE_BLOCKING_ENABLED = settings.resource_blocking_enabled
+HEADLESS_WINDOW_SIZE = list(settings.headless_window_size)
+RESULT_CACHE_PATH = settings.result_cache_path
+RESULT_CACHE_TTL_SECONDS = settings.result_cache_ttl_seconds
+RESULT_CACHE_MAX_ENTRIES = settings.result_cache_max_entries
+LLM_CACHE_PATH = settings.llm_cache_path
+LLM_CACHE_MAX_ENTRIES = settings.llm_cache_max_entries
+LLM_CACHE_STEP_TYPES = list(settings.llm_cache_step_types)
+SEARCH_COALESCING_ENABLED = settings.search_coalescing_enabled
+DOM_EXTRACTION_ENABLED = settings.dom_extraction_enabled
+DOM_EXTRACTION_TIMEOUT_SECONDS = settings.dom_extraction_timeout_seconds
+PROVIDER_RETRY_ATTEMPTS = {
+    "google_flights": settings.google_flights_retry_attempts,
+    "kayak": settings.kayak_flights_retry_attempts,
+}
+RETRY_BASE_DELAY_SECONDS = settings.retry_base_delay_seconds
+RETRY_MAX_DELAY_SECONDS = settings.retry_max_delay_seconds
+CIRCUIT_FAILURE_THRESHOLD = settings.circuit_failure_threshold
+CIRCUIT_RESET_SECONDS = settings.circuit_reset_seconds
+PROVIDER_MAX_STEPS = {
+    "google_flights": settings.google_flights_max_steps,
+    "kayak": settings.kayak_flights_max_steps,
+}
+COMPLETION_DETECTION_ENABLED = settings.completion_detection_enabled
+COMPLETION_STABLE_STEPS = settings.completion_stable_steps
+PROMPT_MODE = settings.prompt_mode
+EXPORT_BATCH_SIZE = settings.export_batch_size
+FARE_STORE_PATH = settings.fare_store_path
+FARE_STORE_BATCH_SIZE = settings.fare_store_batch_size
+STREAM_JSONL_PATH = settings.stream_jsonl_path
+HISTORY_POLICY = settings.history_policy
+HISTORY_DIR = settings.history_dir
+HISTORY_MAX_RUNS = settings.history_max_runs
+AGENT_LOG_PATH = settings.agent_log_path
+AGENT_LOG_MAX_BYTES = settings.agent_log_max_bytes
+AGENT_LOG_BACKUP_COUNT = settings.agent_log_backup_count
+METRICS_JSONL_PATH = settings.metrics_jsonl_path
+METRICS_HOST = settings.metrics_host
+METRICS_PORT = settings.metrics_port
 
 # JSON Schemas for flight search results
 GOOGLE_FLIGHT_SEARCH_JSON_SCHEMA = {
@@ -259,3 +328,15 @@ KAYAK_FLIGHT_SEARCH_JSON_SCHEMA = {
     }
   ]
 }
+
+KAYAK_FLEXIBLE_DATES_JSON_SCHEMA = {
+  "prices": [
+    {"date": "2025-10-07", "price": "$298"},
+    {"date": "2025-10-08", "price": "$312"},
+    {"date": "2025-10-09", "price": "$276"},
+    {"date": "2025-10-10", "price": "$308"},
+    {"date": "2025-10-11", "price": "$341"},
+    {"date": "2025-10-12", "price": "$289"},
+    {"date": "2025-10-13", "price": "$305"}
+  ]
+}
@@ -0,0 +1,271 @@
+"""
+batch.py
+
+This module runs many flight search queries through bounded pools of concurrent
+browser agents. Queries are read lazily from CSV or JSONL files and fed to one bounded
+queue per provider by that provider's own feeder, so a slow provider only holds back its
+own queue while the other providers keep their workers busy. Every result is handed to a
+sink as soon as it completes; a failing sink is logged and does not stop the batch.
+"""
+
+import asyncio
+import csv
+import itertools
+import logging
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from src.constants import BATCH_QUEUE_SIZE, PROVIDER_TIMEOUT_SECONDS
+from src.lib.browser_pool import BrowserPool
+from src.lib.orchestrator import run_provider
+from src.lib.providers import AgentFactory, get_agent_factories, get_provider
+from src.lib.result_cache import ResultCache
+from src.typings import FlightQuery, ProviderRunResult
+
+logger = logging.getLogger(__name__)
+
+ResultSink = Callable[[ProviderRunResult], None]
+
+
+def read_flight_queries(path: str | Path) -> Iterator[FlightQuery]:
+    """
+    Lazily read flight queries from a CSV or JSONL file.
+
+    CSV files must have a header row with `departure`, `destination`, `date` and
+    optionally `return_date` columns. JSONL files hold one query object per line.
+
+    Args:
+        path (str | Path): The path to a `.csv` or `.jsonl` file.
+
+    Returns:
+        Iterator[FlightQuery]: The validated queries, in file order.
+    """
+
+    path = Path(path)
+
+    if path.suffix not in (".csv", ".jsonl"):
+        raise ValueError(f"Unsupported query file type: {path.suffix}")
+
+    with path.open(encoding="utf-8", newline="") as query_file:
+        if path.suffix == ".csv":
+            for row in csv.DictReader(query_file):
+                yield FlightQuery.model_validate(
+                    {key: value or None for key, value in row.items()}
+                )
+            return
+
+        for line in query_file:
+            if line.strip():
+                yield FlightQuery.model_validate_json(line)
+
+
+def jsonl_result_sink(output_file: TextIO) -> ResultSink:
+    """
+    Create a sink that appends each provider result as a JSON line and flushes it.
+
+    Args:
+        output_file (TextIO): An open text file to write results to.
+
+    Returns:
+        ResultSink: A callable that writes one result per call.
+    """
+
+    def write_result(provider_result: ProviderRunResult) -> None:
+        output_file.write(provider_result.model_dump_json() + "\n")
+        output_file.flush()
+
+    return write_result
+
+
+async def run_provider_worker(
+    provider: str,
+    agent_factory: AgentFactory,
+    queue: asyncio.Queue,
+    sink: ResultSink,
+    timeout: float,
+    browser_pool: BrowserPool | None = None,
+    result_cache: ResultCache | None = None,
+) -> None:
+    """
+    Pull queries for one provider from its queue until a `None` sentinel arrives.
+
+    A sink that raises is logged and the worker moves on to its next query, so one
+    result that cannot be written does not cancel the rest of the batch.
+
+    Args:
+        provider (str): The provider name.
+        agent_factory (AgentFactory): Coroutine function that builds the provider agent.
+        queue (asyncio.Queue): The provider's bounded query queue.
+        sink (ResultSink): Receives each result as soon as it completes.
+        timeout (float): Seconds allowed for each provider run.
+        browser_pool (BrowserPool, optional): Pool to borrow warm browser contexts from.
+        result_cache (ResultCache, optional): Cache of validated provider results.
+
+    Returns:
+        None
+    """
+
+    while True:
+        query = await queue.get()
+        try:
+            if query is None:
+                return
+            provider_result = await run_provider(
+                provider,
+                agent_factory,
+                query.departure,
+                query.destination,
+                query.date,
+                query.return_date,
+                timeout,
+                browser_pool,
+                result_cache,
+            )
+            try:
+                sink(provider_result)
+            except Exception:
+                logger.exception(
+                    "%s result sink failed for %s", provider, provider_result.query
+                )
+        finally:
+            queue.task_done()
+
+
+async def feed_provider_queue(
+    queries: Iterable[FlightQuery], queue: asyncio.Queue, worker_count: int
+) -> None:
+    """
+    Put every query on a provider's queue, then one `None` sentinel per worker.
+
+    Args:
+        queries (Iterable[FlightQuery]): The queries to search.
+        queue (asyncio.Queue): The provider's bounded query queue.
+        worker_count (int): The provider's workers, each stopped by a sentinel.
+
+    Returns:
+        None
+    """
+
+    for query in queries:
+        await queue.put(query)
+
+    for _ in range(worker_count):
+        await queue.put(None)
+
+
+async def run_batch(
+    queries: Iterable[FlightQuery],
+    sink: ResultSink,
+    providers: dict[str, AgentFactory] | None = None,
+    concurrency: dict[str, int] | None = None,
+    queue_size: int = BATCH_QUEUE_SIZE,
+    timeout: float = PROVIDER_TIMEOUT_SECONDS,
+    browser_pool: BrowserPool | None = None,
+    result_cache: ResultCache | None = None,
+) -> None:
+    """
+    Run every query against every provider with bounded per-provider concurrency.
+
+    Each provider has its own feeder filling its queue, so the batch is not paced by
+    its slowest provider. Queries a faster provider has already read are held until
+    the slower providers reach them.
+
+    Args:
+        queries (Iterable[FlightQuery]): The queries to search; consumed lazily.
+        sink (ResultSink): Receives each provider result as soon as it completes.
+        providers (dict[str, AgentFactory], optional): Agent factories by provider name.
+            Defaults to every registered provider searched by default.
+        concurrency (dict[str, int], optional): Concurrent agents per provider.
+            Defaults to each provider's `concurrency`.
+        queue_size (int, optional): Pending queries buffered per provider.
+        timeout (float, optional): Seconds allowed for each provider run.
+        browser_pool (BrowserPool, optional): Pool to borrow warm browser contexts from.
+            Defaults to None, which makes every agent launch its own browser.
+        result_cache (ResultCache, optional): Cache of validated provider results.
+
+    Returns:
+        None
+    """
+
+    providers = providers or get_agent_factories()
+    concurrency = concurrency or {}
+    worker_counts = {
+        provider: max(1, concurrency.get(provider, get_provider(provider).concurrency))
+        for provider in providers
+    }
+    queues = {provider: asyncio.Queue(maxsize=queue_size) for provider in providers}
+
+    async with asyncio.TaskGroup() as task_group:
+        for provider, agent_factory in providers.items():
+            for _ in range(worker_counts[provider]):
+                task_group.create_task(
+                    run_provider_worker(
+                        provider,
+                        agent_factory,
+                        queues[provider],
+                        sink,
+                        timeout,
+                        browser_pool,
+                        result_cache,
+                    )
+                )
+
+        queries_by_provider = itertools.tee(queries, len(queues))
+        for (provider, queue), provider_queries in zip(
+            queues.items(), queries_by_provider
+        ):
+            task_group.create_task(
+                feed_provider_queue(provider_queries, queue, worker_counts[provider])
+            )
+
+
+def parse_concurrency(values: list[str]) -> dict[str, int]:
+    """
+    Parse `provider=limit` command line values into a concurrency mapping.
+
+    Args:
+        values (list[str]): Values such as `["google_flights=4", "kayak=2"]`.
+
+    Returns:
+        dict[str, int]: Concurrency limits by provider name.
+    """
+
+    concurrency = {}
+
+    for value in values:
+        provider, separator, limit = value.partition("=")
+        if not separator or not limit.isdigit():
+            raise ValueError(f"Expected provider=limit, got: {value}")
+        concurrency[provider] = int(limit)
+
+    return concurrency
+
+
+def format_result_summary(provider_result: ProviderRunResult) -> str:
+    """
+    Format a one-line progress summary for a completed provider run.
+
+    Args:
+        provider_result (ProviderRunResult): The completed provider run.
+
+    Returns:
+        str: A human readable summary line.
+    """
+
+    query = provider_result.query
+    status = "ok" if provider_result.is_successful else provider_result.error
+    if provider_result.is_cached:
+        status += ", cached"
+    if provider_result.is_coalesced:
+        status += ", coalesced"
+    if provider_result.extraction_method:
+        status += f", {provider_result.extraction_method}"
+    if provider_result.metrics:
+        status += f", {provider_result.metrics.steps} steps"
+    trip = f"{query.departure}-{query.destination} {query.date}"
+    if query.return_date:
+        trip += f"/{query.return_date}"
+    return (
+        f"{provider_result.provider} {trip}: "
+        f"{provider_result.elapsed_seconds:.1f}s ({status})"
+    )
@@ -0,0 +1,242 @@
+"""
+browser_pool.py
+
+This module provides a long-lived pool of warm Chromium browsers for agent runs.
+Each run gets its own isolated browser context, so per-query startup overhead is
+context creation instead of a full browser launch. Browsers are health checked when
+handed out and recycled after a configurable number of uses. A context can be given a
+provider's resource profile to load its pages without images, fonts and trackers.
+browser-use is imported when the first browser is configured, not with this module.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator
+
+from src.constants import BROWSER_HEADLESS, BROWSER_MAX_USES, BROWSER_POOL_SIZE
+from src.lib.resource_blocking import ResourceProfile, apply_resource_profile
+
+if TYPE_CHECKING:
+    from browser_use import Browser, BrowserConfig
+    from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def standalone_browser_context(
+    browser_config: "BrowserConfig | None" = None,
+    resource_profile: ResourceProfile | None = None,
+) -> AsyncIterator["BrowserContext"]:
+    """
+    Launch a one-off browser and yield a context on it, closing both afterwards.
+
+    This gives unpooled runs the same injected-context lifecycle as pooled ones.
+
+    Args:
+        browser_config (BrowserConfig, optional): Config for the browser.
+        resource_profile (ResourceProfile, optional): Requests the context's pages
+            load without. Defaults to None, which loads everything.
+
+    Returns:
+        AsyncIterator[BrowserContext]: The browser context for one agent run.
+    """
+
+    from browser_use import Browser, BrowserConfig
+
+    browser_config = browser_config or BrowserConfig(headless=BROWSER_HEADLESS)
+    browser = Browser(config=browser_config)
+    context_config = browser.config.new_context_config
+    if resource_profile:
+        context_config = resource_profile.context_config(
+            context_config, browser_config.headless
+        )
+
+    try:
+        browser_context = await browser.new_context(context_config)
+        try:
+            if resource_profile:
+                await apply_resource_profile(browser_context, resource_profile)
+            yield browser_context
+        finally:
+            await browser_context.close()
+    finally:
+        await browser.close()
+
+
+class PooledBrowser:
+    """
+    A pooled browser and the number of agent runs it has served.
+    """
+
+    def __init__(self, browser: "Browser") -> None:
+        self.browser = browser
+        self.uses = 0
+
+    @property
+    def is_healthy(self) -> bool:
+        """
+        Whether the underlying Playwright browser is still connected.
+        """
+
+        playwright_browser = self.browser.playwright_browser
+        return playwright_browser is not None and playwright_browser.is_connected()
+
+
+class BrowserPool:
+    """
+    A pool of pre-spawned browsers that hands out one isolated context per agent run.
+
+    Use it as an async context manager, or call `start()` and `close()` explicitly.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_uses: int = BROWSER_MAX_USES,
+        browser_config: "BrowserConfig | None" = None,
+        context_config: "BrowserContextConfig | None" = None,
+    ) -> None:
+        """
+        Initialize the pool without launching any browser.
+
+        Args:
+            size (int, optional): Number of warm browsers kept in the pool.
+            max_uses (int, optional): Agent runs served before a browser is recycled.
+            browser_config (BrowserConfig, optional): Config for every pooled browser.
+            context_config (BrowserContextConfig, optional): Config for every context.
+        """
+
+        from browser_use import BrowserConfig
+        from browser_use.browser.context import BrowserContextConfig
+
+        self.size = size
+        self.max_uses = max_uses
+        self.browser_config = browser_config or BrowserConfig(headless=BROWSER_HEADLESS)
+        self.context_config = context_config or BrowserContextConfig()
+        self._idle: asyncio.Queue[PooledBrowser] = asyncio.Queue()
+        self._browsers: set[PooledBrowser] = set()
+        self._respawns: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Pre-spawn every browser in the pool so the first runs start warm.
+
+        Returns:
+            None
+        """
+
+        spawned = await asyncio.gather(*(self._spawn() for _ in range(self.size)))
+        for pooled in spawned:
+            self._idle.put_nowait(pooled)
+
+    async def close(self) -> None:
+        """
+        Close every browser owned by the pool.
+
+        Returns:
+            None
+        """
+
+        for task in self._respawns:
+            task.cancel()
+        await asyncio.gather(*self._respawns, return_exceptions=True)
+        await asyncio.gather(
+            *(self._close_browser(pooled) for pooled in list(self._browsers))
+        )
+
+    @asynccontextmanager
+    async def context(
+        self, resource_profile: ResourceProfile | None = None
+    ) -> AsyncIterator["BrowserContext"]:
+        """
+        Borrow a browser and yield a fresh, isolated context on it.
+
+        The context is closed when the block exits, and the browser is returned to
+        the pool or recycled once it has served `max_uses` runs.
+
+        Args:
+            resource_profile (ResourceProfile, optional): Requests the context's pages
+                load without. Defaults to None, which loads everything.
+
+        Returns:
+            AsyncIterator[BrowserContext]: The browser context for one agent run.
+        """
+
+        context_config = self.context_config
+        if resource_profile:
+            context_config = resource_profile.context_config(
+                context_config, self.browser_config.headless
+            )
+        pooled = await self._acquire()
+        browser_context = await pooled.browser.new_context(context_config)
+
+        try:
+            if resource_profile:
+                await apply_resource_profile(browser_context, resource_profile)
+            yield browser_context
+        finally:
+            try:
+                await browser_context.close()
+            finally:
+                pooled.uses += 1
+                self._release(pooled)
+
+    async def _acquire(self) -> PooledBrowser:
+        pooled = await self._idle.get()
+
+        if pooled.is_healthy:
+            return pooled
+
+        logger.warning("Replacing unhealthy browser after %d uses", pooled.uses)
+        await self._close_browser(pooled)
+
+        try:
+            return await self._spawn()
+        except Exception:
+            # Keep the slot so a later run can retry the launch
+            self._idle.put_nowait(pooled)
+            raise
+
+    def _release(self, pooled: PooledBrowser) -> None:
+        if pooled.uses < self.max_uses and pooled.is_healthy:
+            self._idle.put_nowait(pooled)
+            return
+
+        task = asyncio.create_task(self._recycle(pooled))
+        self._respawns.add(task)
+        task.add_done_callback(self._respawns.discard)
+
+    async def _recycle(self, pooled: PooledBrowser) -> None:
+        await self._close_browser(pooled)
+
+        try:
+            pooled = await self._spawn()
+        except Exception as e:
+            logger.error("Failed to respawn pooled browser: %s", e)
+
+        self._idle.put_nowait(pooled)
+
+    async def _spawn(self) -> PooledBrowser:
+        from browser_use import Browser
+
+        browser = Browser(config=self.browser_config)
+        await browser.get_playwright_browser()
+        pooled = PooledBrowser(browser)
+        self._browsers.add(pooled)
+        return pooled
+
+    async def _close_browser(self, pooled: PooledBrowser) -> None:
+        self._browsers.discard(pooled)
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning("Failed to close pooled browser: %s", e)
@@ -0,0 +1,111 @@
+"""
+compare.py
+
+This module merges the flight records of several providers into one row per itinerary.
+Flights are matched on the normalized airline name, route, currency and parsed
+departure/arrival times, so the same flight listed with different display strings
+collapses into one itinerary. Matching, deduplication and the cheapest-source and
+price-spread columns are computed with pandas group and pivot operations instead of
+nested Python loops. pandas is imported on the first comparison.
+"""
+
+from dataclasses import fields
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+from src.lib.flight_records import FlightRecord
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+RECORD_FIELDS = [field.name for field in fields(FlightRecord)]
+
+ITINERARY_KEY = ["airline_key", "route", "currency", "departure_at", "arrival_at"]
+
+
+def records_to_frame(records: list[FlightRecord]) -> "pd.DataFrame":
+    """
+    Build a data frame with one row per flight record.
+
+    Args:
+        records (list[FlightRecord]): The normalized records of one or more providers.
+
+    Returns:
+        pd.DataFrame: One column per `FlightRecord` field.
+    """
+
+    import pandas as pd
+
+    return pd.DataFrame.from_records(
+        map(attrgetter(*RECORD_FIELDS), records), columns=RECORD_FIELDS
+    )
+
+
+def compare_fares(records: list[FlightRecord]) -> "pd.DataFrame":
+    """
+    Match flights across providers and report the best price of each itinerary.
+
+    Records without a price or parsed times cannot be matched and are dropped. Repeated
+    listings of one flight by the same provider keep the provider's lowest price.
+
+    Args:
+        records (list[FlightRecord]): The normalized records of one or more providers.
+
+    Returns:
+        pd.DataFrame: One row per itinerary, sorted by best price, with the airline,
+            route, times and duration, one price column per provider (in cents, NaN when
+            the provider does not list the flight), `best_price_cents`,
+            `cheapest_provider`, `price_spread_cents` and `provider_count`. The
+            provider price column names are listed in `attrs["providers"]`.
+    """
+
+    import pandas as pd
+
+    frame = records_to_frame(records).dropna(
+        subset=["price_cents", "currency", "departure_at", "arrival_at"]
+    )
+    if frame.empty:
+        return pd.DataFrame()
+
+    frame = frame.assign(
+        airline_key=frame["airline"]
+        .str.casefold()
+        .str.replace(r"[^0-9a-z]", "", regex=True)
+    )
+
+    prices = frame.pivot_table(
+        index=ITINERARY_KEY,
+        columns="provider",
+        values="price_cents",
+        aggfunc="min",
+    )
+    providers = list(prices.columns)
+    details = frame.groupby(ITINERARY_KEY)[["airline", "duration_minutes"]].first()
+
+    itineraries = details.join(prices)
+    itineraries["best_price_cents"] = prices.min(axis=1)
+    itineraries["cheapest_provider"] = prices.idxmin(axis=1)
+    itineraries["price_spread_cents"] = prices.max(axis=1) - prices.min(axis=1)
+    itineraries["provider_count"] = prices.notna().sum(axis=1)
+
+    itineraries = (
+        itineraries.reset_index()
+        .drop(columns="airline_key")
+        .sort_values(["best_price_cents", "departure_at"], ignore_index=True)[
+            [
+                "airline",
+                "route",
+                "departure_at",
+                "arrival_at",
+                "duration_minutes",
+                "currency",
+                *providers,
+                "best_price_cents",
+                "cheapest_provider",
+                "price_spread_cents",
+                "provider_count",
+            ]
+        ]
+    )
+    itineraries.attrs["providers"] = providers
+    return itineraries
@@ -0,0 +1,290 @@
+"""
+completion.py
+
+This module stops an agent as soon as the result list is fully extracted. After every
+agent step, the flights the agent extracted in that step (the JSON its page content
+extraction returned) are validated against the provider's output model and
+accumulated across steps (new flights can be handed to a callback as they appear, see
+`src/lib/streaming.py`). Once the page's announced result count is reached, or a
+further extraction adds no flights for a number of steps, the `done` action is executed
+with the accumulated output, so the agent does not keep scrolling and re-evaluating
+(and spending LLM calls) after it has every flight.
+
+The step hook relies on browser-use 0.1.x internals, checked against 0.1.37 (the
+`^0.1.35` pin in `pyproject.toml`): `Agent.run` calls `self.step()` and stops once
+`history.is_done()`, a step leaves its action results in `Agent._last_result`, and a
+run counts as done when its last `AgentHistory` carries a `done` result.
+`tests/test_completion.py` checks these against the installed version.
+"""
+
+import json
+import logging
+import re
+from typing import TYPE_CHECKING, Any, Callable
+
+from pydantic import BaseModel, ValidationError
+
+from src.constants import COMPLETION_STABLE_STEPS
+from src.lib.extraction import count_listed_results
+
+if TYPE_CHECKING:
+    from browser_use import Agent
+    from browser_use.agent.views import ActionResult
+    from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+
+FlightsByAirline = dict[str, dict[str, Any]]
+
+EXTRACTED_JSON_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def build_output(
+    output_model: type[BaseModel], airlines: FlightsByAirline
+) -> BaseModel:
+    """
+    Build a controller output from flights grouped by airline.
+
+    Args:
+        output_model (type[BaseModel]): The provider's controller output model.
+        airlines (FlightsByAirline): Flights by airline name, keyed by their JSON.
+
+    Returns:
+        BaseModel: The validated output.
+    """
+
+    return output_model.model_validate(
+        {
+            "airlines": [
+                {"name": name, "flights": list(flights.values())}
+                for name, flights in airlines.items()
+            ]
+        }
+    )
+
+
+def add_new_flights(airlines: FlightsByAirline, output: BaseModel) -> BaseModel | None:
+    """
+    Add the flights of a controller output that were not seen before.
+
+    Args:
+        airlines (FlightsByAirline): The flights gathered so far, updated in place.
+        output (BaseModel): The flights extracted in this step.
+
+    Returns:
+        BaseModel | None: An output with only the new flights, or None when every
+            flight was already seen.
+    """
+
+    new_airlines: FlightsByAirline = {}
+
+    for airline in output.airlines:
+        flights = airlines.setdefault(airline.name, {})
+        for flight in airline.flights:
+            key = flight.model_dump_json()
+            if key not in flights:
+                flights[key] = flight
+                new_airlines.setdefault(airline.name, {})[key] = flight
+
+    return build_output(type(output), new_airlines) if new_airlines else None
+
+
+def parse_extracted_flights(
+    content: str, output_model: type[BaseModel], route: str
+) -> BaseModel | None:
+    """
+    Read the flights out of the content an agent action extracted.
+
+    Args:
+        content (str): The action's extracted content, e.g. `📄  Extracted from page`
+            followed by the JSON the page extraction LLM answered.
+        output_model (type[BaseModel]): The provider's controller output model.
+        route (str): The route label filled into flights that lack one.
+
+    Returns:
+        BaseModel | None: The validated flights, or None when the content holds no
+            JSON in the output format.
+    """
+
+    match = EXTRACTED_JSON_PATTERN.search(content)
+    if match is None:
+        return None
+    try:
+        data = json.loads(match[0])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("airlines"), list):
+        return None
+
+    for airline in data["airlines"]:
+        for flight in (
+            (airline.get("flights") or []) if isinstance(airline, dict) else []
+        ):
+            if isinstance(flight, dict):
+                flight.setdefault("route", route)
+    try:
+        return output_model.model_validate(data)
+    except ValidationError:
+        return None
+
+
+class CompletionDetector:
+    """
+    Wraps one agent's step to finish the run once every listed flight is extracted.
+    """
+
+    def __init__(
+        self,
+        agent: "Agent",
+        route: str,
+        result_count_selector: str | None = None,
+        stable_steps: int = COMPLETION_STABLE_STEPS,
+        on_new_flights: Callable[[BaseModel], None] | None = None,
+        stop_when_complete: bool = True,
+    ) -> None:
+        """
+        Watch an agent that has not started running yet.
+
+        Args:
+            agent (Agent): The agent to watch; its controller must have the
+                provider's output model.
+            route (str): The route label, e.g. `SFO-JFK`.
+            result_count_selector (str, optional): CSS selector of the element that
+                announces the number of results on the page.
+            stable_steps (int, optional): Steps without new flights before the list
+                counts as complete.
+            on_new_flights (Callable[[BaseModel], None], optional): Called with an
+                output holding only the flights a step added.
+            stop_when_complete (bool, optional): Whether to force `done` once the list
+                is complete. Defaults to True.
+        """
+
+        self.agent = agent
+        self.route = route
+        self.result_count_selector = result_count_selector
+        self.stable_steps = stable_steps
+        self.on_new_flights = on_new_flights
+        self.stop_when_complete = stop_when_complete
+        self.flight_count = 0
+        self.steps_without_new_flights = 0
+        self.is_forced_done = False
+
+        self._airlines: FlightsByAirline = {}
+        self._output_model: type[BaseModel] | None = agent.controller.output_model
+        self._step = agent.step
+        self._is_step_wrapped = "step" in vars(agent)
+        agent.step = self._step_and_check
+
+    @property
+    def output(self) -> BaseModel | None:
+        """
+        The flights gathered so far, or None before the first extraction.
+        """
+
+        if self._output_model is None or not self._airlines:
+            return None
+        return build_output(self._output_model, self._airlines)
+
+    def add_output(self, output: BaseModel) -> BaseModel | None:
+        """
+        Gather the flights of an output and report the ones not seen before.
+
+        Args:
+            output (BaseModel): A controller output, from the page or the agent.
+
+        Returns:
+            BaseModel | None: An output with only the new flights, or None.
+        """
+
+        self._output_model = self._output_model or type(output)
+        new_flights = add_new_flights(self._airlines, output)
+        if new_flights is not None:
+            self.flight_count += sum(
+                len(airline.flights) for airline in new_flights.airlines
+            )
+            if self.on_new_flights:
+                self.on_new_flights(new_flights)
+        return new_flights
+
+    def finish(self) -> None:
+        """
+        Remove the step wrapper, restoring any wrapper it was set over.
+
+        Returns:
+            None
+        """
+
+        if self._is_step_wrapped:
+            self.agent.step = self._step
+        else:
+            vars(self.agent).pop("step", None)
+
+    async def _step_and_check(self, *args: Any, **kwargs: Any) -> None:
+        await self._step(*args, **kwargs)
+        if (
+            self.agent.history.is_done()
+            or self.agent._stopped
+            or self._output_model is None
+        ):
+            return
+
+        outputs = []
+        for result in self.agent._last_result or []:
+            if result.extracted_content and not result.error:
+                output = parse_extracted_flights(
+                    result.extracted_content, self._output_model, self.route
+                )
+                if output is not None:
+                    outputs.append(output)
+        if not outputs:
+            return
+
+        new_flights = [self.add_output(output) for output in outputs]
+        if any(flights is not None for flights in new_flights):
+            self.steps_without_new_flights = 0
+        else:
+            self.steps_without_new_flights += 1
+        if not self.stop_when_complete:
+            return
+
+        page = await self.agent.browser_context.get_current_page()
+        listed_count = (
+            await count_listed_results(page, self.result_count_selector)
+            if self.result_count_selector
+            else None
+        )
+        is_complete = (
+            listed_count is not None and self.flight_count >= listed_count
+        ) or self.steps_without_new_flights >= self.stable_steps
+
+        if is_complete:
+            logger.info(
+                "Forcing done after %s flights (page lists %s)",
+                self.flight_count,
+                listed_count,
+            )
+            await self._force_done(page)
+
+    async def _force_done(self, page: "Page") -> None:
+        from browser_use.agent.views import AgentHistory
+        from browser_use.browser.views import BrowserStateHistory
+
+        action = self.agent.ActionModel(done=self.output.model_dump())
+        result: ActionResult = await self.agent.controller.act(
+            action, self.agent.browser_context
+        )
+        self.agent._last_result = [result]
+        self.agent.history.history.append(
+            AgentHistory(
+                model_output=None,
+                result=[result],
+                state=BrowserStateHistory(
+                    url=page.url,
+                    title=await page.title(),
+                    tabs=await self.agent.browser_context.get_tabs_info(),
+                    interacted_element=[None],
+                ),
+            )
+        )
+        self.is_forced_done = True
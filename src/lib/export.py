@@ -0,0 +1,339 @@
+"""
+export.py
+
+This module exports normalized flight records for large fare sweeps. Records are
+buffered into columnar batches and appended incrementally, one row group or record
+batch per flush, to Parquet or Arrow IPC files partitioned by route and travel date
+(`route=SFO-JFK/travel_date=2025-10-10/part-<id>.parquet`), so the output can be
+scanned or memory-mapped as a dataset without loading it whole. Partitions are named
+after the searched query, not the route the provider output reports, and characters
+that are unsafe in a directory name are replaced. A JSONL streaming
+writer is available when pyarrow is not installed.
+
+pyarrow is an optional dependency: `poetry install --extras export`.
+"""
+
+import json
+import logging
+import re
+import uuid
+from dataclasses import asdict, fields
+from datetime import datetime
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from src.constants import EXPORT_BATCH_SIZE
+from src.lib.flight_records import FlightRecord, normalize_run_result
+from src.typings import FlightQuery, ProviderRunResult
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("parquet", "arrow", "jsonl")
+
+PARTITION_COLUMNS = ("route", "travel_date")
+
+UNSAFE_PARTITION_PATTERN = re.compile(r"[^A-Za-z0-9_-]")
+
+RECORD_COLUMNS = tuple(
+    field.name for field in fields(FlightRecord) if field.name not in PARTITION_COLUMNS
+)
+
+
+def build_fare_schema() -> "pa.Schema":
+    """
+    Build the Arrow schema of exported flight records, without partition columns.
+
+    Returns:
+        pa.Schema: The column names and types of each exported file.
+    """
+
+    return pa.schema(
+        [
+            ("provider", pa.string()),
+            ("airline", pa.string()),
+            ("departure_at", pa.timestamp("s")),
+            ("arrival_at", pa.timestamp("s")),
+            ("duration_minutes", pa.int32()),
+            ("price_cents", pa.int64()),
+            ("currency", pa.string()),
+            ("cabin", pa.string()),
+            ("emissions_kg", pa.int32()),
+            ("emissions_percent", pa.int16()),
+        ]
+    )
+
+
+def query_partition(query: FlightQuery) -> tuple[str, str]:
+    """
+    Return the route and travel date partition values of a searched query.
+
+    Args:
+        query (FlightQuery): The searched query.
+
+    Returns:
+        tuple[str, str]: The route (`SFO-JFK`) and the departure date, each safe to
+            use as a directory name.
+    """
+
+    return tuple(
+        UNSAFE_PARTITION_PATTERN.sub("_", value)
+        for value in (f"{query.departure}-{query.destination}", query.date)
+    )
+
+
+def records_to_columns(records: list[FlightRecord]) -> dict[str, list[Any]]:
+    """
+    Transpose flight records into one list of values per column.
+
+    Args:
+        records (list[FlightRecord]): The records to transpose.
+
+    Returns:
+        dict[str, list[Any]]: Column values by name, partition columns excluded.
+    """
+
+    return {column: list(map(attrgetter(column), records)) for column in RECORD_COLUMNS}
+
+
+class PartitionedFareWriter:
+    """
+    Appends flight records to Parquet or Arrow IPC files partitioned by route and date.
+
+    Records are buffered per partition and written as one row group (Parquet) or record
+    batch (Arrow) every `batch_size` records. Each writer creates its own part file in
+    every partition it touches, so several runs can export into the same directory.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        file_format: str = "parquet",
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> None:
+        """
+        Prepare a writer; part files are created on the first write to a partition.
+
+        Args:
+            root (str | Path): The dataset directory.
+            file_format (str, optional): `parquet` or `arrow`. Defaults to `parquet`.
+            batch_size (int, optional): Records buffered per partition before a write.
+        """
+
+        if pa is None:
+            raise ImportError(
+                "Columnar export requires pyarrow: poetry install --extras export"
+            )
+        if file_format not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported columnar format: {file_format}")
+
+        self.root = Path(root)
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.schema = build_fare_schema()
+        self.part_name = f"part-{uuid.uuid4().hex[:12]}.{file_format}"
+        self._buffers: dict[tuple[str, str], list[FlightRecord]] = {}
+        self._writers: dict[tuple[str, str], Any] = {}
+
+    def __enter__(self) -> "PartitionedFareWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, query: FlightQuery, records: Iterable[FlightRecord]) -> None:
+        """
+        Buffer records of one search in the query's partition, and write the buffer
+        once it is full.
+
+        Args:
+            query (FlightQuery): The searched query.
+            records (Iterable[FlightRecord]): The normalized records of the search.
+
+        Returns:
+            None
+        """
+
+        partition = query_partition(query)
+        for record in records:
+            buffer = self._buffers.setdefault(partition, [])
+            buffer.append(record)
+            if len(buffer) >= self.batch_size:
+                self._write_partition(partition)
+
+    def flush(self) -> None:
+        """
+        Write every buffered record.
+
+        Returns:
+            None
+        """
+
+        for partition in list(self._buffers):
+            self._write_partition(partition)
+
+    def close(self) -> None:
+        """
+        Write the remaining records and close every part file.
+
+        Returns:
+            None
+        """
+
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def _write_partition(self, partition: tuple[str, str]) -> None:
+        records = self._buffers.pop(partition, None)
+        if not records:
+            return
+
+        batch = pa.RecordBatch.from_pydict(
+            records_to_columns(records), schema=self.schema
+        )
+        writer = self._writers.get(partition)
+        if writer is None:
+            writer = self._writers[partition] = self._open_writer(partition)
+        if self.file_format == "parquet":
+            writer.write_batch(batch)
+        else:
+            writer.write(batch)
+
+    def _open_writer(self, partition: tuple[str, str]) -> Any:
+        route, travel_date = partition
+        directory = self.root / f"route={route}" / f"travel_date={travel_date}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.part_name
+
+        if self.file_format == "parquet":
+            return pq.ParquetWriter(path, self.schema)
+        return pa.ipc.new_file(path, self.schema)
+
+
+def _isoformat(value: datetime) -> str:
+    return value.isoformat()
+
+
+class JsonlFareWriter:
+    """
+    Appends flight records to a JSONL file, one flat object per record.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Open the file for appending.
+
+        Args:
+            path (str | Path): The JSONL file records are appended to.
+        """
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def __enter__(self) -> "JsonlFareWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, query: FlightQuery, records: Iterable[FlightRecord]) -> None:
+        """
+        Append the records of one search and flush them.
+
+        Args:
+            query (FlightQuery): The searched query.
+            records (Iterable[FlightRecord]): The normalized records of the search.
+
+        Returns:
+            None
+        """
+
+        route, travel_date = query_partition(query)
+        for record in records:
+            row = {**asdict(record), "route": route, "travel_date": travel_date}
+            self._file.write(json.dumps(row, default=_isoformat) + "\n")
+        self._file.flush()
+
+    def flush(self) -> None:
+        """
+        Flush the file buffer.
+
+        Returns:
+            None
+        """
+
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Close the file.
+
+        Returns:
+            None
+        """
+
+        self._file.close()
+
+
+FareWriter = PartitionedFareWriter | JsonlFareWriter
+
+
+def open_fare_writer(
+    path: str | Path, file_format: str, batch_size: int = EXPORT_BATCH_SIZE
+) -> FareWriter:
+    """
+    Open a fare writer for an export format.
+
+    Args:
+        path (str | Path): A dataset directory, or a file path for `jsonl`.
+        file_format (str): One of `EXPORT_FORMATS`.
+        batch_size (int, optional): Records buffered per partition before a write.
+
+    Returns:
+        FareWriter: The open writer; close it to write the remaining records.
+    """
+
+    if file_format == "jsonl":
+        return JsonlFareWriter(path)
+    return PartitionedFareWriter(path, file_format, batch_size)
+
+
+def fare_export_sink(writer: FareWriter) -> Callable[[ProviderRunResult], None]:
+    """
+    Create a batch result sink that exports the flights of each successful run.
+
+    Failed runs are skipped, and a result that cannot be exported is logged, so one
+    bad result does not stop the batch.
+
+    Args:
+        writer (FareWriter): The open fare writer.
+
+    Returns:
+        Callable[[ProviderRunResult], None]: A sink for `run_batch`.
+    """
+
+    def export_result(provider_result: ProviderRunResult) -> None:
+        if not provider_result.is_successful:
+            return
+
+        try:
+            records = normalize_run_result(provider_result)
+            if records:
+                writer.write(provider_result.query, records)
+        except Exception:
+            logger.exception(
+                "%s result could not be exported for %s",
+                provider_result.provider,
+                provider_result.query,
+            )
+
+    return export_result
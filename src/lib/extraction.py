@@ -0,0 +1,146 @@
+"""
+extraction.py
+
+This module provides the deterministic DOM extraction fast path. A provider extractor
+reads the loaded results page with CSS selectors and validates the rows into the
+provider's controller output, so the LLM agent is only needed when extraction fails.
+A page counts as failed when any listed result cannot be read completely, since a
+partial list would otherwise be returned as the search result.
+Playwright is imported by the extraction calls, which only run on a live page.
+"""
+
+import re
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from pydantic import BaseModel
+
+from src.constants import DOM_EXTRACTION_TIMEOUT_SECONDS
+
+if TYPE_CHECKING:
+    from browser_use.browser.context import BrowserContext
+    from playwright.async_api import Page
+
+Extractor = Callable[..., Awaitable[BaseModel]]
+
+RESULT_COUNT_PATTERN = re.compile(r"\d+")
+
+EXTRACT_ROWS_SCRIPT = """
+({ item, fields }) => Array.from(document.querySelectorAll(item)).map((element) =>
+    Object.fromEntries(
+        Object.entries(fields).map(([name, selector]) => {
+            const node = element.querySelector(selector);
+            return [name, node ? node.innerText : null];
+        })
+    )
+)
+"""
+
+
+class ExtractionError(Exception):
+    """
+    Raised when a results page cannot be extracted into a valid controller output.
+    """
+
+
+def clean_text(text: str | None) -> str:
+    """
+    Collapse newlines and non-breaking spaces used by flight sites into single spaces.
+
+    Args:
+        text (str | None): Raw `innerText` of a node, or None if it was missing.
+
+    Returns:
+        str: The trimmed text, or an empty string.
+    """
+
+    if not text:
+        return ""
+    return " ".join(text.split())
+
+
+async def extract_rows(
+    page: "Page",
+    item_selector: str,
+    field_selectors: dict[str, str],
+    timeout: float = DOM_EXTRACTION_TIMEOUT_SECONDS,
+) -> list[dict[str, str]]:
+    """
+    Wait for result items and read one text value per field selector from each.
+
+    Args:
+        page (Page): The Playwright page showing the results.
+        item_selector (str): CSS selector matching one element per flight.
+        field_selectors (dict[str, str]): CSS selectors, relative to each item, by field.
+        timeout (float, optional): Seconds to wait for the first item to render;
+            0 reads the items currently on the page without waiting.
+
+    Returns:
+        list[dict[str, str]]: Cleaned field values for every item on the page.
+    """
+
+    from playwright.async_api import Error as PlaywrightError
+
+    try:
+        if timeout > 0:
+            await page.wait_for_selector(item_selector, timeout=timeout * 1000)
+        rows = await page.evaluate(
+            EXTRACT_ROWS_SCRIPT, {"item": item_selector, "fields": field_selectors}
+        )
+    except PlaywrightError as e:
+        raise ExtractionError(f"Results did not render: {e}") from e
+
+    return [{name: clean_text(value) for name, value in row.items()} for row in rows]
+
+
+async def count_listed_results(page: "Page", selector: str) -> int | None:
+    """
+    Read the result count a results page announces, e.g. `17 results returned.`
+
+    Args:
+        page (Page): The Playwright page showing the results.
+        selector (str): CSS selector of the element holding the count.
+
+    Returns:
+        int | None: The first number in the element, or None when there is none.
+    """
+
+    from playwright.async_api import Error as PlaywrightError
+
+    try:
+        text = await page.evaluate(
+            "(selector) => document.querySelector(selector)?.innerText ?? null",
+            selector,
+        )
+    except PlaywrightError:
+        return None
+
+    match = RESULT_COUNT_PATTERN.search(clean_text(text).replace(",", ""))
+    return int(match[0]) if match else None
+
+
+async def extract_from_url(
+    browser_context: "BrowserContext", url: str, extractor: Extractor, route: str
+) -> BaseModel:
+    """
+    Navigate a browser context to a results page and run a provider extractor on it.
+
+    Args:
+        browser_context (BrowserContext): The context the agent would otherwise use.
+        url (str): The provider search URL.
+        extractor (Extractor): The provider's page extractor.
+        route (str): The route label, e.g. `SFO-JFK`.
+
+    Returns:
+        BaseModel: The validated provider controller output.
+    """
+
+    from playwright.async_api import Error as PlaywrightError
+
+    page = await browser_context.get_current_page()
+
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+    except PlaywrightError as e:
+        raise ExtractionError(f"Navigation failed: {e}") from e
+
+    return await extractor(page, route)
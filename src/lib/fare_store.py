@@ -0,0 +1,543 @@
+"""
+fare_store.py
+
+This module records every validated provider search in an embedded SQLite fare
+history, so prices can be followed over time instead of being printed and thrown
+away. Each search is stored with its query, provider, timestamp and JSON result, and
+its normalized flights are bulk inserted in batches into a `fares` table indexed on
+(route, travel date, search time, airline). The cheapest fare of each search is kept
+on its `searches` row, so trend queries (the cheapest fare of a route per time
+bucket) and price-drop queries (the cheapest fare of each search against the previous
+search of the same travel date and provider) read one row per search rather than
+every fare it found.
+"""
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from operator import attrgetter
+from pathlib import Path
+from typing import Callable, Iterable
+
+from src.constants import FARE_STORE_BATCH_SIZE, FARE_STORE_PATH
+from src.lib.flight_records import FlightRecord, normalize_run_result
+from src.lib.result_cache import normalize_flight_query
+from src.typings import FlightQuery, ProviderRunResult
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    provider TEXT NOT NULL,
+    route TEXT NOT NULL,
+    travel_date TEXT NOT NULL,
+    return_date TEXT NOT NULL,
+    searched_at REAL NOT NULL,
+    price_cents INTEGER,
+    currency TEXT,
+    airline TEXT,
+    result TEXT
+);
+CREATE TABLE IF NOT EXISTS fares (
+    search_id INTEGER NOT NULL REFERENCES searches (id),
+    provider TEXT NOT NULL,
+    route TEXT NOT NULL,
+    travel_date TEXT NOT NULL,
+    return_date TEXT NOT NULL,
+    searched_at REAL NOT NULL,
+    airline TEXT NOT NULL,
+    departure_at TEXT,
+    arrival_at TEXT,
+    duration_minutes INTEGER,
+    price_cents INTEGER,
+    currency TEXT,
+    cabin TEXT,
+    emissions_kg INTEGER,
+    emissions_percent INTEGER
+);
+CREATE INDEX IF NOT EXISTS searches_route_date_time
+    ON searches (route, travel_date, searched_at);
+CREATE INDEX IF NOT EXISTS fares_route_date_time_airline
+    ON fares (route, travel_date, searched_at, airline);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class FarePoint:
+    """
+    Represents the cheapest fare of a route found in one time bucket.
+
+    Attributes:
+        bucket_start (datetime): Start of the time bucket, in UTC.
+        travel_date (str): The departure date of the cheapest fare.
+        price_cents (int): The cheapest price in the currency's minor unit.
+        currency (str | None): ISO currency code of the price.
+        provider (str): The provider that found the cheapest fare.
+        airline (str): The airline of the cheapest fare.
+    """
+
+    bucket_start: datetime
+    travel_date: str
+    price_cents: int
+    currency: str | None
+    provider: str
+    airline: str
+
+
+@dataclass(frozen=True, slots=True)
+class PriceDrop:
+    """
+    Represents a search whose cheapest fare dropped below the previous search's.
+
+    Attributes:
+        travel_date (str): The departure date searched.
+        provider (str): The provider both searches ran on.
+        searched_at (datetime): When the cheaper fare was found, in UTC.
+        previous_searched_at (datetime): When the previous search ran, in UTC.
+        previous_price_cents (int): The cheapest price of the previous search.
+        price_cents (int): The cheapest price of this search.
+        currency (str | None): ISO currency code of both prices.
+        airline (str): The airline of the cheaper fare.
+    """
+
+    travel_date: str
+    provider: str
+    searched_at: datetime
+    previous_searched_at: datetime
+    previous_price_cents: int
+    price_cents: int
+    currency: str | None
+    airline: str
+
+    @property
+    def drop_percent(self) -> float:
+        """
+        The price drop relative to the previous price, in percent.
+        """
+
+        return (
+            100
+            * (self.previous_price_cents - self.price_cents)
+            / (self.previous_price_cents)
+        )
+
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+class FareStore:
+    """
+    An append-only SQLite history of provider searches and the fares they found.
+
+    Searches are buffered and inserted in one transaction once `batch_size` fares are
+    pending, on `flush()` and on `close()`. Use it as a context manager, or call
+    `close()` explicitly.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = FARE_STORE_PATH,
+        batch_size: int = FARE_STORE_BATCH_SIZE,
+    ) -> None:
+        """
+        Open (or create) the fare history database.
+
+        Args:
+            path (str | Path, optional): SQLite file path, or `:memory:`.
+            batch_size (int, optional): Fares buffered before a bulk insert.
+        """
+
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.batch_size = batch_size
+        self._pending: list[tuple[tuple, list[tuple]]] = []
+        self._pending_fares = 0
+        self._connection = sqlite3.connect(str(path))
+        self._connection.executescript(SCHEMA)
+        # WAL keeps the file consistent on a crash; commits need not wait for fsync
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+
+    def __enter__(self) -> "FareStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_search(
+        self,
+        provider: str,
+        query: FlightQuery,
+        records: Iterable[FlightRecord],
+        result: str | None = None,
+        searched_at: float | None = None,
+    ) -> int:
+        """
+        Buffer one search and its fares, inserting the buffer once it is full.
+
+        Args:
+            provider (str): The provider name.
+            query (FlightQuery): The searched query; its route labels every fare.
+            records (Iterable[FlightRecord]): The normalized flights of the search.
+            result (str, optional): The validated JSON result of the search.
+            searched_at (float, optional): Unix time of the search. Defaults to now.
+
+        Returns:
+            int: The number of fares buffered.
+        """
+
+        query = normalize_flight_query(query)
+        route = f"{query.departure}-{query.destination}"
+        return_date = query.return_date or ""
+        searched_at = time.time() if searched_at is None else searched_at
+        records = list(records)
+        cheapest = min(
+            (record for record in records if record.price_cents is not None),
+            key=attrgetter("price_cents"),
+            default=None,
+        )
+
+        search = (
+            provider,
+            route,
+            query.date,
+            return_date,
+            searched_at,
+            cheapest.price_cents if cheapest else None,
+            cheapest.currency if cheapest else None,
+            cheapest.airline if cheapest else None,
+            result,
+        )
+        fares = [
+            (
+                provider,
+                route,
+                query.date,
+                return_date,
+                searched_at,
+                record.airline,
+                _isoformat(record.departure_at),
+                _isoformat(record.arrival_at),
+                record.duration_minutes,
+                record.price_cents,
+                record.currency,
+                record.cabin,
+                record.emissions_kg,
+                record.emissions_percent,
+            )
+            for record in records
+        ]
+
+        self._pending.append((search, fares))
+        self._pending_fares += len(fares)
+        if self._pending_fares >= self.batch_size:
+            self.flush()
+        return len(fares)
+
+    def add_result(
+        self, provider_result: ProviderRunResult, searched_at: float | None = None
+    ) -> int:
+        """
+        Buffer the flights of a provider run that searched the provider itself.
+
+        Only successful runs, whose result validated, are recorded. Runs without
+        flight records and results served from the result cache or shared from a
+        concurrent run are skipped: their fares were already recorded by the run that
+        searched. A run that cannot be recorded is logged and skipped, so recording
+        never fails the search it follows.
+
+        Args:
+            provider_result (ProviderRunResult): A provider run with its query.
+            searched_at (float, optional): Unix time of the search. Defaults to now.
+
+        Returns:
+            int: The number of fares buffered.
+        """
+
+        if (
+            not provider_result.is_successful
+            or provider_result.is_cached
+            or provider_result.is_coalesced
+        ):
+            return 0
+
+        try:
+            records = normalize_run_result(provider_result)
+            if not records:
+                return 0
+
+            return self.add_search(
+                provider_result.provider,
+                provider_result.query,
+                records,
+                provider_result.result,
+                searched_at,
+            )
+        except Exception:
+            logger.exception(
+                "Recording the %s fares of %s failed",
+                provider_result.provider,
+                provider_result.query,
+            )
+            return 0
+
+    def flush(self) -> None:
+        """
+        Insert every buffered search and its fares in a single transaction.
+
+        Returns:
+            None
+        """
+
+        if not self._pending:
+            return
+
+        with self._connection:
+            fares = []
+            for search, search_fares in self._pending:
+                cursor = self._connection.execute(
+                    "INSERT INTO searches (provider, route, travel_date, return_date, "
+                    "searched_at, price_cents, currency, airline, result) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    search,
+                )
+                fares.extend((cursor.lastrowid, *fare) for fare in search_fares)
+            self._connection.executemany(
+                f"INSERT INTO fares VALUES ({', '.join('?' * 15)})", fares
+            )
+
+        self._pending.clear()
+        self._pending_fares = 0
+
+    def cheapest_fares(
+        self,
+        route: str,
+        travel_date: str | None = None,
+        return_date: str | None = None,
+        since: float | None = None,
+        bucket_seconds: float = 86400,
+        provider: str | None = None,
+        airline: str | None = None,
+    ) -> list[FarePoint]:
+        """
+        Return the cheapest fare of a route found in each time bucket.
+
+        Args:
+            route (str): The route, e.g. `SFO-JFK`.
+            travel_date (str, optional): Only fares departing on this date. Defaults
+                to every travel date of the route.
+            return_date (str, optional): Only round trips returning on this date.
+                Defaults to one-way fares.
+            since (float, optional): Only searches from this Unix time on.
+            bucket_seconds (float, optional): Width of the time buckets. Defaults to
+                a day.
+            provider (str, optional): Only fares found on this provider.
+            airline (str, optional): Only fares of this airline.
+
+        Returns:
+            list[FarePoint]: One point per bucket and currency, oldest first.
+        """
+
+        conditions, parameters = self._filters(
+            route, travel_date, return_date, since, provider, airline
+        )
+        # Without an airline filter, the cheapest fare of each search is enough
+        table = "fares" if airline else "searches"
+        # SQLite takes the bare columns of a MIN() aggregate from the minimum row
+        rows = self._connection.execute(
+            f"""
+            SELECT CAST(searched_at / ? AS INTEGER) * ? AS bucket, travel_date,
+                MIN(price_cents), currency, provider, airline
+            FROM {table}
+            WHERE {conditions}
+            GROUP BY bucket, currency
+            ORDER BY bucket, currency
+            """,
+            (bucket_seconds, bucket_seconds, *parameters),
+        ).fetchall()
+
+        return [
+            FarePoint(_utc(bucket), travel_date, price_cents, currency, provider, line)
+            for bucket, travel_date, price_cents, currency, provider, line in rows
+        ]
+
+    def price_drops(
+        self,
+        route: str,
+        travel_date: str | None = None,
+        return_date: str | None = None,
+        since: float | None = None,
+        min_drop_percent: float = 0,
+        provider: str | None = None,
+    ) -> list[PriceDrop]:
+        """
+        Return the searches whose cheapest fare dropped since the previous search.
+
+        Searches are compared with the previous search of the same travel date,
+        provider and currency.
+
+        Args:
+            route (str): The route, e.g. `SFO-JFK`.
+            travel_date (str, optional): Only this departure date. Defaults to every
+                travel date of the route.
+            return_date (str, optional): Only round trips returning on this date.
+                Defaults to one-way fares.
+            since (float, optional): Only drops found from this Unix time on; older
+                searches still serve as the previous search.
+            min_drop_percent (float, optional): Smallest drop reported, in percent.
+                Defaults to any drop.
+            provider (str, optional): Only searches of this provider.
+
+        Returns:
+            list[PriceDrop]: The drops, oldest first.
+        """
+
+        conditions, parameters = self._filters(
+            route, travel_date, return_date, None, provider, None
+        )
+        rows = self._connection.execute(
+            f"""
+            WITH changes AS (
+                SELECT travel_date, provider, searched_at, price_cents, currency,
+                    airline,
+                    LAG(searched_at) OVER previous AS previous_searched_at,
+                    LAG(price_cents) OVER previous AS previous_price_cents
+                FROM searches
+                WHERE {conditions}
+                WINDOW previous AS (
+                    PARTITION BY travel_date, provider, currency ORDER BY searched_at
+                )
+            )
+            SELECT travel_date, provider, searched_at, previous_searched_at,
+                previous_price_cents, price_cents, currency, airline
+            FROM changes
+            WHERE price_cents * 100 <= previous_price_cents * (100 - ?)
+                AND price_cents < previous_price_cents
+                AND searched_at >= ?
+            ORDER BY searched_at
+            """,
+            (*parameters, min_drop_percent, since or 0),
+        ).fetchall()
+
+        return [
+            PriceDrop(
+                travel_date,
+                provider,
+                _utc(searched_at),
+                _utc(previous_searched_at),
+                previous_price_cents,
+                price_cents,
+                currency,
+                airline,
+            )
+            for (
+                travel_date,
+                provider,
+                searched_at,
+                previous_searched_at,
+                previous_price_cents,
+                price_cents,
+                currency,
+                airline,
+            ) in rows
+        ]
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the number of stored searches and fares.
+
+        Returns:
+            dict[str, int]: `searches` and `fares`.
+        """
+
+        (searches,) = self._connection.execute(
+            "SELECT COUNT(*) FROM searches"
+        ).fetchone()
+        (fares,) = self._connection.execute("SELECT COUNT(*) FROM fares").fetchone()
+        return {"searches": searches, "fares": fares}
+
+    def close(self) -> None:
+        """
+        Insert the buffered searches and close the database connection.
+
+        Returns:
+            None
+        """
+
+        self.flush()
+        self._connection.close()
+
+    @staticmethod
+    def _filters(
+        route: str,
+        travel_date: str | None,
+        return_date: str | None,
+        since: float | None,
+        provider: str | None,
+        airline: str | None,
+    ) -> tuple[str, list]:
+        conditions = ["route = ?", "return_date = ?", "price_cents IS NOT NULL"]
+        parameters: list = [route.strip().upper(), return_date or ""]
+
+        for condition, value in (
+            ("travel_date = ?", travel_date),
+            ("searched_at >= ?", since),
+            ("provider = ?", provider),
+            ("airline = ?", airline),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+
+        return " AND ".join(conditions), parameters
+
+
+def record_results(
+    provider_results: Iterable[ProviderRunResult], path: str | Path = FARE_STORE_PATH
+) -> int:
+    """
+    Record the flights of finished provider runs in the fare history.
+
+    Failures to open or write the fare history are logged rather than raised, so the
+    results of a search are still reported when they cannot be recorded.
+
+    Args:
+        provider_results (Iterable[ProviderRunResult]): The provider runs.
+        path (str | Path, optional): The SQLite file. Defaults to FARE_STORE_PATH.
+
+    Returns:
+        int: The number of fares recorded.
+    """
+
+    try:
+        with FareStore(path) as store:
+            return sum(store.add_result(result) for result in provider_results)
+    except Exception:
+        logger.exception("Recording fares in %s failed", path)
+        return 0
+
+
+def fare_store_sink(store: FareStore) -> Callable[[ProviderRunResult], None]:
+    """
+    Create a batch result sink that records the flights of each successful run.
+
+    Args:
+        store (FareStore): The open fare store.
+
+    Returns:
+        Callable[[ProviderRunResult], None]: A sink for `run_batch`.
+    """
+
+    def store_result(provider_result: ProviderRunResult) -> None:
+        store.add_result(provider_result)
+
+    return store_result
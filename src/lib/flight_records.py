@@ -0,0 +1,384 @@
+"""
+flight_records.py
+
+This module normalizes provider outputs into one typed flight record. Google Flights and
+Kayak report prices, durations, times and emissions as display strings ("$1,308",
+"5 hr 39 min", "7:10 AM +1", "+59% emissions"); they are parsed once here with
+precompiled regexes into integers and datetimes, so records can be sorted, filtered and
+aggregated without re-parsing. Prices are read with their currency's separators and
+kept in its ISO minor unit. Values that cannot be parsed are left as None.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from src.lib.providers import get_provider
+from src.typings import GoogleControllerOutput, KayakControllerOutput, ProviderRunResult
+
+logger = logging.getLogger(__name__)
+
+TIME_PATTERN = re.compile(
+    r"(?P<hour>\d{1,2}):(?P<minute>\d{2})\s*(?P<meridiem>[ap]\.?m\.?)?"
+    r"(?:\s*(?P<day_offset>[+-]\d+))?",
+    re.IGNORECASE,
+)
+DURATION_HOURS_PATTERN = re.compile(r"(\d+)\s*h", re.IGNORECASE)
+DURATION_MINUTES_PATTERN = re.compile(r"(\d+)\s*m", re.IGNORECASE)
+PRICE_PATTERN = re.compile(
+    r"(?P<prefix>[^\d\s.,]*)\s*"
+    r"(?P<amount>\d+(?:(?:[.,']|[\s\u202f](?=\d{3}(?!\d)))\d+)*)"
+    r"\s*(?P<suffix>[^\d\s.,]*)"
+)
+AMOUNT_SEPARATOR_PATTERN = re.compile(r"[^\d]")
+CURRENCY_CODE_PATTERN = re.compile(r"[A-Z]{3}")
+EMISSIONS_PATTERN = re.compile(r"(\d[\d,]*)\s*kg", re.IGNORECASE)
+EMISSIONS_PERCENT_PATTERN = re.compile(r"([+-]?\d+)\s*%")
+
+CURRENCY_SYMBOLS = {"$": "USD", "US$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
+
+# ISO 4217 minor unit exponents that differ from the usual 2
+CURRENCY_EXPONENTS = {
+    "BHD": 3,
+    "CLP": 0,
+    "ISK": 0,
+    "JOD": 3,
+    "JPY": 0,
+    "KRW": 0,
+    "KWD": 3,
+    "OMR": 3,
+    "TND": 3,
+    "VND": 0,
+}
+DEFAULT_CURRENCY_EXPONENT = 2
+
+
+@dataclass(frozen=True, slots=True)
+class FlightRecord:
+    """
+    Represents one flight offer normalized across providers.
+
+    Attributes:
+        provider (str): The provider name, e.g. `google_flights` or `kayak`.
+        airline (str): The airline name.
+        route (str): The route label, e.g. `SFO-JFK`.
+        departure_at (datetime | None): Local departure time at the origin.
+        arrival_at (datetime | None): Local arrival time at the destination, with the
+            day rollover ("+1") applied.
+        duration_minutes (int | None): Flight duration in minutes.
+        price_cents (int | None): Price in the currency's minor unit.
+        currency (str | None): ISO currency code derived from the price symbol.
+        cabin (str | None): The fare cabin, when the provider reports it.
+        emissions_kg (int | None): Estimated kg CO2e, when the provider reports it.
+        emissions_percent (int | None): Emissions relative to the route average.
+    """
+
+    provider: str
+    airline: str
+    route: str
+    departure_at: datetime | None
+    arrival_at: datetime | None
+    duration_minutes: int | None
+    price_cents: int | None
+    currency: str | None
+    cabin: str | None = None
+    emissions_kg: int | None = None
+    emissions_percent: int | None = None
+
+
+def parse_time(text: str, day: date) -> datetime | None:
+    """
+    Parse a displayed time such as `7:10 AM +1` or `7:10 am+1` on a given day.
+
+    Args:
+        text (str): The displayed time, 12-hour or 24-hour, with an optional day offset.
+        day (date): The day the offset is relative to (the departure date).
+
+    Returns:
+        datetime | None: The local datetime, or None when the text is not a time.
+    """
+
+    match = TIME_PATTERN.search(text)
+    if not match:
+        return None
+
+    hour = int(match["hour"])
+    meridiem = match["meridiem"]
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem[0] in "pP" else 0)
+    if hour > 23:
+        return None
+
+    moment = datetime(day.year, day.month, day.day, hour, int(match["minute"]))
+    if match["day_offset"]:
+        moment += timedelta(days=int(match["day_offset"]))
+    return moment
+
+
+def parse_duration_minutes(text: str) -> int | None:
+    """
+    Parse a displayed duration such as `5 hr 39 min` or `5h 39m` into minutes.
+
+    Args:
+        text (str): The displayed duration.
+
+    Returns:
+        int | None: The duration in minutes, or None when nothing was recognized.
+    """
+
+    hours = DURATION_HOURS_PATTERN.search(text)
+    minutes = DURATION_MINUTES_PATTERN.search(text)
+    if not (hours or minutes):
+        return None
+
+    return (int(hours[1]) * 60 if hours else 0) + (int(minutes[1]) if minutes else 0)
+
+
+def parse_currency(symbol: str) -> str | None:
+    """
+    Map a displayed currency symbol or ISO code, e.g. `€` or `EUR`, to its ISO code.
+
+    Args:
+        symbol (str): The text next to the amount.
+
+    Returns:
+        str | None: The ISO currency code, or None when the symbol is unknown.
+    """
+
+    if CURRENCY_CODE_PATTERN.fullmatch(symbol):
+        return symbol
+    return CURRENCY_SYMBOLS.get(symbol)
+
+
+def parse_amount(amount: str, exponent: int) -> int:
+    """
+    Parse a displayed amount into minor units, whatever its separators.
+
+    The last `.` or `,` is the decimal separator when both appear (`1,308.50`,
+    `1.308,50`). A lone `.` or `,` is a thousands separator when it repeats or is
+    followed by exactly three digits (`€1.308`, `$1,308`) in a currency whose minor
+    unit is not three digits, and the decimal separator otherwise (`€12,50`). Spaces
+    and apostrophes only ever separate thousands.
+
+    Args:
+        amount (str): The digits and separators matched by `PRICE_PATTERN`.
+        exponent (int): The currency's minor unit exponent, e.g. 2 for USD, 0 for JPY.
+
+    Returns:
+        int: The amount in minor units, rounded to the currency's precision.
+    """
+
+    marks = [mark for mark in AMOUNT_SEPARATOR_PATTERN.findall(amount) if mark in ".,"]
+    whole, fraction = amount, ""
+    if marks:
+        decimal_mark = marks[-1]
+        fraction_digits = len(amount) - amount.rindex(decimal_mark) - 1
+        is_thousands = len(set(marks)) == 1 and (
+            len(marks) > 1 or (fraction_digits == 3 and exponent != 3)
+        )
+        if not is_thousands:
+            whole, _, fraction = amount.rpartition(decimal_mark)
+
+    whole = AMOUNT_SEPARATOR_PATTERN.sub("", whole)
+    value = Decimal(f"{whole}.{fraction or 0}").scaleb(exponent)
+    return int(value.to_integral_value(ROUND_HALF_EVEN))
+
+
+def parse_price(text: str) -> tuple[int | None, str | None]:
+    """
+    Parse a displayed price such as `$1,308`, `€1.308` or `1 308,50 €` into minor
+    units and a currency code.
+
+    Args:
+        text (str): The displayed price.
+
+    Returns:
+        tuple[int | None, str | None]: The price in the currency's minor unit (cents,
+            or yen for JPY) and the currency code (None when the symbol is unknown),
+            or `(None, None)` when there is no amount.
+    """
+
+    match = PRICE_PATTERN.search(text)
+    if not match:
+        return None, None
+
+    currency = parse_currency(match["prefix"]) or parse_currency(match["suffix"])
+    exponent = CURRENCY_EXPONENTS.get(currency, DEFAULT_CURRENCY_EXPONENT)
+    return parse_amount(match["amount"], exponent), currency
+
+
+def format_price(price_cents: float, currency: str | None) -> str:
+    """
+    Format a price in minor units with its currency's decimals, e.g. `407.00` for USD
+    and `45000` for JPY.
+
+    Args:
+        price_cents (float): The price in the currency's minor unit.
+        currency (str | None): The ISO currency code, None for the usual 2 decimals.
+
+    Returns:
+        str: The price in major units.
+    """
+
+    exponent = CURRENCY_EXPONENTS.get(currency, DEFAULT_CURRENCY_EXPONENT)
+    return f"{price_cents / 10**exponent:.{exponent}f}"
+
+
+def fare_sort_key(record: FlightRecord) -> tuple:
+    """
+    Sort key ordering records by price, then duration, with unknown values last.
+
+    Args:
+        record (FlightRecord): The record to order.
+
+    Returns:
+        tuple: A key comparable between any two records.
+    """
+
+    return (
+        record.price_cents is None,
+        record.price_cents or 0,
+        record.duration_minutes is None,
+        record.duration_minutes or 0,
+    )
+
+
+def parse_emissions_kg(text: str) -> int | None:
+    """
+    Parse displayed emissions such as `583 kg CO2e`.
+
+    Args:
+        text (str): The displayed emissions.
+
+    Returns:
+        int | None: The emissions in kg CO2e, or None when missing.
+    """
+
+    match = EMISSIONS_PATTERN.search(text)
+    return int(match[1].replace(",", "")) if match else None
+
+
+def parse_emissions_percent(text: str) -> int | None:
+    """
+    Parse a displayed emissions comparison such as `+59% emissions` or `Avg emissions`.
+
+    Args:
+        text (str): The displayed comparison.
+
+    Returns:
+        int | None: The percentage relative to the route average, or None when missing.
+    """
+
+    match = EMISSIONS_PERCENT_PATTERN.search(text)
+    if match:
+        return int(match[1])
+    return 0 if text.lower().startswith("avg") else None
+
+
+def normalize_google_flights(
+    output: GoogleControllerOutput, departure_date: date
+) -> Iterator[FlightRecord]:
+    """
+    Normalize a Google Flights output into flight records.
+
+    Args:
+        output (GoogleControllerOutput): The validated provider output.
+        departure_date (date): The searched departure date.
+
+    Yields:
+        FlightRecord: One record per listed flight.
+    """
+
+    for airline in output.airlines:
+        for flight in airline.flights:
+            price_cents, currency = parse_price(flight.price)
+            yield FlightRecord(
+                provider="google_flights",
+                airline=airline.name,
+                route=flight.route,
+                departure_at=parse_time(flight.departure, departure_date),
+                arrival_at=parse_time(flight.arrival, departure_date),
+                duration_minutes=parse_duration_minutes(flight.duration),
+                price_cents=price_cents,
+                currency=currency,
+                emissions_kg=parse_emissions_kg(flight.emissions),
+                emissions_percent=parse_emissions_percent(flight.emissions_percent),
+            )
+
+
+def normalize_kayak_flights(
+    output: KayakControllerOutput, departure_date: date
+) -> Iterator[FlightRecord]:
+    """
+    Normalize a Kayak output into flight records.
+
+    Args:
+        output (KayakControllerOutput): The validated provider output.
+        departure_date (date): The searched departure date.
+
+    Yields:
+        FlightRecord: One record per listed flight.
+    """
+
+    for airline in output.airlines:
+        for flight in airline.flights:
+            price_cents, currency = parse_price(flight.price)
+            yield FlightRecord(
+                provider="kayak",
+                airline=airline.name,
+                route=flight.route,
+                departure_at=parse_time(flight.departure, departure_date),
+                arrival_at=parse_time(flight.arrival, departure_date),
+                duration_minutes=parse_duration_minutes(flight.duration),
+                price_cents=price_cents,
+                currency=currency,
+                cabin=flight.cabin or None,
+            )
+
+
+def normalize_run_result(run_result: ProviderRunResult) -> list[FlightRecord]:
+    """
+    Normalize the JSON result of a successful provider run into flight records.
+
+    Args:
+        run_result (ProviderRunResult): A provider run with its query and result.
+
+    Returns:
+        list[FlightRecord]: The flight records, empty when the run has no result, the
+            result does not validate against the provider's output model or the
+            output holds no flights or the query date is not an ISO date.
+    """
+
+    if not (run_result.result and run_result.query):
+        return []
+
+    provider = get_provider(run_result.provider)
+    if provider.normalize is None:
+        return []
+
+    try:
+        output = provider.output_model.model_validate_json(run_result.result)
+    except ValidationError as e:
+        logger.warning(
+            "%s result does not validate against %s: %s",
+            run_result.provider,
+            provider.output_model.__name__,
+            e,
+        )
+        return []
+
+    try:
+        departure_date = date.fromisoformat(run_result.query.date)
+    except ValueError:
+        logger.warning(
+            "%s query date %r is not YYYY-MM-DD, its flights are not normalized",
+            run_result.provider,
+            run_result.query.date,
+        )
+        return []
+    return list(provider.normalize(output, departure_date))
@@ -4,6 +4,8 @@ google_flights.py
 This module provides functionality to build a Google Flights URL for searching flights.
 """
 
+from src.constants import GOOGLE_FLIGHTS_BASE_URL
+
 
 def google_flights_build_url(
     departure: str, destination: str, date: str, return_date: str = None
@@ -21,7 +23,7 @@ def google_flights_build_url(
         str: The constructed Google Flights URL.
     """
 
-    base_url = "https://www.google.com/travel/flights"
+    base_url = GOOGLE_FLIGHTS_BASE_URL
     query = f"?q=flights from {departure} to {destination} on {date}"
     if return_date:
         query += f" returning on {return_date}"
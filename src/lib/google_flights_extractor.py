@@ -0,0 +1,113 @@
+"""
+google_flights_extractor.py
+
+This module extracts Google Flights results straight from the loaded results page
+into a `GoogleControllerOutput`, without any LLM call.
+"""
+
+from typing import TYPE_CHECKING
+
+from pydantic import ValidationError
+
+from src.constants import DOM_EXTRACTION_TIMEOUT_SECONDS
+from src.lib.extraction import ExtractionError, extract_rows
+from src.typings import GoogleControllerOutput
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+GOOGLE_FLIGHTS_ITEM_SELECTOR = "ul.Rk10dc > li"
+
+GOOGLE_FLIGHTS_RESULT_COUNT_SELECTOR = 'div[role="status"]'
+
+GOOGLE_FLIGHTS_REQUIRED_FIELDS = ("airline", "departure", "arrival", "price")
+
+GOOGLE_FLIGHTS_FIELD_SELECTORS = {
+    "airline": "div.sSHqwe.tPgKwe.ogfYpf span",
+    "departure": "span.mv1WYe div:first-of-type",
+    "arrival": "span.mv1WYe div:last-of-type",
+    "day_offset": "span.bOzv6",
+    "duration": "div.gvkrdb",
+    "price": "div.YMlIz.FpEdX span",
+    "emissions": "div.AdWm1c.lc3qH",
+    "emissions_percent": "div.N6PNV",
+}
+
+
+def google_flights_rows_to_output(
+    rows: list[dict[str, str]], route: str
+) -> GoogleControllerOutput:
+    """
+    Group extracted Google Flights rows by airline and validate them.
+
+    Every row must be complete: a result missing a required field fails the whole
+    page, so the agent reads it rather than a partial list being returned.
+
+    Args:
+        rows (list[dict[str, str]]): Field values read from each result item.
+        route (str): The route label, e.g. `SFO-JFK`.
+
+    Returns:
+        GoogleControllerOutput: The validated flights grouped by airline.
+    """
+
+    airlines: dict[str, list[dict[str, str]]] = {}
+
+    for index, row in enumerate(rows, start=1):
+        missing = [field for field in GOOGLE_FLIGHTS_REQUIRED_FIELDS if not row[field]]
+        if missing:
+            raise ExtractionError(
+                f"Google Flights result {index} of {len(rows)} is missing "
+                f"{', '.join(missing)}"
+            )
+        arrival = row["arrival"]
+        if row["day_offset"]:
+            arrival = f"{arrival} {row['day_offset']}"
+        airlines.setdefault(row["airline"], []).append(
+            {
+                "departure": row["departure"],
+                "arrival": arrival,
+                "duration": row["duration"],
+                "route": route,
+                "price": row["price"],
+                "emissions": row["emissions"],
+                "emissions_percent": row["emissions_percent"],
+            }
+        )
+
+    if not airlines:
+        raise ExtractionError("No Google Flights results could be extracted")
+
+    try:
+        return GoogleControllerOutput.model_validate(
+            {
+                "airlines": [
+                    {"name": name, "flights": flights}
+                    for name, flights in airlines.items()
+                ]
+            }
+        )
+    except ValidationError as e:
+        raise ExtractionError(f"Extracted Google Flights rows are invalid: {e}") from e
+
+
+async def extract_google_flights(
+    page: "Page", route: str, timeout: float = DOM_EXTRACTION_TIMEOUT_SECONDS
+) -> GoogleControllerOutput:
+    """
+    Extract every flight listed on a loaded Google Flights results page.
+
+    Args:
+        page (Page): The Playwright page showing the results.
+        route (str): The route label, e.g. `SFO-JFK`.
+        timeout (float, optional): Seconds to wait for the results to render;
+            0 reads the results currently on the page.
+
+    Returns:
+        GoogleControllerOutput: The validated flights grouped by airline.
+    """
+
+    rows = await extract_rows(
+        page, GOOGLE_FLIGHTS_ITEM_SELECTOR, GOOGLE_FLIGHTS_FIELD_SELECTORS, timeout
+    )
+    return google_flights_rows_to_output(rows, route)
@@ -0,0 +1,209 @@
+"""
+history.py
+
+This module bounds the memory an agent run keeps in its history. browser-use stores a
+base64 screenshot and the DOM snapshots of the interacted elements with every step, so
+a long batch of searches holds megabytes per run and renders a GIF from them at the
+end. Under the `summary` policy each step's screenshot and DOM snapshots are spilled
+to disk as soon as the step is recorded (the oldest spilled runs are pruned, like the
+rotating agent log), under `none` they are dropped, and `full` keeps the browser-use
+default. The thoughts and action results of finished runs are written to a rotating
+log file instead of stdout.
+"""
+
+import base64
+import json
+import logging
+import shutil
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.constants import (
+    AGENT_LOG_BACKUP_COUNT,
+    AGENT_LOG_MAX_BYTES,
+    AGENT_LOG_PATH,
+    HISTORY_DIR,
+    HISTORY_MAX_RUNS,
+    HISTORY_POLICY,
+)
+from src.lib.utils import format_agent_brain, format_extracted_content
+from src.settings import HISTORY_POLICIES
+
+if TYPE_CHECKING:
+    from browser_use import Agent
+    from browser_use.agent.views import AgentHistoryList
+
+logger = logging.getLogger(__name__)
+
+
+def prune_history_runs(history_dir: str | Path, max_runs: int) -> None:
+    """
+    Delete the oldest spilled run directories beyond the newest `max_runs`.
+
+    Args:
+        history_dir (str | Path): Directory holding one subdirectory per agent run.
+        max_runs (int): Run directories kept; 0 keeps them all.
+
+    Returns:
+        None
+    """
+
+    if max_runs <= 0:
+        return
+
+    try:
+        run_dirs = [path for path in Path(history_dir).iterdir() if path.is_dir()]
+    except FileNotFoundError:
+        return
+
+    run_dirs.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    for run_dir in run_dirs[max_runs:]:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+class HistoryRetention:
+    """
+    Applies a history policy to every step one agent records.
+
+    The wrapper is set as an instance attribute of the agent, so other agents are
+    unaffected; `finish` removes it again.
+    """
+
+    def __init__(
+        self,
+        agent: "Agent",
+        policy: str = HISTORY_POLICY,
+        history_dir: str | Path = HISTORY_DIR,
+        max_runs: int = HISTORY_MAX_RUNS,
+    ) -> None:
+        """
+        Apply a history policy to an agent that has not started running yet.
+
+        Args:
+            agent (Agent): The agent whose history is bounded.
+            policy (str, optional): `none`, `summary` or `full`.
+            history_dir (str | Path, optional): Directory the `summary` policy spills
+                to, in one subdirectory per agent run.
+            max_runs (int, optional): Run subdirectories kept in `history_dir` once
+                this run spills; 0 keeps them all.
+        """
+
+        if policy not in HISTORY_POLICIES:
+            raise ValueError(f"Unknown history policy: {policy}")
+
+        self.agent = agent
+        self.policy = policy
+        self.history_dir = Path(history_dir)
+        self.run_dir = self.history_dir / agent.agent_id
+        self.max_runs = max_runs
+        self.spilled_bytes = 0
+
+        if policy != "full":
+            agent.generate_gif = False
+            agent._make_history_item = self._retain(agent._make_history_item)
+
+    def _retain(self, make_history_item):
+        def make_retained_history_item(*args, **kwargs):
+            make_history_item(*args, **kwargs)
+            self._release(len(self.agent.history.history))
+
+        return make_retained_history_item
+
+    def _release(self, step: int) -> None:
+        state = self.agent.history.history[-1].state
+
+        if self.policy == "summary":
+            self._spill(step, state.screenshot, state.interacted_element)
+
+        state.screenshot = None
+        state.interacted_element = [None] * len(state.interacted_element)
+
+    def _spill(self, step: int, screenshot: str | None, elements: list) -> None:
+        if not self.run_dir.exists():
+            self.run_dir.mkdir(parents=True)
+            prune_history_runs(self.history_dir, self.max_runs)
+
+        if screenshot:
+            data = base64.b64decode(screenshot)
+            (self.run_dir / f"step_{step:03d}.png").write_bytes(data)
+            self.spilled_bytes += len(data)
+
+        if any(elements):
+            data = json.dumps(
+                [element.to_dict() if element else None for element in elements]
+            )
+            (self.run_dir / f"step_{step:03d}_dom.json").write_text(
+                data, encoding="utf-8"
+            )
+            self.spilled_bytes += len(data)
+
+    def finish(self) -> None:
+        """
+        Remove the wrapper from the agent.
+
+        Returns:
+            None
+        """
+
+        vars(self.agent).pop("_make_history_item", None)
+
+
+def configure_agent_log(
+    path: str | Path = AGENT_LOG_PATH,
+    max_bytes: int = AGENT_LOG_MAX_BYTES,
+    backup_count: int = AGENT_LOG_BACKUP_COUNT,
+) -> None:
+    """
+    Send the agent history log to a rotating file instead of the root handlers.
+
+    Calling it again has no effect, so every entry point can configure it lazily.
+
+    Args:
+        path (str | Path, optional): The log file; empty disables the agent log.
+        max_bytes (int, optional): Size at which the file is rotated.
+        backup_count (int, optional): Rotated files kept.
+
+    Returns:
+        None
+    """
+
+    if logger.handlers:
+        return
+
+    logger.propagate = False
+    if not path:
+        logger.addHandler(logging.NullHandler())
+        return
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def log_agent_history(agent: "Agent", history: "AgentHistoryList") -> None:
+    """
+    Write the action results and model thoughts of a finished run to the agent log.
+
+    Args:
+        agent (Agent): The agent that ran.
+        history (AgentHistoryList): The history of its run.
+
+    Returns:
+        None
+    """
+
+    configure_agent_log()
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    logger.info(
+        "agent %s\n=== Action Results ===\n%s\n=== Model Thoughts ===\n%s",
+        agent.agent_id,
+        format_extracted_content(history.action_results()),
+        format_agent_brain(history.model_thoughts()),
+    )
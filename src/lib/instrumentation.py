@@ -0,0 +1,476 @@
+"""
+instrumentation.py
+
+This module records where the time and tokens of an agent run go. An instrumented agent
+times every step and splits it into page state extraction (`browser_context.get_state`),
+the LLM call (`agent.get_next_action`) and the browser actions (`controller.multi_act`),
+and counts the prompt and completion tokens of every LLM call made during the step
+through a context-scoped LangChain callback. Step and run metrics are appended to a
+JSONL file and aggregated for a Prometheus text endpoint.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextvars import ContextVar
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TextIO
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.constants import METRICS_JSONL_PATH
+from src.typings import RunMetrics, StepMetrics
+
+if TYPE_CHECKING:
+    from browser_use import Agent
+    from langchain_core.outputs import LLMResult
+
+logger = logging.getLogger(__name__)
+
+STEP_SECONDS_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, float("inf"))
+
+PHASES = ("dom", "llm", "action")
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """
+    Sums the token usage reported by every LLM call it is attached to.
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.llm_calls = 0
+        self.cached_llm_calls = 0
+
+    def on_llm_end(self, response: "LLMResult", **kwargs: Any) -> None:
+        """
+        Add the usage of a finished LLM call, from the message usage metadata or,
+        for providers that do not report it, from the `token_usage` LLM output.
+        Calls answered by the LLM response cache are counted without usage.
+        """
+
+        self.llm_calls += 1
+        if any(
+            getattr(generation, "message", None) is not None
+            and generation.message.response_metadata.get("cache_hit")
+            for generations in response.generations
+            for generation in generations
+        ):
+            self.cached_llm_calls += 1
+            return
+
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    self.prompt_tokens += usage.get("input_tokens", 0)
+                    self.completion_tokens += usage.get("output_tokens", 0)
+                    return
+
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        self.prompt_tokens += token_usage.get("prompt_tokens", 0)
+        self.completion_tokens += token_usage.get("completion_tokens", 0)
+
+
+# Attaches the handler to every LLM call made in the current task, like
+# LangChain's own `get_openai_callback`, without touching shared LLM instances.
+token_usage_handler: ContextVar[TokenUsageHandler | None] = ContextVar(
+    "token_usage_handler", default=None
+)
+
+
+@cache
+def register_token_usage_hook() -> None:
+    """
+    Register `token_usage_handler` with LangChain, once, before the first run is
+    instrumented; LangChain's tracing module is only imported then.
+
+    Returns:
+        None
+    """
+
+    from langchain_core.tracers.context import register_configure_hook
+
+    register_configure_hook(token_usage_handler, inheritable=True)
+
+
+class MetricsRecorder:
+    """
+    Appends step and run metrics to a JSONL file and aggregates them for Prometheus.
+    """
+
+    def __init__(self, jsonl_path: str | Path | None = METRICS_JSONL_PATH) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            jsonl_path (str | Path | None, optional): JSONL file the metrics are
+                appended to. Defaults to `METRICS_JSONL_PATH`; empty disables it.
+        """
+
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self._file: TextIO | None = None
+        self.phase_seconds: dict[tuple[str, str], float] = {}
+        self.steps: dict[tuple[str, str], int] = {}
+        self.tokens: dict[tuple[str, str], int] = {}
+        self.runs: dict[tuple[str, str], int] = {}
+        self.run_steps: dict[str, int] = {}
+        self.coalesced_runs: dict[str, int] = {}
+        self.llm_calls: dict[tuple[str, str], int] = {}
+        self.step_seconds_buckets: dict[str, list[int]] = {}
+        self.step_seconds_sum: dict[str, float] = {}
+
+    def record_step(self, step: StepMetrics) -> None:
+        """
+        Record a finished step.
+
+        Args:
+            step (StepMetrics): The step metrics.
+
+        Returns:
+            None
+        """
+
+        provider = step.provider
+        for phase in PHASES:
+            key = (provider, phase)
+            self.phase_seconds[key] = self.phase_seconds.get(key, 0.0) + getattr(
+                step, f"{phase}_seconds"
+            )
+        status = "error" if step.error else "ok"
+        self.steps[(provider, status)] = self.steps.get((provider, status), 0) + 1
+        for kind in ("prompt", "completion"):
+            key = (provider, kind)
+            self.tokens[key] = self.tokens.get(key, 0) + getattr(step, f"{kind}_tokens")
+        for source, count in (
+            ("live", step.llm_calls - step.cached_llm_calls),
+            ("cache", step.cached_llm_calls),
+        ):
+            key = (provider, source)
+            self.llm_calls[key] = self.llm_calls.get(key, 0) + count
+
+        buckets = self.step_seconds_buckets.setdefault(
+            provider, [0] * len(STEP_SECONDS_BUCKETS)
+        )
+        for index, bound in enumerate(STEP_SECONDS_BUCKETS):
+            if step.total_seconds <= bound:
+                buckets[index] += 1
+        self.step_seconds_sum[provider] = (
+            self.step_seconds_sum.get(provider, 0.0) + step.total_seconds
+        )
+
+        self._write("step", step.model_dump())
+
+    def record_run(self, run: RunMetrics) -> None:
+        """
+        Record a finished run.
+
+        Args:
+            run (RunMetrics): The run totals.
+
+        Returns:
+            None
+        """
+
+        status = "done" if run.is_done else "incomplete"
+        self.runs[(run.provider, status)] = self.runs.get((run.provider, status), 0) + 1
+        self.run_steps[run.provider] = self.run_steps.get(run.provider, 0) + run.steps
+
+        self._write("run", run.model_dump())
+
+    def record_coalesced(self, provider: str) -> None:
+        """
+        Record a provider run answered by a concurrent run of the same query.
+
+        Args:
+            provider (str): The provider name.
+
+        Returns:
+            None
+        """
+
+        self.coalesced_runs[provider] = self.coalesced_runs.get(provider, 0) + 1
+
+        self._write("coalesced", {"provider": provider})
+
+    def render_prometheus(self) -> str:
+        """
+        Render the aggregated metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics page.
+        """
+
+        lines = [
+            "# HELP flight_search_step_phase_seconds_total Agent step time by phase.",
+            "# TYPE flight_search_step_phase_seconds_total counter",
+            *(
+                f'flight_search_step_phase_seconds_total{{provider="{provider}",'
+                f'phase="{phase}"}} {seconds:.6f}'
+                for (provider, phase), seconds in sorted(self.phase_seconds.items())
+            ),
+            "# HELP flight_search_steps_total Agent steps by outcome.",
+            "# TYPE flight_search_steps_total counter",
+            *(
+                f'flight_search_steps_total{{provider="{provider}",status="{status}"}} '
+                f"{count}"
+                for (provider, status), count in sorted(self.steps.items())
+            ),
+            "# HELP flight_search_llm_tokens_total LLM tokens by type.",
+            "# TYPE flight_search_llm_tokens_total counter",
+            *(
+                f'flight_search_llm_tokens_total{{provider="{provider}",type="{kind}"}} '
+                f"{count}"
+                for (provider, kind), count in sorted(self.tokens.items())
+            ),
+            "# HELP flight_search_llm_calls_total LLM calls by source.",
+            "# TYPE flight_search_llm_calls_total counter",
+            *(
+                f'flight_search_llm_calls_total{{provider="{provider}",'
+                f'source="{source}"}} {count}'
+                for (provider, source), count in sorted(self.llm_calls.items())
+            ),
+            "# HELP flight_search_runs_total Agent runs by outcome.",
+            "# TYPE flight_search_runs_total counter",
+            *(
+                f'flight_search_runs_total{{provider="{provider}",status="{status}"}} '
+                f"{count}"
+                for (provider, status), count in sorted(self.runs.items())
+            ),
+            "# HELP flight_search_run_steps_total Steps executed by finished runs.",
+            "# TYPE flight_search_run_steps_total counter",
+            *(
+                f'flight_search_run_steps_total{{provider="{provider}"}} {count}'
+                for provider, count in sorted(self.run_steps.items())
+            ),
+            "# HELP flight_search_coalesced_runs_total Runs sharing an in-flight run.",
+            "# TYPE flight_search_coalesced_runs_total counter",
+            *(
+                f'flight_search_coalesced_runs_total{{provider="{provider}"}} {count}'
+                for provider, count in sorted(self.coalesced_runs.items())
+            ),
+            "# HELP flight_search_step_seconds Agent step wall time.",
+            "# TYPE flight_search_step_seconds histogram",
+        ]
+
+        for provider, buckets in sorted(self.step_seconds_buckets.items()):
+            for bound, count in zip(STEP_SECONDS_BUCKETS, buckets):
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(
+                    f'flight_search_step_seconds_bucket{{provider="{provider}",'
+                    f'le="{le}"}} {count}'
+                )
+            lines.append(
+                f'flight_search_step_seconds_sum{{provider="{provider}"}} '
+                f"{self.step_seconds_sum[provider]:.6f}"
+            )
+            lines.append(
+                f'flight_search_step_seconds_count{{provider="{provider}"}} '
+                f"{buckets[-1]}"
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        """
+        Close the JSONL file, if it was opened.
+
+        Returns:
+            None
+        """
+
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _write(self, kind: str, metrics: dict[str, Any]) -> None:
+        if not self.jsonl_path:
+            return
+        if self._file is None:
+            self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.jsonl_path.open("a", encoding="utf-8")
+        self._file.write(json.dumps({"kind": kind, **metrics}) + "\n")
+        self._file.flush()
+
+
+metrics_recorder = MetricsRecorder()
+
+
+class AgentInstrumentation:
+    """
+    Wraps the step, page state, LLM and action methods of one agent to measure them.
+
+    The wrappers are set as instance attributes of the agent, its controller and its
+    browser context, so other agents are unaffected; `finish` removes them again.
+    """
+
+    def __init__(
+        self,
+        agent: "Agent",
+        provider: str,
+        recorder: MetricsRecorder = metrics_recorder,
+    ) -> None:
+        """
+        Instrument an agent that has not started running yet.
+
+        Args:
+            agent (Agent): The agent to instrument.
+            provider (str): The provider name used to label the metrics.
+            recorder (MetricsRecorder, optional): Receives the step and run metrics.
+        """
+
+        register_token_usage_hook()
+
+        self.agent = agent
+        self.recorder = recorder
+        self.run = RunMetrics(provider=provider)
+        self._current_step: StepMetrics | None = None
+        self._patched: list[tuple[object, str]] = []
+
+        self._patch(agent, "step", self._measure_step(agent.step))
+        self._patch(
+            agent, "get_next_action", self._measure("llm", agent.get_next_action)
+        )
+        self._patch(
+            agent.controller,
+            "multi_act",
+            self._measure("action", agent.controller.multi_act),
+        )
+        self._patch(
+            agent.browser_context,
+            "get_state",
+            self._measure("dom", agent.browser_context.get_state),
+        )
+
+    def finish(self) -> RunMetrics:
+        """
+        Remove the wrappers and record the run totals.
+
+        Returns:
+            RunMetrics: The totals of the instrumented steps.
+        """
+
+        for target, name in self._patched:
+            vars(target).pop(name, None)
+        self._patched.clear()
+
+        self.run.is_done = self.agent.history.is_done()
+        self.recorder.record_run(self.run)
+        return self.run
+
+    def _patch(self, target: object, name: str, wrapper: Callable) -> None:
+        setattr(target, name, wrapper)
+        self._patched.append((target, name))
+
+    def _measure(
+        self, phase: str, method: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        async def measured(*args: Any, **kwargs: Any) -> Any:
+            started_at = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                if self._current_step:
+                    elapsed = time.perf_counter() - started_at
+                    attribute = f"{phase}_seconds"
+                    setattr(
+                        self._current_step,
+                        attribute,
+                        getattr(self._current_step, attribute) + elapsed,
+                    )
+
+        return measured
+
+    def _measure_step(
+        self, step: Callable[..., Awaitable[None]]
+    ) -> Callable[..., Awaitable[None]]:
+        async def measured_step(*args: Any, **kwargs: Any) -> None:
+            step_metrics = StepMetrics(
+                provider=self.run.provider,
+                step=self.run.steps + 1,
+                started_at=time.time(),
+            )
+            handler = TokenUsageHandler()
+            self._current_step = step_metrics
+            handler_token = token_usage_handler.set(handler)
+            started_at = time.perf_counter()
+            try:
+                await step(*args, **kwargs)
+            finally:
+                token_usage_handler.reset(handler_token)
+                self._current_step = None
+                step_metrics.total_seconds = time.perf_counter() - started_at
+                step_metrics.prompt_tokens = handler.prompt_tokens
+                step_metrics.completion_tokens = handler.completion_tokens
+                step_metrics.llm_calls = handler.llm_calls
+                step_metrics.cached_llm_calls = handler.cached_llm_calls
+                # The agent keeps the results of the last step, including step errors
+                last_result = self.agent._last_result or []
+                step_metrics.error = next(
+                    (result.error for result in last_result if result.error), None
+                )
+                step_metrics.is_done = any(result.is_done for result in last_result)
+                self._add_step(step_metrics)
+
+        return measured_step
+
+    def _add_step(self, step: StepMetrics) -> None:
+        self.run.steps += 1
+        self.run.failed_steps += 1 if step.error else 0
+        self.run.dom_seconds += step.dom_seconds
+        self.run.llm_seconds += step.llm_seconds
+        self.run.action_seconds += step.action_seconds
+        self.run.prompt_tokens += step.prompt_tokens
+        self.run.completion_tokens += step.completion_tokens
+        self.run.llm_calls += step.llm_calls
+        self.run.cached_llm_calls += step.cached_llm_calls
+        self.recorder.record_step(step)
+
+
+async def serve_metrics(
+    host: str, port: int, recorder: MetricsRecorder = metrics_recorder
+) -> asyncio.Server:
+    """
+    Start a minimal HTTP server exposing the recorder on `GET /metrics`.
+
+    Args:
+        host (str): The interface to bind.
+        port (int): The port to bind.
+        recorder (MetricsRecorder, optional): The recorder to expose.
+
+    Returns:
+        asyncio.Server: The started server; close it to stop serving.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1] == "/metrics":
+                status, body = "200 OK", recorder.render_prometheus()
+            else:
+                status, body = "404 Not Found", "Not Found\n"
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except ConnectionError as e:
+            logger.debug("Metrics request failed: %s", e)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info("Serving metrics on http://%s:%s/metrics", host, port)
+    return server
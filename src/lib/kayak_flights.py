@@ -6,9 +6,15 @@ This module provides functionality to build a Kayak Flights URL for searching fl
 
 from urllib.parse import urlencode
 
+from src.constants import KAYAK_FLIGHTS_BASE_URL
+
 
 def kayak_flights_build_url(
-    departure: str, destination: str, date: str, return_date: str = None
+    departure: str,
+    destination: str,
+    date: str,
+    return_date: str = None,
+    flexible_days: int = 0,
 ) -> str:
     """
     Build a URL for searching flights on Kayak.
@@ -18,14 +24,19 @@ def kayak_flights_build_url(
         destination (str): The destination airport code.
         date (str): The departure date in YYYY-MM-DD format.
         return_date (str, optional): The return date in YYYY-MM-DD format. Defaults to None.
+        flexible_days (int, optional): Search up to this many days (1 to 3) around the
+            departure date, which Kayak shows as a price grid by date. Defaults to 0.
 
     Returns:
         str: The constructed URL for the flight search.
     """
 
-    base_url = "https://www.kayak.com/flights"
+    base_url = KAYAK_FLIGHTS_BASE_URL
     query_params = {"sort": "bestflight_a"}
 
+    if flexible_days:
+        date = f"{date}-flexible-{flexible_days}day{'s' if flexible_days > 1 else ''}"
+
     if return_date:
         url = f"{base_url}/{departure}-{destination}/{date}/{return_date}"
     else:
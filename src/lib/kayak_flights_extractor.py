@@ -0,0 +1,109 @@
+"""
+kayak_flights_extractor.py
+
+This module extracts Kayak results straight from the loaded results page
+into a `KayakControllerOutput`, without any LLM call.
+"""
+
+import re
+from typing import TYPE_CHECKING
+
+from pydantic import ValidationError
+
+from src.constants import DOM_EXTRACTION_TIMEOUT_SECONDS
+from src.lib.extraction import ExtractionError, extract_rows
+from src.typings import KayakControllerOutput
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+KAYAK_FLIGHTS_ITEM_SELECTOR = "div.nrc6"
+
+KAYAK_FLIGHTS_RESULT_COUNT_SELECTOR = "div.c8GSD-results-count"
+
+KAYAK_FLIGHTS_FIELD_SELECTORS = {
+    "airline": "div.c_cgF.c_cgF-mod-variant-default",
+    "times": "div.vmXl.vmXl-mod-variant-large",
+    "duration": "div.xdW8 div.vmXl.vmXl-mod-variant-default",
+    "price": "div.f8F1-price-text",
+    "cabin": "div.DOum-name",
+}
+
+TIMES_SEPARATOR = re.compile(r"\s*[–—-]\s*")
+
+
+def kayak_flights_rows_to_output(
+    rows: list[dict[str, str]], route: str
+) -> KayakControllerOutput:
+    """
+    Group extracted Kayak rows by airline and validate them.
+
+    Every row must be complete: a result missing its airline, price or times fails
+    the whole page, so the agent reads it rather than a partial list being returned.
+
+    Args:
+        rows (list[dict[str, str]]): Field values read from each result item.
+        route (str): The route label, e.g. `SFO-JFK`.
+
+    Returns:
+        KayakControllerOutput: The validated flights grouped by airline.
+    """
+
+    airlines: dict[str, list[dict[str, str]]] = {}
+
+    for index, row in enumerate(rows, start=1):
+        times = TIMES_SEPARATOR.split(row["times"], maxsplit=1)
+        missing = [field for field in ("airline", "price") if not row[field]]
+        if len(times) != 2:
+            missing.append("times")
+        if missing:
+            raise ExtractionError(
+                f"Kayak result {index} of {len(rows)} is missing {', '.join(missing)}"
+            )
+        airlines.setdefault(row["airline"], []).append(
+            {
+                "departure": times[0],
+                "arrival": times[1],
+                "duration": row["duration"],
+                "route": route,
+                "price": row["price"],
+                "cabin": row["cabin"],
+            }
+        )
+
+    if not airlines:
+        raise ExtractionError("No Kayak results could be extracted")
+
+    try:
+        return KayakControllerOutput.model_validate(
+            {
+                "airlines": [
+                    {"name": name, "flights": flights}
+                    for name, flights in airlines.items()
+                ]
+            }
+        )
+    except ValidationError as e:
+        raise ExtractionError(f"Extracted Kayak rows are invalid: {e}") from e
+
+
+async def extract_kayak_flights(
+    page: "Page", route: str, timeout: float = DOM_EXTRACTION_TIMEOUT_SECONDS
+) -> KayakControllerOutput:
+    """
+    Extract every flight listed on a loaded Kayak results page.
+
+    Args:
+        page (Page): The Playwright page showing the results.
+        route (str): The route label, e.g. `SFO-JFK`.
+        timeout (float, optional): Seconds to wait for the results to render;
+            0 reads the results currently on the page.
+
+    Returns:
+        KayakControllerOutput: The validated flights grouped by airline.
+    """
+
+    rows = await extract_rows(
+        page, KAYAK_FLIGHTS_ITEM_SELECTOR, KAYAK_FLIGHTS_FIELD_SELECTORS, timeout
+    )
+    return kayak_flights_rows_to_output(rows, route)
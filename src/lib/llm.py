@@ -0,0 +1,242 @@
+"""
+llm.py
+
+This module builds the chat models that drive the agents from configuration. Models
+are named `backend:model` (e.g. `openai:gpt-4o` or `ollama:qwen2.5:32b`), built by the
+backend registered under that name, and cached, so every agent using the same model
+shares one client. OpenAI models also share one keep-alive HTTP connection pool, so
+consecutive searches reuse warm connections instead of paying a new TLS handshake.
+The agent LLM and the LLM used for page content extraction steps are configured
+separately, so cheap extraction can run on a small local model, and the responses of
+either step type can be served from the LLM response cache (`src/lib/llm_cache.py`).
+LangChain, OpenAI and httpx are imported when the first model is built, not with this
+module.
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+
+from src.constants import (
+    AGENT_LLM,
+    LLM_CACHE_STEP_TYPES,
+    LLM_KEEPALIVE_SECONDS,
+    LLM_MAX_CONNECTIONS,
+    OLLAMA_BASE_URL,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_MODEL_NAME,
+    OLLAMA_TEMPERATURE,
+    OPENAPI_MODEL_NAME,
+    PAGE_EXTRACTION_LLM,
+)
+
+if TYPE_CHECKING:
+    import httpx
+    from langchain_core.language_models import BaseChatModel
+
+    from src.lib.llm_cache import LlmResponseCache
+
+LlmBuilder = Callable[[str], "BaseChatModel"]
+
+
+def build_http_limits() -> "httpx.Limits":
+    """
+    Build the connection pool limits shared by the LLM clients.
+
+    Returns:
+        httpx.Limits: The maximum and keep-alive connections and keep-alive expiry.
+    """
+
+    import httpx
+
+    return httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+    )
+
+
+@lru_cache(maxsize=1)
+def openai_http_clients() -> tuple["httpx.Client", "httpx.AsyncClient"]:
+    """
+    Create the HTTP clients shared by every OpenAI chat model.
+
+    Returns:
+        tuple[httpx.Client, httpx.AsyncClient]: The sync and async pooled clients.
+    """
+
+    from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+    limits = build_http_limits()
+    return DefaultHttpxClient(limits=limits), DefaultAsyncHttpxClient(limits=limits)
+
+
+def build_openai_llm(model: str) -> "BaseChatModel":
+    """
+    Build an OpenAI chat model on the shared HTTP clients.
+
+    Args:
+        model (str): The OpenAI model name.
+
+    Returns:
+        BaseChatModel: The chat model.
+    """
+
+    from langchain_openai import ChatOpenAI
+
+    http_client, http_async_client = openai_http_clients()
+    return ChatOpenAI(
+        model=model, http_client=http_client, http_async_client=http_async_client
+    )
+
+
+def build_ollama_llm(model: str) -> "BaseChatModel":
+    """
+    Build a local Ollama chat model that stays loaded between searches.
+
+    langchain-ollama is an optional dependency: `poetry install --extras ollama`.
+
+    Args:
+        model (str): The Ollama model name.
+
+    Returns:
+        BaseChatModel: The chat model.
+    """
+
+    from langchain_ollama import ChatOllama
+
+    return ChatOllama(
+        model=model,
+        base_url=OLLAMA_BASE_URL,
+        temperature=OLLAMA_TEMPERATURE,
+        keep_alive=OLLAMA_KEEP_ALIVE,
+        client_kwargs={"limits": build_http_limits()},
+    )
+
+
+LLM_BACKENDS: dict[str, LlmBuilder] = {
+    "openai": build_openai_llm,
+    "ollama": build_ollama_llm,
+}
+
+DEFAULT_MODEL_NAMES: dict[str, str] = {
+    "openai": OPENAPI_MODEL_NAME,
+    "ollama": OLLAMA_MODEL_NAME,
+}
+
+
+def register_llm_backend(
+    name: str, builder: LlmBuilder, default_model: str | None = None
+) -> None:
+    """
+    Register a backend that builds any LangChain chat model.
+
+    Args:
+        name (str): The backend name used in `backend:model` specs.
+        builder (LlmBuilder): Builds a chat model from a model name.
+        default_model (str, optional): Model used when a spec names only the backend.
+
+    Returns:
+        None
+    """
+
+    LLM_BACKENDS[name] = builder
+    if default_model:
+        DEFAULT_MODEL_NAMES[name] = default_model
+    get_llm.cache_clear()
+    get_step_llm.cache_clear()
+
+
+def parse_llm_spec(spec: str) -> tuple[str, str]:
+    """
+    Split a `backend:model` spec; the model may itself contain colons.
+
+    Args:
+        spec (str): E.g. `openai:gpt-4o`, `ollama:phi4:latest` or `ollama`.
+
+    Returns:
+        tuple[str, str]: The backend name and the model name.
+    """
+
+    backend, _, model = spec.strip().partition(":")
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {backend}")
+
+    model = model or DEFAULT_MODEL_NAMES.get(backend)
+    if not model:
+        raise ValueError(f"No model given for LLM backend: {backend}")
+    return backend, model
+
+
+@lru_cache(maxsize=None)
+def get_llm(spec: str) -> "BaseChatModel":
+    """
+    Return the shared chat model for a spec, building it on first use.
+
+    Args:
+        spec (str): A `backend:model` spec.
+
+    Returns:
+        BaseChatModel: The chat model.
+    """
+
+    backend, model = parse_llm_spec(spec)
+    return LLM_BACKENDS[backend](model)
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> "LlmResponseCache":
+    """
+    Open the LLM response cache shared by every cached chat model.
+
+    Returns:
+        LlmResponseCache: The cache at `LLM_CACHE_PATH`.
+    """
+
+    from src.lib.llm_cache import LlmResponseCache
+
+    return LlmResponseCache()
+
+
+@lru_cache(maxsize=None)
+def get_step_llm(spec: str, step_type: str) -> "BaseChatModel":
+    """
+    Return the shared chat model for a spec as used by one step type, reading and
+    writing the LLM response cache when the step type is in `LLM_CACHE_STEP_TYPES`.
+
+    Args:
+        spec (str): A `backend:model` spec.
+        step_type (str): `agent` for planning calls, `extraction` for page content.
+
+    Returns:
+        BaseChatModel: The chat model, sharing the client of `get_llm(spec)`.
+    """
+
+    llm = get_llm(spec)
+    if step_type not in LLM_CACHE_STEP_TYPES:
+        return llm
+    return llm.model_copy(update={"cache": get_llm_cache()})
+
+
+def get_agent_llm() -> "BaseChatModel":
+    """
+    Return the chat model that drives the agents.
+
+    Returns:
+        BaseChatModel: The `AGENT_LLM` model.
+    """
+
+    return get_step_llm(AGENT_LLM, "agent")
+
+
+def get_page_extraction_llm() -> "BaseChatModel | None":
+    """
+    Return the chat model for page content extraction steps, when one is configured.
+
+    Returns:
+        BaseChatModel | None: The `PAGE_EXTRACTION_LLM` model, or None to let agents
+            extract with their own LLM.
+    """
+
+    if not PAGE_EXTRACTION_LLM:
+        return None
+    return get_step_llm(PAGE_EXTRACTION_LLM, "extraction")
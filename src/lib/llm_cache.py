@@ -0,0 +1,248 @@
+"""
+llm_cache.py
+
+This module provides a content-addressed, on-disk SQLite cache of LLM responses, used
+as the LangChain cache of the agents' chat models. Requests are keyed on a hash of the
+model configuration and the normalized prompt: images are left out and the current
+date and time that browser-use writes into every page state message is stripped, so
+the same page state in the same task maps to the same key across searches. Replaying
+a search therefore answers its LLM calls from disk. Entries are evicted least-recently
+used once the cache is full. Cached responses carry no token usage, so step metrics
+only count live LLM tokens.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Sequence
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from src.constants import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_PATH
+
+VOLATILE_PATTERN = re.compile(r"Current date and time: \d{4}-\d{2}-\d{2} \d{2}:\d{2}")
+
+
+def normalize_prompt(prompt: Any) -> Any:
+    """
+    Drop the parts of a serialized prompt that change between identical requests.
+
+    Args:
+        prompt (Any): The JSON-decoded messages LangChain serialized for the cache.
+
+    Returns:
+        Any: The prompt without image parts and volatile timestamps.
+    """
+
+    if isinstance(prompt, dict):
+        if prompt.get("type") == "image_url":
+            return None
+        return {key: normalize_prompt(value) for key, value in prompt.items()}
+    if isinstance(prompt, list):
+        parts = (normalize_prompt(part) for part in prompt)
+        return [part for part in parts if part is not None]
+    if isinstance(prompt, str):
+        return VOLATILE_PATTERN.sub("", prompt)
+    return prompt
+
+
+def build_llm_cache_key(prompt: str, llm_string: str) -> str:
+    """
+    Build the content address of an LLM request.
+
+    Args:
+        prompt (str): The messages as serialized by LangChain.
+        llm_string (str): The model, its parameters and any bound tools.
+
+    Returns:
+        str: A hex SHA-256 digest identifying the request.
+    """
+
+    try:
+        normalized = json.dumps(
+            normalize_prompt(json.loads(prompt)),
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+    except json.JSONDecodeError:
+        normalized = VOLATILE_PATTERN.sub("", prompt)
+    payload = f"{llm_string}\n{normalized}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCache(BaseCache):
+    """
+    An LRU bounded SQLite cache of LLM responses, with hit/miss counters.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = LLM_CACHE_PATH,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str | Path, optional): SQLite file path, or `:memory:`.
+            max_entries (int, optional): Entries kept before LRU eviction.
+        """
+
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed_at
+                ON responses (accessed_at);
+            """
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """
+        Return the cached generations of a request and mark them as recently used.
+
+        Args:
+            prompt (str): The messages as serialized by LangChain.
+            llm_string (str): The model, its parameters and any bound tools.
+
+        Returns:
+            RETURN_VAL_TYPE | None: The generations, without token usage, or None.
+        """
+
+        key = build_llm_cache_key(prompt, llm_string)
+        row = self._connection.execute(
+            "SELECT value FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        with self._connection:
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        self.hits += 1
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            generations: list[Generation] = loads(row[0])
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            if message is not None:
+                message.usage_metadata = None
+                message.response_metadata = {
+                    **message.response_metadata,
+                    "cache_hit": True,
+                }
+        return generations
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        """
+        Store the generations of a request and evict the least recently used entries
+        beyond the bound.
+
+        Args:
+            prompt (str): The messages as serialized by LangChain.
+            llm_string (str): The model, its parameters and any bound tools.
+            return_val (Sequence[Generation]): The generations of the live call.
+
+        Returns:
+            None
+        """
+
+        now = time.time()
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (build_llm_cache_key(prompt, llm_string), dumps(return_val), now, now),
+            )
+            self._connection.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        """
+        Delete every entry.
+
+        Returns:
+            None
+        """
+
+        with self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """
+        Same as `lookup`; local SQLite reads are fast enough to run on the event loop
+        instead of LangChain's default thread pool executor.
+        """
+
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        """
+        Same as `update`, on the event loop.
+        """
+
+        self.update(prompt, llm_string, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        """
+        Same as `clear`, on the event loop.
+        """
+
+        self.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the hit and miss counters and the current number of entries.
+
+        Returns:
+            dict[str, int]: `hits`, `misses` and `entries`.
+        """
+
+        (entries,) = self._connection.execute(
+            "SELECT COUNT(*) FROM responses"
+        ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+
+        Returns:
+            None
+        """
+
+        self._connection.close()
@@ -0,0 +1,391 @@
+"""
+orchestrator.py
+
+This module runs the flight search agents of several providers concurrently.
+Each provider run is bounded by its own timeout and isolated from the others,
+so a crash or timeout in one provider still returns the results of the rest.
+Failed or stalled agent runs are resumed under the provider's retry policy, and runs
+against a domain whose circuit breaker is open are refused without opening a browser.
+Everything specific to a provider comes from its entry in the provider registry
+(`src/lib/providers.py`), so one code path serves every flight site.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, ValidationError
+
+from src.constants import (
+    COMPLETION_DETECTION_ENABLED,
+    DOM_EXTRACTION_ENABLED,
+    PROVIDER_TIMEOUT_SECONDS,
+    RESOURCE_BLOCKING_ENABLED,
+    SEARCH_COALESCING_ENABLED,
+)
+from src.lib.browser_pool import BrowserPool, standalone_browser_context
+from src.lib.completion import FlightsByAirline, add_new_flights
+from src.lib.extraction import ExtractionError, extract_from_url
+from src.lib.instrumentation import AgentInstrumentation, metrics_recorder
+from src.lib.politeness import politeness_scheduler
+from src.lib.providers import AgentFactory, get_agent_factories, get_provider
+from src.lib.resilience import circuit_breakers, retry
+from src.lib.result_cache import (
+    ResultCache,
+    build_query_key,
+    normalize_flight_query,
+)
+from src.lib.single_flight import provider_searches
+from src.lib.streaming import BatchCallback, stream_agent
+from src.typings import FlightQuery, ProviderRunResult, RunMetrics
+
+if TYPE_CHECKING:
+    from browser_use import Agent
+
+logger = logging.getLogger(__name__)
+
+
+def validate_provider_result(provider: str, result: str | None) -> str | None:
+    """
+    Validate a raw agent result against the provider's output model.
+
+    Args:
+        provider (str): The provider name.
+        result (str | None): The agent's final result.
+
+    Returns:
+        str | None: The result re-serialized from the validated model, or None when
+            there is no result or it does not validate.
+    """
+
+    if result is None:
+        return None
+
+    output_model = get_provider(provider).output_model
+    try:
+        return output_model.model_validate_json(result).model_dump_json()
+    except ValidationError:
+        return None
+
+
+async def run_provider(
+    provider: str,
+    agent_factory: AgentFactory,
+    departure: str,
+    destination: str,
+    date: str,
+    return_date: str = None,
+    timeout: float = PROVIDER_TIMEOUT_SECONDS,
+    browser_pool: BrowserPool | None = None,
+    result_cache: ResultCache | None = None,
+    on_batch: BatchCallback | None = None,
+) -> ProviderRunResult:
+    """
+    Build and run a single provider agent within a timeout.
+
+    A fresh cached result short-circuits the run entirely. Otherwise the run waits
+    for its turn on the provider domain (that wait counts towards the timeout), tries
+    the provider's DOM extractor and only builds the LLM agent when extraction fails.
+    Agent runs are instrumented per step and their totals attached to the result, and
+    are stopped early once the flights the agent extracts make up the complete result
+    list. Pages load without the requests the provider's resource profile blocks.
+    A result that validates is stored in the cache; one that does not, or no result at
+    all, is returned as an error with `result` left None. Flights are handed to
+    `on_batch` as they are found: all at once from the cache or the DOM extractor, and
+    step by step, without repeats, from an agent run. An `on_batch` that raises is
+    logged and does not affect the run.
+
+    An agent that could not be built is built again, and an agent run that raises or
+    stops without a result (after repeated step failures) is resumed from its last
+    recorded step with the rest of its step budget, under the provider's retry policy;
+    backoff delays count towards the timeout. Every run that does not produce a valid
+    result counts as a failure of the provider domain's circuit breaker, and while the
+    circuit is open runs are refused at once with `is_circuit_open` set.
+
+    The query is normalized (trimmed, upper-cased airport codes) before anything else,
+    so the search URL, the cache key and the result all use the normalized query.
+    Concurrent runs for an identical normalized query are coalesced: the first one
+    searches (with its own timeout and callback) and the others wait for it and
+    receive its result, marked `is_coalesced`, with all of its flights in one batch.
+
+    Args:
+        provider (str): The registered provider name, used to label the result.
+        agent_factory (AgentFactory): Coroutine function that builds the provider agent.
+        departure (str): The departure airport code.
+        destination (str): The destination airport code.
+        date (str): The departure date in YYYY-MM-DD format.
+        return_date (str, optional): The return date in YYYY-MM-DD format. Defaults to None.
+        timeout (float, optional): Seconds allowed for building and running the agent.
+        browser_pool (BrowserPool, optional): Pool to borrow a warm browser context from.
+            Defaults to None, which launches a browser for this run only.
+        result_cache (ResultCache, optional): Cache of validated provider results.
+        on_batch (BatchCallback, optional): Called with the provider name and each
+            batch of newly found flights.
+
+    Returns:
+        ProviderRunResult: The provider result, or the error that stopped it, with timing.
+    """
+
+    def emit_batch(batch: BaseModel) -> None:
+        # A failing consumer must not fail this provider's run or the others'
+        if on_batch:
+            try:
+                on_batch(provider, batch)
+            except Exception:
+                logger.exception("%s batch callback failed for %s", provider, query)
+
+    async def search() -> tuple[str | None, str, RunMetrics | None]:
+        resource_profile = spec.resource_profile if RESOURCE_BLOCKING_ENABLED else None
+        pooled_context = (
+            browser_pool.context(resource_profile)
+            if browser_pool
+            else standalone_browser_context(resource_profile=resource_profile)
+        )
+        async with pooled_context as browser_context:
+            await politeness_scheduler.wait_for_turn(spec.domain)
+
+            extractor = spec.extractor
+            if DOM_EXTRACTION_ENABLED and extractor:
+                try:
+                    output = await extract_from_url(
+                        browser_context, url, extractor, route
+                    )
+                    emit_batch(output)
+                    return output.model_dump_json(), "dom", None
+                except ExtractionError as e:
+                    logger.info("%s DOM extraction fell back to agent: %s", provider, e)
+
+            agent: Agent | None = None
+            instrumentation: AgentInstrumentation | None = None
+            streamed: FlightsByAirline = {}
+
+            async def run_attempt(number: int) -> "Agent":
+                nonlocal agent, attempts, instrumentation
+                attempts = number
+                if number > 1:
+                    await politeness_scheduler.wait_for_turn(spec.domain)
+
+                if agent is None:
+                    agent = await agent_factory(
+                        departure,
+                        destination,
+                        date,
+                        return_date,
+                        browser_context=browser_context,
+                    )
+                    if agent is None:
+                        raise RuntimeError(f"{provider} agent could not be created")
+                    instrumentation = AgentInstrumentation(agent, provider)
+
+                # Resume from the last recorded step with the rest of the step budget
+                agent.consecutive_failures = 0
+                batches = stream_agent(
+                    agent,
+                    route,
+                    spec.max_steps - agent.n_steps + 1,
+                    spec.result_count_selector,
+                    stop_when_complete=COMPLETION_DETECTION_ENABLED,
+                )
+                async with contextlib.aclosing(batches):
+                    async for batch in batches:
+                        # A resumed run extracts the flights of earlier attempts again
+                        if "airlines" in type(batch).model_fields:
+                            batch = add_new_flights(streamed, batch)
+                        if batch is not None:
+                            emit_batch(batch)
+                return agent
+
+            def is_complete(resumed_agent: "Agent") -> bool:
+                return (
+                    resumed_agent.history.is_done()
+                    or resumed_agent.n_steps > spec.max_steps
+                )
+
+            try:
+                await retry(spec.retry_policy, run_attempt, is_complete, provider)
+            finally:
+                run_metrics = instrumentation.finish() if instrumentation else None
+            return agent.history.final_result(), "agent", run_metrics
+
+    # Equivalent queries ("sfo", " SFO") search, cache and coalesce as one
+    query = normalize_flight_query(
+        FlightQuery(
+            departure=departure,
+            destination=destination,
+            date=date,
+            return_date=return_date,
+        )
+    )
+    departure, destination = query.departure, query.destination
+    date, return_date = query.date, query.return_date
+    route = f"{departure}-{destination}"
+    spec = get_provider(provider)
+    url = spec.build_url(departure, destination, date, return_date)
+    query_key = build_query_key(provider, query, url)
+    circuit_breaker = circuit_breakers[spec.domain]
+    attempts = 0
+    started_at = time.perf_counter()
+
+    if result_cache:
+        cached_result = result_cache.get(query_key)
+        if cached_result is not None:
+            if on_batch:
+                emit_batch(spec.output_model.model_validate_json(cached_result))
+            return ProviderRunResult(
+                provider=provider,
+                query=query,
+                result=cached_result,
+                is_cached=True,
+                elapsed_seconds=time.perf_counter() - started_at,
+            )
+
+    async def run_search() -> ProviderRunResult:
+        if not circuit_breaker.allow():
+            return ProviderRunResult(
+                provider=provider,
+                query=query,
+                error=(
+                    f"Circuit open for {spec.domain}, retrying in "
+                    f"{circuit_breaker.retry_after():.0f} seconds"
+                ),
+                is_circuit_open=True,
+                elapsed_seconds=time.perf_counter() - started_at,
+            )
+
+        try:
+            result, extraction_method, run_metrics = await asyncio.wait_for(
+                search(), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            circuit_breaker.record_failure()
+            return ProviderRunResult(
+                provider=provider,
+                query=query,
+                error=f"Timed out after {timeout:.0f} seconds",
+                attempts=attempts,
+                elapsed_seconds=time.perf_counter() - started_at,
+            )
+        except Exception as e:
+            circuit_breaker.record_failure()
+            return ProviderRunResult(
+                provider=provider,
+                query=query,
+                error=f"{type(e).__name__}: {e}",
+                attempts=attempts,
+                elapsed_seconds=time.perf_counter() - started_at,
+            )
+
+        validated_result = validate_provider_result(provider, result)
+        if validated_result is None:
+            circuit_breaker.record_failure()
+            if result is None:
+                error = "No result"
+            else:
+                error = f"Result did not validate against {spec.output_model.__name__}"
+            logger.info("%s %s: %s", provider, error, result)
+            return ProviderRunResult(
+                provider=provider,
+                query=query,
+                error=error,
+                extraction_method=extraction_method,
+                attempts=attempts,
+                metrics=run_metrics,
+                elapsed_seconds=time.perf_counter() - started_at,
+            )
+
+        circuit_breaker.record_success()
+        if result_cache:
+            result_cache.set(query_key, provider, validated_result)
+
+        return ProviderRunResult(
+            provider=provider,
+            query=query,
+            result=validated_result,
+            extraction_method=extraction_method,
+            attempts=attempts,
+            metrics=run_metrics,
+            elapsed_seconds=time.perf_counter() - started_at,
+        )
+
+    if not SEARCH_COALESCING_ENABLED:
+        return await run_search()
+
+    provider_result, is_coalesced = await provider_searches.run(query_key, run_search)
+    if not is_coalesced:
+        return provider_result
+
+    metrics_recorder.record_coalesced(provider)
+    if on_batch and provider_result.result:
+        try:
+            output = spec.output_model.model_validate_json(provider_result.result)
+        except ValidationError:
+            pass
+        else:
+            emit_batch(output)
+
+    return provider_result.model_copy(
+        update={
+            "is_coalesced": True,
+            "elapsed_seconds": time.perf_counter() - started_at,
+        }
+    )
+
+
+async def search_flights_concurrently(
+    departure: str,
+    destination: str,
+    date: str,
+    return_date: str = None,
+    providers: dict[str, AgentFactory] | None = None,
+    timeout: float = PROVIDER_TIMEOUT_SECONDS,
+    browser_pool: BrowserPool | None = None,
+    result_cache: ResultCache | None = None,
+    on_batch: BatchCallback | None = None,
+) -> list[ProviderRunResult]:
+    """
+    Run the flight search of every provider concurrently.
+
+    End-to-end latency is bounded by the slowest provider rather than the sum of
+    all of them. Cancelling this coroutine cancels every in-flight provider run.
+
+    Args:
+        departure (str): The departure airport code.
+        destination (str): The destination airport code.
+        date (str): The departure date in YYYY-MM-DD format.
+        return_date (str, optional): The return date in YYYY-MM-DD format. Defaults to None.
+        providers (dict[str, AgentFactory], optional): Agent factories by provider name.
+            Defaults to every registered provider searched by default.
+        timeout (float, optional): Seconds allowed for each provider run.
+        browser_pool (BrowserPool, optional): Pool to borrow warm browser contexts from.
+        result_cache (ResultCache, optional): Cache of validated provider results.
+        on_batch (BatchCallback, optional): Called with the provider name and each
+            batch of newly found flights, as soon as any provider finds them.
+
+    Returns:
+        list[ProviderRunResult]: One result per provider, in the order given.
+    """
+
+    providers = providers or get_agent_factories()
+
+    async with asyncio.TaskGroup() as task_group:
+        tasks = [
+            task_group.create_task(
+                run_provider(
+                    provider,
+                    agent_factory,
+                    departure,
+                    destination,
+                    date,
+                    return_date,
+                    timeout,
+                    browser_pool,
+                    result_cache,
+                    on_batch,
+                )
+            )
+            for provider, agent_factory in providers.items()
+        ]
+
+    return [task.result() for task in tasks]
@@ -0,0 +1,71 @@
+"""
+politeness.py
+
+This module provides a per-domain politeness scheduler that spaces out agent runs
+against the same flight provider, replacing fixed sleeps during agent construction.
+"""
+
+import asyncio
+import time
+
+from src.constants import POLITENESS_MIN_INTERVAL_SECONDS
+
+
+class PolitenessScheduler:
+    """
+    Spaces out requests to the same domain by a configurable minimum interval.
+
+    Turns are reserved in call order, so concurrent callers for one domain are
+    released one interval apart, while different domains never wait on each other.
+    """
+
+    def __init__(
+        self, min_intervals: dict[str, float], default_interval: float = 0.0
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            min_intervals (dict[str, float]): Minimum seconds between runs, by domain.
+            default_interval (float, optional): Interval for unlisted domains. Defaults to 0.
+        """
+
+        self.min_intervals = min_intervals
+        self.default_interval = default_interval
+        self._next_turn_at: dict[str, float] = {}
+
+    def reserve_turn(self, domain: str) -> float:
+        """
+        Reserve the next turn for a domain without waiting for it.
+
+        Args:
+            domain (str): The provider domain, e.g. `www.kayak.com`.
+
+        Returns:
+            float: Seconds the caller must wait before its turn starts.
+        """
+
+        interval = self.min_intervals.get(domain, self.default_interval)
+        now = time.monotonic()
+        turn_at = max(now, self._next_turn_at.get(domain, now))
+        self._next_turn_at[domain] = turn_at + interval
+        return turn_at - now
+
+    async def wait_for_turn(self, domain: str) -> float:
+        """
+        Wait until the caller may start a run against a domain.
+
+        Args:
+            domain (str): The provider domain, e.g. `www.google.com`.
+
+        Returns:
+            float: Seconds actually waited.
+        """
+
+        delay = self.reserve_turn(domain)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+politeness_scheduler = PolitenessScheduler(POLITENESS_MIN_INTERVAL_SECONDS)
@@ -0,0 +1,89 @@
+"""
+prompt_schema.py
+
+This module derives a minimal example of a Pydantic output model for task prompts.
+Instead of embedding pages of sample flights, the prompt shows one compact object per
+nested model, using each field's first example value (or its type name).
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, get_args, get_origin
+
+from pydantic import BaseModel
+
+from src.settings import PROMPT_MODES
+
+
+def build_compact_example(annotation: Any) -> Any:
+    """
+    Build a one-item example value for a field annotation.
+
+    Args:
+        annotation (Any): A Pydantic model class or a field type annotation.
+
+    Returns:
+        Any: A nested dict/list example, or the annotation's type name.
+    """
+
+    if get_origin(annotation) is list:
+        return [build_compact_example(get_args(annotation)[0])]
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {
+            name: (
+                field.examples[0]
+                if field.examples
+                else build_compact_example(field.annotation)
+            )
+            for name, field in annotation.model_fields.items()
+        }
+
+    return getattr(annotation, "__name__", str(annotation))
+
+
+@lru_cache(maxsize=None)
+def render_compact_schema(output_model: type[BaseModel]) -> str:
+    """
+    Render the compact example of an output model as minified JSON.
+
+    Args:
+        output_model (type[BaseModel]): The controller output model.
+
+    Returns:
+        str: The minified example, e.g. `{"airlines":[{"name":"...","flights":[...]}]}`.
+    """
+
+    return json.dumps(
+        build_compact_example(output_model), ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def render_output_example(
+    prompt_mode: str, full_example: dict, output_model: type[BaseModel]
+) -> str:
+    """
+    Render the output format section that ends a task description.
+
+    Args:
+        prompt_mode (str): `full`, `compact` or `structured`.
+        full_example (dict): The predefined example used in `full` mode.
+        output_model (type[BaseModel]): The controller output model.
+
+    Returns:
+        str: The section to append after the output instructions.
+
+    Raises:
+        ValueError: When the prompt mode is unknown.
+    """
+
+    if prompt_mode not in PROMPT_MODES:
+        raise ValueError(f"Unknown prompt mode: {prompt_mode}")
+
+    if prompt_mode == "full":
+        return f":\n\n{json.dumps(full_example, indent=4)}\n"
+
+    if prompt_mode == "structured":
+        return ".\n"
+
+    return f", shaped like:\n{render_compact_schema(output_model)}\n"
@@ -0,0 +1,231 @@
+"""
+providers.py
+
+This module defines the flight search providers the orchestrator fans out to. A
+`Provider` bundles everything specific to one flight site: its URL and task builders,
+controller output model and normalizer, optional DOM extractor, step budget and rate
+limits, retry policy, circuit breaker settings and resource profile. Providers are
+registered by name. The built-in ones live in `src/providers/`, and further provider
+modules are discovered from `PROVIDER_MODULES` and from the `flight_search.providers`
+entry point group, so supporting another site means adding one provider module rather
+than another agent, task and orchestrator code path.
+"""
+
+import importlib
+import logging
+from dataclasses import dataclass
+from datetime import date as Date
+from functools import lru_cache
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable
+
+from pydantic import BaseModel
+
+from src.constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    PROVIDER_MODULES,
+)
+from src.lib.extraction import Extractor
+from src.lib.llm import get_agent_llm, get_page_extraction_llm
+from src.lib.politeness import politeness_scheduler
+from src.lib.resilience import CircuitBreaker, RetryPolicy, circuit_breakers
+from src.lib.resource_blocking import ResourceProfile
+
+if TYPE_CHECKING:
+    from browser_use import Agent
+    from browser_use.browser.context import BrowserContext
+    from langchain_core.language_models import BaseChatModel
+
+logger = logging.getLogger(__name__)
+
+AgentFactory = Callable[..., Awaitable["Agent | None"]]
+TaskBuilder = Callable[[str, str, str], str]
+Normalizer = Callable[[BaseModel, Date], Iterable[Any]]
+
+DEFAULT_MAX_STEPS = 50
+
+BUILTIN_PROVIDER_MODULES = ("src.providers.google_flights", "src.providers.kayak")
+PROVIDER_ENTRY_POINT_GROUP = "flight_search.providers"
+
+
+@dataclass(frozen=True)
+class Provider:
+    """
+    Represents one flight search site.
+
+    Attributes:
+        name (str): The provider name used to label results, e.g. `kayak`.
+        domain (str): The domain searched, which runs are paced against.
+        build_url (Callable[..., str]): Builds the search URL from the departure,
+            destination, date and optional return date.
+        build_task (TaskBuilder): Builds the agent task from the URL, departure and
+            destination.
+        output_model (type[BaseModel]): The controller output model of the agent.
+        normalize (Normalizer | None): Turns a validated output and the departure date
+            into flight records; None when the output holds no flights.
+        extractor (Extractor | None): The DOM extraction fast path, when available.
+        result_count_selector (str | None): CSS selector of the result count.
+        max_steps (int): The step budget of an agent run.
+        concurrency (int): Concurrent agents in batch runs and date sweeps.
+        min_interval_seconds (float): Minimum seconds between runs against `domain`.
+        retry_policy (RetryPolicy): How often a failed or stalled run is attempted.
+        circuit_failure_threshold (int): Consecutive failed runs after which runs
+            against `domain` are refused; 0 never refuses them.
+        circuit_reset_seconds (float): Seconds runs are refused before a trial run.
+        resource_profile (ResourceProfile | None): The requests this site's pages
+            load without; None loads everything.
+        flexible_dates (str | None): The provider reading this site's flexible-dates
+            price grid, used by date sweeps.
+        flexible_days (int): Days that price grid covers on each side of its date.
+        is_searched_by_default (bool): Whether searches fan out to this provider when
+            none are given.
+    """
+
+    name: str
+    domain: str
+    build_url: Callable[..., str]
+    build_task: TaskBuilder
+    output_model: type[BaseModel]
+    normalize: Normalizer | None = None
+    extractor: Extractor | None = None
+    result_count_selector: str | None = None
+    max_steps: int = DEFAULT_MAX_STEPS
+    concurrency: int = 1
+    min_interval_seconds: float = 0.0
+    retry_policy: RetryPolicy = RetryPolicy()
+    circuit_failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD
+    circuit_reset_seconds: float = CIRCUIT_RESET_SECONDS
+    resource_profile: ResourceProfile | None = None
+    flexible_dates: str | None = None
+    flexible_days: int = 0
+    is_searched_by_default: bool = True
+
+    async def build_agent(
+        self,
+        departure: str,
+        destination: str,
+        date: str,
+        return_date: str = None,
+        browser_context: "BrowserContext | None" = None,
+        llm: "BaseChatModel | None" = None,
+        page_extraction_llm: "BaseChatModel | None" = None,
+    ) -> "Agent | None":
+        """
+        Build an agent searching this provider.
+
+        Only the agent is built here; the browser is not launched until the agent
+        runs, and pacing against the domain is left to `src.lib.politeness`.
+        browser-use is imported on the first call, so registering and looking up
+        providers stays cheap.
+
+        Args:
+            departure (str): The departure airport code.
+            destination (str): The destination airport code.
+            date (str): The departure date in YYYY-MM-DD format.
+            return_date (str, optional): The return date in YYYY-MM-DD format.
+            browser_context (BrowserContext, optional): A pooled browser context to run
+                in. Defaults to None, which makes the agent launch its own browser.
+            llm (BaseChatModel, optional): The chat model driving the agent.
+                Defaults to None, which uses the shared `AGENT_LLM` model.
+            page_extraction_llm (BaseChatModel, optional): The chat model for page
+                content extraction steps. Defaults to None, which uses the shared
+                `PAGE_EXTRACTION_LLM` model when configured and the agent's LLM
+                otherwise.
+
+        Returns:
+            Agent | None: The agent, or None if it could not be built.
+        """
+
+        from browser_use import Agent, Controller
+
+        url = self.build_url(departure, destination, date, return_date)
+
+        try:
+            return Agent(
+                task=self.build_task(url, departure, destination),
+                llm=llm or get_agent_llm(),
+                page_extraction_llm=page_extraction_llm or get_page_extraction_llm(),
+                controller=Controller(output_model=self.output_model),
+                browser_context=browser_context,
+            )
+        except Exception:
+            logger.exception("%s agent could not be built", self.name)
+            return None
+
+
+PROVIDERS: dict[str, Provider] = {}
+
+
+def register_provider(provider: Provider) -> Provider:
+    """
+    Register a provider under its name, pace runs against its domain and give the
+    domain a circuit breaker (shared by the providers of one domain).
+
+    Args:
+        provider (Provider): The provider to register.
+
+    Returns:
+        Provider: The registered provider.
+    """
+
+    PROVIDERS[provider.name] = provider
+    politeness_scheduler.min_intervals[provider.domain] = provider.min_interval_seconds
+    circuit_breakers.setdefault(
+        provider.domain,
+        CircuitBreaker(
+            provider.circuit_failure_threshold, provider.circuit_reset_seconds
+        ),
+    )
+    return provider
+
+
+@lru_cache(maxsize=1)
+def load_providers() -> dict[str, Provider]:
+    """
+    Import the built-in provider modules, the modules in `PROVIDER_MODULES` and the
+    `flight_search.providers` entry points, each of which registers its providers.
+
+    Returns:
+        dict[str, Provider]: Every registered provider, by name.
+    """
+
+    for module_name in (*BUILTIN_PROVIDER_MODULES, *PROVIDER_MODULES):
+        importlib.import_module(module_name)
+
+    for entry_point in entry_points(group=PROVIDER_ENTRY_POINT_GROUP):
+        entry_point.load()
+
+    return PROVIDERS
+
+
+def get_provider(name: str) -> Provider:
+    """
+    Return a registered provider.
+
+    Args:
+        name (str): The provider name.
+
+    Returns:
+        Provider: The provider.
+    """
+
+    providers = load_providers()
+    if name not in providers:
+        raise ValueError(f"Unknown provider: {name}")
+    return providers[name]
+
+
+def get_agent_factories() -> dict[str, AgentFactory]:
+    """
+    Return the agent factories of the providers searched by default.
+
+    Returns:
+        dict[str, AgentFactory]: Agent factories by provider name.
+    """
+
+    return {
+        name: provider.build_agent
+        for name, provider in load_providers().items()
+        if provider.is_searched_by_default
+    }
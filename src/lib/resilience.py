@@ -0,0 +1,198 @@
+"""
+resilience.py
+
+This module keeps flaky provider runs from failing or stalling searches. A
+`RetryPolicy` retries a failed or incomplete attempt after an exponential backoff with
+full jitter, so retries of concurrent runs do not hit a site in lockstep. A
+`CircuitBreaker` per provider domain stops scheduling runs against a site after
+repeated failures (a captcha or block page fails every run until it is lifted): runs
+are refused immediately instead of each spending its timeout, and one trial run is let
+through once the cool-down has passed.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+from src.constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Represents how often and how far apart a provider run is attempted.
+
+    Attributes:
+        max_attempts (int): Attempts per run, including the first one.
+        base_delay_seconds (float): Upper bound of the delay before the first retry;
+            it doubles with every further retry.
+        max_delay_seconds (float): Upper bound of any delay.
+    """
+
+    max_attempts: int = 3
+    base_delay_seconds: float = RETRY_BASE_DELAY_SECONDS
+    max_delay_seconds: float = RETRY_MAX_DELAY_SECONDS
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Draw the delay after a failed attempt, uniformly up to the exponential bound.
+
+        Args:
+            attempt (int): The number of the failed attempt, starting at 1.
+
+        Returns:
+            float: Seconds to wait before the next attempt.
+        """
+
+        bound = self.base_delay_seconds * 2 ** (attempt - 1)
+        return random.uniform(0, min(self.max_delay_seconds, bound))
+
+
+async def retry(
+    policy: RetryPolicy,
+    attempt: Callable[[int], Awaitable[T]],
+    is_complete: Callable[[T], bool] | None = None,
+    label: str = "Run",
+) -> T:
+    """
+    Call an attempt until it succeeds or the policy's attempts are used up.
+
+    An attempt fails when it raises, or when it returns a value `is_complete` rejects.
+    The last attempt's exception is raised and its incomplete value is returned as is.
+
+    Args:
+        policy (RetryPolicy): The retry policy.
+        attempt (Callable[[int], Awaitable[T]]): Coroutine function called with the
+            attempt number, starting at 1.
+        is_complete (Callable[[T], bool], optional): Whether a returned value is
+            final. Defaults to None, which accepts every value.
+        label (str, optional): Names the attempts in log messages.
+
+    Returns:
+        T: The value of the first complete attempt, or of the last one.
+    """
+
+    for number in range(1, policy.max_attempts + 1):
+        is_last = number >= policy.max_attempts
+        try:
+            value = await attempt(number)
+        except Exception as e:
+            if is_last:
+                raise
+            logger.info(
+                "%s attempt %d failed: %s: %s", label, number, type(e).__name__, e
+            )
+        else:
+            if is_last or is_complete is None or is_complete(value):
+                return value
+            logger.info("%s attempt %d ended incomplete", label, number)
+
+        await asyncio.sleep(policy.backoff(number))
+
+
+class CircuitBreaker:
+    """
+    Refuses runs against a domain after consecutive failures, until a cool-down passes.
+
+    While open, runs are refused. Once `reset_seconds` have passed, a single trial run
+    is allowed: its success closes the circuit and its failure opens it again. A trial
+    that never reports back is replaced by another one after a further cool-down.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+    ) -> None:
+        """
+        Initialize a closed circuit.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open the
+                circuit; 0 never opens it.
+            reset_seconds (float, optional): Seconds before a trial run is allowed.
+        """
+
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial_started_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether runs are currently refused.
+        """
+
+        return self._opened_at is not None and self.retry_after() > 0
+
+    def retry_after(self) -> float:
+        """
+        Return the seconds until a run will be allowed again.
+
+        Returns:
+            float: Seconds to wait, 0 when a run is allowed now.
+        """
+
+        if self._opened_at is None:
+            return 0.0
+        since = max(self._opened_at, self._trial_started_at or self._opened_at)
+        return max(0.0, since + self.reset_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Check whether a run may start, and reserve the trial run of an open circuit.
+
+        Returns:
+            bool: Whether the run may start.
+        """
+
+        if self._opened_at is None:
+            return True
+        if self.retry_after() > 0:
+            return False
+
+        self._trial_started_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        """
+        Record a successful run, closing the circuit.
+
+        Returns:
+            None
+        """
+
+        self.failures = 0
+        self._opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        """
+        Record a failed run, opening the circuit at the threshold or after a trial.
+
+        Returns:
+            None
+        """
+
+        self.failures += 1
+        is_trial = self._trial_started_at is not None
+        self._trial_started_at = None
+        if is_trial or 0 < self.failure_threshold <= self.failures:
+            self._opened_at = time.monotonic()
+
+
+circuit_breakers: dict[str, CircuitBreaker] = {}
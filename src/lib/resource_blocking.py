@@ -0,0 +1,161 @@
+"""
+resource_blocking.py
+
+This module keeps flight results pages light in agent browser contexts. Google Flights
+and Kayak pull in images, video, web fonts, ads, trackers and third-party scripts the
+agent never needs, and browser-use waits for the network to settle before every step
+reads the page. A provider's `ResourceProfile` aborts those requests through Playwright
+route interception on the whole browser context, so they are neither transferred nor
+waited for, and can size the viewport of headless browsers.
+"""
+
+import dataclasses
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from browser_use.browser.context import BrowserContext, BrowserContextConfig
+    from playwright.async_api import Route
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Ad, analytics and tracking hosts, blocked whatever the resource type
+TRACKER_URL_PATTERNS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.",
+    "facebook.net",
+    "connect.facebook",
+    "bat.bing.com",
+    "criteo.",
+    "adsrvr.org",
+    "scorecardresearch.com",
+    "hotjar.com",
+    "quantserve.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    """
+    Represents the requests a provider's pages load without.
+
+    Attributes:
+        first_party_hosts (tuple[str, ...]): Hosts (and their subdomains) whose scripts
+            run; scripts from any other host are third-party.
+        blocked_resource_types (frozenset[str]): Playwright resource types aborted
+            from every host.
+        blocked_url_patterns (tuple[str, ...]): Substrings of request URLs aborted
+            whatever their resource type.
+        block_third_party_scripts (bool): Whether scripts from hosts outside
+            `first_party_hosts` are aborted.
+        headless_window_size (tuple[int, int] | None): Viewport width and height of
+            headless browsers, or None for the browser-use default.
+    """
+
+    first_party_hosts: tuple[str, ...]
+    blocked_resource_types: frozenset[str] = BLOCKED_RESOURCE_TYPES
+    blocked_url_patterns: tuple[str, ...] = TRACKER_URL_PATTERNS
+    block_third_party_scripts: bool = True
+    headless_window_size: tuple[int, int] | None = None
+
+    def is_first_party(self, url: str) -> bool:
+        """
+        Check whether a URL is served by one of the first-party hosts.
+
+        Args:
+            url (str): The request URL.
+
+        Returns:
+            bool: Whether the host is a first-party host or one of its subdomains.
+        """
+
+        host = urlsplit(url).hostname or ""
+        return any(
+            host == first_party or host.endswith(f".{first_party}")
+            for first_party in self.first_party_hosts
+        )
+
+    def is_blocked(self, resource_type: str, url: str) -> bool:
+        """
+        Check whether a request is aborted under this profile.
+
+        Args:
+            resource_type (str): The Playwright resource type, e.g. `image`.
+            url (str): The request URL.
+
+        Returns:
+            bool: Whether the request is aborted.
+        """
+
+        if resource_type in self.blocked_resource_types:
+            return True
+
+        lowered_url = url.lower()
+        if any(pattern in lowered_url for pattern in self.blocked_url_patterns):
+            return True
+
+        return (
+            self.block_third_party_scripts
+            and resource_type == "script"
+            and not self.is_first_party(url)
+        )
+
+    def context_config(
+        self, config: "BrowserContextConfig", headless: bool
+    ) -> "BrowserContextConfig":
+        """
+        Adapt a browser context config to this profile.
+
+        Args:
+            config (BrowserContextConfig): The config the context would otherwise use.
+            headless (bool): Whether the browser runs headless.
+
+        Returns:
+            BrowserContextConfig: The config with the headless viewport applied.
+        """
+
+        if not headless or self.headless_window_size is None:
+            return config
+
+        width, height = self.headless_window_size
+        return dataclasses.replace(
+            config, browser_window_size={"width": width, "height": height}
+        )
+
+
+async def apply_resource_profile(
+    browser_context: "BrowserContext", profile: ResourceProfile
+) -> None:
+    """
+    Abort the requests a profile blocks on every page of a browser context.
+
+    This starts the context's browser session if it has not started yet.
+
+    Args:
+        browser_context (BrowserContext): The browser context of an agent run.
+        profile (ResourceProfile): The provider's resource profile.
+
+    Returns:
+        None
+    """
+
+    async def route_request(route: "Route") -> None:
+        request = route.request
+        if profile.is_blocked(request.resource_type, request.url):
+            logger.debug("Blocked %s %s", request.resource_type, request.url)
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    session = await browser_context.get_session()
+    await session.context.route("**/*", route_request)
@@ -0,0 +1,205 @@
+"""
+result_cache.py
+
+This module provides an on-disk SQLite cache of validated provider search results.
+Entries are keyed on the provider, the normalized query and the provider search URL,
+expire after a TTL and are evicted least-recently-used once the cache is full.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from src.constants import (
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_TTL_SECONDS,
+)
+from src.typings import FlightQuery
+
+
+def normalize_flight_query(query: FlightQuery) -> FlightQuery:
+    """
+    Normalize a query so equivalent searches share the same key.
+
+    Args:
+        query (FlightQuery): The query as typed by the user.
+
+    Returns:
+        FlightQuery: The query with trimmed, upper-cased airport codes and trimmed dates.
+    """
+
+    return FlightQuery(
+        departure=query.departure.strip().upper(),
+        destination=query.destination.strip().upper(),
+        date=query.date.strip(),
+        return_date=query.return_date.strip() if query.return_date else None,
+    )
+
+
+def build_query_key(provider: str, query: FlightQuery, url: str) -> str:
+    """
+    Build a stable key for a provider search.
+
+    Args:
+        provider (str): The provider name.
+        query (FlightQuery): The flight query.
+        url (str): The provider search URL, built for the normalized query so that
+            equivalent queries share a key.
+
+    Returns:
+        str: A hex SHA-256 digest identifying the search.
+    """
+
+    payload = {
+        "provider": provider,
+        "query": normalize_flight_query(query).model_dump(),
+        "url": url,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    A TTL and LRU bounded SQLite cache of provider results, with hit/miss counters.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = RESULT_CACHE_PATH,
+        ttl_seconds: float = RESULT_CACHE_TTL_SECONDS,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str | Path, optional): SQLite file path, or `:memory:`.
+            ttl_seconds (float, optional): Seconds an entry stays fresh.
+            max_entries (int, optional): Entries kept before LRU eviction.
+        """
+
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(str(path))
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at);
+            """
+        )
+
+    def get(self, key: str) -> str | None:
+        """
+        Return a fresh cached value and mark it as recently used.
+
+        Args:
+            key (str): The key built by `build_query_key`.
+
+        Returns:
+            str | None: The cached JSON result, or None on a miss or expired entry.
+        """
+
+        now = time.time()
+        row = self._connection.execute(
+            "SELECT value, created_at FROM results WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        value, created_at = row
+
+        if now - created_at > self.ttl_seconds:
+            with self._connection:
+                self._connection.execute("DELETE FROM results WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+
+        with self._connection:
+            self._connection.execute(
+                "UPDATE results SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        self.hits += 1
+        return value
+
+    def set(self, key: str, provider: str, value: str) -> None:
+        """
+        Store a value and evict the least recently used entries beyond the bound.
+
+        Args:
+            key (str): The key built by `build_query_key`.
+            provider (str): The provider name, kept for inspection.
+            value (str): The validated JSON result.
+
+        Returns:
+            None
+        """
+
+        now = time.time()
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, provider, value, now, now),
+            )
+            self._connection.execute(
+                """
+                DELETE FROM results WHERE key IN (
+                    SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def purge_expired(self) -> int:
+        """
+        Delete every expired entry.
+
+        Returns:
+            int: The number of entries deleted.
+        """
+
+        with self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM results WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+        return cursor.rowcount
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the hit and miss counters and the current number of entries.
+
+        Returns:
+            dict[str, int]: `hits`, `misses` and `entries`.
+        """
+
+        (entries,) = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+
+        Returns:
+            None
+        """
+
+        self._connection.close()
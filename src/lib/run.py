@@ -1,36 +1,39 @@
 """
 run.py
 
-This module provides functionality to run an agent asynchronously, print debug information, 
-and save the agent's history to a file.
+This module provides functionality to run an agent asynchronously, bound the history it
+keeps in memory, and write its debug information to the agent log.
 """
 
-from src.lib.utils import print_agent_brain, print_extracted_content
+from src.constants import HISTORY_POLICY
+from src.lib.history import HistoryRetention, log_agent_history
 
 
-async def run_agent(agent):
+async def run_agent(agent, max_steps=50, history_policy=HISTORY_POLICY):
     """
-    Asynchronously runs the agent, prints debug information, and saves the agent's history.
+    Asynchronously runs the agent under a history policy and logs its history.
 
     Args:
-        agent (object): The agent object to be run and whose history will be processed and saved.
+        agent (object): The agent object to be run and whose history will be logged.
+        max_steps (int, optional): The step budget of the run. Defaults to 50.
+        history_policy (str, optional): `none`, `summary` or `full`. Defaults to
+            HISTORY_POLICY.
 
     Returns:
         final_result (object): The final result of the agent's run.
 
     The function performs the following steps:
-    1. Runs the agent with a maximum of 50 steps.
-    2. Prints a separator line.
-    3. Prints the action results from the agent's history.
-    4. Prints the model thoughts from the agent's history.
+    1. Applies the history policy to the steps the agent records.
+    2. Runs the agent with a maximum of `max_steps` steps.
+    3. Logs the action results and model thoughts from the agent's history.
     """
 
-    result = await agent.run(max_steps=50)
+    retention = HistoryRetention(agent, history_policy)
+    try:
+        result = await agent.run(max_steps=max_steps)
+    finally:
+        retention.finish()
 
-    print("-" * 80)
-    print("\n=== Action Results ===")
-    print_extracted_content(result.action_results())
-    print("\n=== Model Thoughts ===")
-    print_agent_brain(result.model_thoughts())
+    log_agent_history(agent, result)
 
     return result.final_result()
@@ -0,0 +1,234 @@
+"""
+search_jobs.py
+
+This module provides the job queue behind the search service. Submitted queries are
+queued and picked up by a fixed number of workers, each running the concurrent search
+of every provider, while the browser pool, the result cache and the agent factories
+(with their LLM clients) stay warm across jobs. The fares of every finished job can be
+recorded in a fare history. Finished jobs are kept for polling until the oldest ones
+are evicted.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+
+from pydantic import BaseModel
+
+from src.constants import (
+    PROVIDER_TIMEOUT_SECONDS,
+    SERVICE_MAX_JOBS,
+    SERVICE_QUEUE_SIZE,
+    SERVICE_WORKERS,
+)
+from src.lib.browser_pool import BrowserPool
+from src.lib.fare_store import FareStore
+from src.lib.orchestrator import search_flights_concurrently
+from src.lib.providers import AgentFactory
+from src.lib.result_cache import ResultCache, normalize_flight_query
+from src.typings import FlightQuery, SearchJob
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """
+    Raised when a job is submitted while the queue of pending jobs is full.
+    """
+
+
+class SearchJobQueue:
+    """
+    Runs submitted flight searches on a fixed pool of workers.
+
+    Use it as an async context manager, or call `start()` and `close()` explicitly.
+    """
+
+    def __init__(
+        self,
+        workers: int = SERVICE_WORKERS,
+        providers: dict[str, AgentFactory] | None = None,
+        timeout: float = PROVIDER_TIMEOUT_SECONDS,
+        browser_pool: BrowserPool | None = None,
+        result_cache: ResultCache | None = None,
+        fare_store: FareStore | None = None,
+        queue_size: int = SERVICE_QUEUE_SIZE,
+        max_jobs: int = SERVICE_MAX_JOBS,
+    ) -> None:
+        """
+        Initialize the queue without starting any worker.
+
+        Args:
+            workers (int, optional): Searches run concurrently.
+            providers (dict[str, AgentFactory], optional): Agent factories by provider
+                name. Defaults to every registered provider searched by default.
+            timeout (float, optional): Seconds allowed for each provider run.
+            browser_pool (BrowserPool, optional): Pool to borrow warm browser contexts
+                from; it is not started or closed by the queue.
+            result_cache (ResultCache, optional): Cache of validated provider results.
+            fare_store (FareStore, optional): Fare history the fares of every
+                finished job are recorded in; it is not closed by the queue.
+            queue_size (int, optional): Pending jobs accepted before submissions fail.
+            max_jobs (int, optional): Jobs kept for polling; the oldest finished jobs
+                are evicted first.
+        """
+
+        self.workers = workers
+        self.providers = providers
+        self.timeout = timeout
+        self.browser_pool = browser_pool
+        self.result_cache = result_cache
+        self.fare_store = fare_store
+        self.max_jobs = max_jobs
+        self.jobs: OrderedDict[str, SearchJob] = OrderedDict()
+        self._pending: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self._worker_tasks: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> "SearchJobQueue":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """
+        Start the workers.
+
+        Returns:
+            None
+        """
+
+        self._worker_tasks = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def close(self) -> None:
+        """
+        Cancel the workers, failing the jobs they were running.
+
+        Returns:
+            None
+        """
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+
+    def submit(self, query: FlightQuery) -> SearchJob:
+        """
+        Queue a search.
+
+        Args:
+            query (FlightQuery): The query to search.
+
+        Returns:
+            SearchJob: The queued job.
+
+        Raises:
+            QueueFullError: When the queue of pending jobs is full.
+        """
+
+        job = SearchJob(
+            job_id=uuid.uuid4().hex,
+            query=normalize_flight_query(query),
+            submitted_at=time.time(),
+        )
+
+        try:
+            self._pending.put_nowait(job.job_id)
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"{self._pending.maxsize} searches are already pending"
+            ) from None
+
+        self.jobs[job.job_id] = job
+        self._evict_finished_jobs()
+        return job
+
+    def get(self, job_id: str) -> SearchJob | None:
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): The job identifier.
+
+        Returns:
+            SearchJob | None: The job, or None when it is unknown or was evicted.
+        """
+
+        return self.jobs.get(job_id)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the number of jobs by status.
+
+        Returns:
+            dict[str, int]: Counts for `queued`, `running`, `done` and `failed`.
+        """
+
+        counts = dict.fromkeys(("queued", "running", "done", "failed"), 0)
+        for job in self.jobs.values():
+            counts[job.status] += 1
+        return counts
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._pending.get()
+            try:
+                job = self.jobs.get(job_id)
+                if job is not None:
+                    await self._run(job)
+            finally:
+                self._pending.task_done()
+
+    async def _run(self, job: SearchJob) -> None:
+        def count_flights(provider: str, batch: BaseModel) -> None:
+            job.flights_found += sum(len(airline.flights) for airline in batch.airlines)
+
+        job.status = "running"
+        job.started_at = time.time()
+
+        try:
+            job.results = await search_flights_concurrently(
+                job.query.departure,
+                job.query.destination,
+                job.query.date,
+                job.query.return_date,
+                self.providers,
+                self.timeout,
+                self.browser_pool,
+                self.result_cache,
+                on_batch=count_flights,
+            )
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Cancelled"
+            raise
+        except Exception as e:
+            logger.exception("Search job %s failed", job.job_id)
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+        finally:
+            job.finished_at = time.time()
+
+        if self.fare_store and job.status == "done":
+            try:
+                for provider_result in job.results:
+                    self.fare_store.add_result(provider_result)
+                self.fare_store.flush()
+            except Exception:
+                logger.exception("Recording the fares of job %s failed", job.job_id)
+
+    def _evict_finished_jobs(self) -> None:
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return
+
+        finished = [job_id for job_id, job in self.jobs.items() if job.is_finished]
+        for job_id in finished[:excess]:
+            del self.jobs[job_id]
@@ -0,0 +1,199 @@
+"""
+search_service.py
+
+This module provides the HTTP API of the long-running search service, built on
+aiohttp. Searches are submitted to a `SearchJobQueue` and polled by job id:
+
+    POST /searches                  submit a query, returns 202 and the job
+    GET  /searches/{job_id}         job status and flights found so far
+    GET  /searches/{job_id}/result  provider results, 202 while still pending
+    GET  /health                    job counts by status
+    GET  /metrics                   agent step metrics in Prometheus text format
+
+aiohttp is an optional dependency: `poetry install --extras service`.
+"""
+
+from aiohttp import web
+from pydantic import ValidationError
+
+from src.lib.instrumentation import MetricsRecorder, metrics_recorder
+from src.lib.search_jobs import QueueFullError, SearchJobQueue
+from src.typings import FlightQuery, SearchJob
+
+JOB_QUEUE = web.AppKey("job_queue", SearchJobQueue)
+METRICS_RECORDER = web.AppKey("metrics_recorder", MetricsRecorder)
+
+
+def job_status(job: SearchJob) -> dict:
+    """
+    Describe a job without its provider results.
+
+    Args:
+        job (SearchJob): The job.
+
+    Returns:
+        dict: The JSON-serializable job status.
+    """
+
+    return job.model_dump(mode="json", exclude={"results"})
+
+
+def find_job(request: web.Request) -> SearchJob:
+    """
+    Look up the job named in the request path.
+
+    Args:
+        request (web.Request): A request routed with a `job_id`.
+
+    Returns:
+        SearchJob: The job.
+
+    Raises:
+        web.HTTPNotFound: When the job is unknown or was evicted.
+    """
+
+    job = request.app[JOB_QUEUE].get(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(
+            text='{"error": "Unknown search job"}', content_type="application/json"
+        )
+    return job
+
+
+async def submit_search(request: web.Request) -> web.Response:
+    """
+    Queue the search in the JSON request body.
+
+    Args:
+        request (web.Request): A request with a `FlightQuery` JSON body.
+
+    Returns:
+        web.Response: 202 with the job, 400 for an invalid query, or 503 when the
+            queue is full.
+    """
+
+    try:
+        query = FlightQuery.model_validate_json(await request.read())
+    except ValidationError as e:
+        return web.json_response({"error": str(e)}, status=400)
+
+    try:
+        job = request.app[JOB_QUEUE].submit(query)
+    except QueueFullError as e:
+        return web.json_response({"error": str(e)}, status=503)
+
+    return web.json_response(
+        job_status(job),
+        status=202,
+        headers={"Location": f"/searches/{job.job_id}"},
+    )
+
+
+async def get_search(request: web.Request) -> web.Response:
+    """
+    Report the status of a job.
+
+    Args:
+        request (web.Request): A request routed with a `job_id`.
+
+    Returns:
+        web.Response: The job status and the flights found so far.
+    """
+
+    return web.json_response(job_status(find_job(request)))
+
+
+async def get_search_result(request: web.Request) -> web.Response:
+    """
+    Return the provider results of a job.
+
+    Args:
+        request (web.Request): A request routed with a `job_id`.
+
+    Returns:
+        web.Response: 200 with the job and its results once finished, otherwise 202
+            with the job status.
+    """
+
+    job = find_job(request)
+    if not job.is_finished:
+        return web.json_response(job_status(job), status=202)
+    return web.json_response(job.model_dump(mode="json"))
+
+
+async def get_health(request: web.Request) -> web.Response:
+    """
+    Report that the service is up, with job counts by status.
+
+    Args:
+        request (web.Request): The request.
+
+    Returns:
+        web.Response: The health status.
+    """
+
+    return web.json_response({"status": "ok", "jobs": request.app[JOB_QUEUE].stats()})
+
+
+async def get_metrics(request: web.Request) -> web.Response:
+    """
+    Serve the agent step metrics.
+
+    Args:
+        request (web.Request): The request.
+
+    Returns:
+        web.Response: The metrics in Prometheus text format.
+    """
+
+    return web.Response(
+        text=request.app[METRICS_RECORDER].render_prometheus(),
+        content_type="text/plain",
+        charset="utf-8",
+    )
+
+
+def build_search_app(
+    job_queue: SearchJobQueue, recorder: MetricsRecorder = metrics_recorder
+) -> web.Application:
+    """
+    Build the search service application.
+
+    Args:
+        job_queue (SearchJobQueue): The started queue searches are submitted to.
+        recorder (MetricsRecorder, optional): The recorder served on `/metrics`.
+
+    Returns:
+        web.Application: The application, ready to be run.
+    """
+
+    app = web.Application()
+    app[JOB_QUEUE] = job_queue
+    app[METRICS_RECORDER] = recorder
+    app.router.add_post("/searches", submit_search)
+    app.router.add_get("/searches/{job_id}", get_search)
+    app.router.add_get("/searches/{job_id}/result", get_search_result)
+    app.router.add_get("/health", get_health)
+    app.router.add_get("/metrics", get_metrics)
+    return app
+
+
+async def serve_search_service(
+    job_queue: SearchJobQueue, host: str, port: int
+) -> web.AppRunner:
+    """
+    Start serving the search service.
+
+    Args:
+        job_queue (SearchJobQueue): The started queue searches are submitted to.
+        host (str): The interface to bind.
+        port (int): The port to bind.
+
+    Returns:
+        web.AppRunner: The running service; call `cleanup()` to stop it.
+    """
+
+    runner = web.AppRunner(build_search_app(job_queue), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
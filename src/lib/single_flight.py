@@ -0,0 +1,91 @@
+"""
+single_flight.py
+
+This module coalesces identical in-flight searches. The first caller for a key starts
+the work as a task, and every caller arriving for the same key while it runs awaits
+that task instead of starting its own browser agent, so all of them receive the one
+shared result. The task is cancelled only when every caller waiting on it is.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Shares one in-flight task per key between concurrent callers, with counters of
+    started and coalesced calls.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty set of in-flight calls.
+        """
+
+        self.started = 0
+        self.coalesced = 0
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+
+    async def run(self, key: str, start: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run the work for a key, or join the run already in flight for it.
+
+        Args:
+            key (str): Identifies identical work, e.g. a normalized query key.
+            start (Callable[[], Awaitable[T]]): Starts the work; only called when no
+                run for the key is in flight.
+
+        Returns:
+            tuple[T, bool]: The result, and whether it was shared from another
+                caller's run.
+        """
+
+        task = self._tasks.get(key)
+        is_coalesced = task is not None
+
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(start())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task), is_coalesced
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                if not task.done():
+                    task.cancel()
+
+    def in_flight(self) -> int:
+        """
+        Return the number of keys with a run in flight.
+
+        Returns:
+            int: The number of in-flight runs.
+        """
+
+        return len(self._tasks)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the started and coalesced counters and the in-flight count.
+
+        Returns:
+            dict[str, int]: `started`, `coalesced` and `in_flight`.
+        """
+
+        return {
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight(),
+        }
+
+
+provider_searches: SingleFlight = SingleFlight()
@@ -0,0 +1,129 @@
+"""
+streaming.py
+
+This module streams the flights of an agent run while the agent is still running.
+After every agent step the flights the agent extracted in that step (see
+`src/lib/completion.py`) are validated, and the flights not seen in earlier steps are
+yielded as a batch, so the first results arrive after the agent's first page content
+extraction instead of at the end of the run. The agent's final result is diffed
+against the streamed flights and yields a last batch when it adds any. Batches can
+also be appended to a JSONL file as they arrive.
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Callable, TextIO
+
+from pydantic import BaseModel, ValidationError
+
+from src.constants import COMPLETION_STABLE_STEPS
+from src.lib.completion import CompletionDetector
+from src.lib.run import run_agent
+
+if TYPE_CHECKING:
+    from browser_use import Agent
+
+BatchCallback = Callable[[str, BaseModel], None]
+
+_END_OF_RUN = object()
+
+
+async def stream_agent(
+    agent: "Agent",
+    route: str,
+    max_steps: int = 50,
+    result_count_selector: str | None = None,
+    stop_when_complete: bool = True,
+    stable_steps: int = COMPLETION_STABLE_STEPS,
+) -> AsyncIterator[BaseModel]:
+    """
+    Run an agent and yield the new flights of every step as they are extracted.
+
+    Outputs that hold no airline list, such as price calendars, are only yielded
+    whole once the run ends. The run's final result stays available from
+    `agent.history.final_result()`. Closing the generator early cancels the run.
+
+    Args:
+        agent (Agent): The agent to run. An agent that stopped early resumes from
+            its last recorded step.
+        route (str): The route label, e.g. `SFO-JFK`.
+        max_steps (int, optional): The step budget of the run. Defaults to 50.
+        result_count_selector (str, optional): CSS selector of the result count.
+        stop_when_complete (bool, optional): Whether to finish the run once the result
+            list is fully extracted. Defaults to True.
+        stable_steps (int, optional): Steps without new flights before the list
+            counts as complete.
+
+    Yields:
+        BaseModel: Controller outputs holding only flights not yielded before.
+    """
+
+    output_model = agent.controller.output_model
+    batches: asyncio.Queue = asyncio.Queue()
+    detector = (
+        CompletionDetector(
+            agent,
+            route,
+            result_count_selector,
+            stable_steps,
+            on_new_flights=batches.put_nowait,
+            stop_when_complete=stop_when_complete,
+        )
+        if output_model is not None and "airlines" in output_model.model_fields
+        else None
+    )
+
+    async def run() -> str | None:
+        try:
+            return await run_agent(agent, max_steps)
+        finally:
+            batches.put_nowait(_END_OF_RUN)
+
+    run_task = asyncio.create_task(run())
+    try:
+        while (batch := await batches.get()) is not _END_OF_RUN:
+            yield batch
+
+        final_result = await run_task
+        if final_result is None or output_model is None:
+            return
+        try:
+            output = output_model.model_validate_json(final_result)
+        except ValidationError:
+            return
+        if detector is None:
+            yield output
+        elif (new_flights := detector.add_output(output)) is not None:
+            yield new_flights
+    finally:
+        if not run_task.done():
+            run_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await run_task
+        if detector:
+            detector.finish()
+
+
+def jsonl_batch_sink(file: TextIO) -> BatchCallback:
+    """
+    Create a batch callback that appends each batch to a JSONL file and flushes it.
+
+    Args:
+        file (TextIO): The open file batches are appended to.
+
+    Returns:
+        BatchCallback: A callback taking the provider name and the batch.
+    """
+
+    def write_batch(provider: str, batch: BaseModel) -> None:
+        row = {
+            "provider": provider,
+            "received_at": time.time(),
+            **batch.model_dump(),
+        }
+        file.write(json.dumps(row) + "\n")
+        file.flush()
+
+    return write_batch
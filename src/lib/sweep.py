@@ -0,0 +1,389 @@
+"""
+sweep.py
+
+This module searches a window of departure dates, optionally for several trip lengths,
+and reduces the results to a price matrix by date. Dates are expanded into one query
+per departure and return date and fanned out concurrently, bounded by each provider's
+`concurrency` limit on top of the per-domain politeness interval. Providers with a
+flexible-dates view (Kayak's price grid, which shows the cheapest fare of up to seven
+consecutive departure dates on one page) cover one-way windows in blocks of dates
+instead of one search per date, falling back to per-date searches for a block whose
+grid could not be read. A result that cannot be read counts as no price for its date.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date as Date
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from pydantic import ValidationError
+
+from src.constants import PROVIDER_TIMEOUT_SECONDS, SWEEP_FLEX_DAYS
+from src.lib.browser_pool import BrowserPool
+from src.lib.flight_records import normalize_run_result, parse_price
+from src.lib.orchestrator import run_provider
+from src.lib.providers import (
+    AgentFactory,
+    Provider,
+    get_agent_factories,
+    get_provider,
+)
+from src.lib.result_cache import ResultCache
+from src.typings import FlightQuery, PriceCalendarOutput, ProviderRunResult
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class SweepPrice:
+    """
+    Represents the cheapest price a provider found for one departure and return date.
+
+    Attributes:
+        provider (str): The provider name, e.g. `google_flights` or `kayak`.
+        date (str): The departure date in YYYY-MM-DD format.
+        return_date (str | None): The return date, or None for one-way trips.
+        price_cents (int): The cheapest price in the currency's minor unit.
+        currency (str | None): ISO currency code derived from the price symbol.
+    """
+
+    provider: str
+    date: str
+    return_date: str | None
+    price_cents: int
+    currency: str | None
+
+
+def expand_dates(date: str, flex_days: int) -> list[str]:
+    """
+    List the dates within `flex_days` of a date, earliest first.
+
+    Args:
+        date (str): The center date in YYYY-MM-DD format.
+        flex_days (int): Days searched on each side of the date.
+
+    Returns:
+        list[str]: The dates in YYYY-MM-DD format.
+    """
+
+    center = Date.fromisoformat(date)
+    return [
+        (center + timedelta(days=offset)).isoformat()
+        for offset in range(-flex_days, flex_days + 1)
+    ]
+
+
+def build_sweep_queries(
+    departure: str,
+    destination: str,
+    date: str,
+    flex_days: int = SWEEP_FLEX_DAYS,
+    trip_lengths: list[int] | None = None,
+) -> list[FlightQuery]:
+    """
+    Expand a date window and trip lengths into one query per departure and return date.
+
+    Args:
+        departure (str): The departure airport code.
+        destination (str): The destination airport code.
+        date (str): The center departure date in YYYY-MM-DD format.
+        flex_days (int, optional): Days searched on each side of the date.
+        trip_lengths (list[int], optional): Nights between departure and return.
+            Defaults to None, which searches one-way trips.
+
+    Returns:
+        list[FlightQuery]: The queries, by departure date and then trip length.
+    """
+
+    queries = []
+
+    for departure_date in expand_dates(date, flex_days):
+        return_dates = [
+            (Date.fromisoformat(departure_date) + timedelta(days=nights)).isoformat()
+            for nights in trip_lengths or []
+        ] or [None]
+        queries.extend(
+            FlightQuery(
+                departure=departure,
+                destination=destination,
+                date=departure_date,
+                return_date=return_date,
+            )
+            for return_date in return_dates
+        )
+
+    return queries
+
+
+def plan_flexible_blocks(dates: list[str], flexible_days: int) -> dict[str, list[str]]:
+    """
+    Cover dates with as few flexible-dates views as possible.
+
+    Args:
+        dates (list[str]): The departure dates to cover, in YYYY-MM-DD format.
+        flexible_days (int): Days one view covers on each side of its center date.
+
+    Returns:
+        dict[str, list[str]]: The dates covered by each view, by its center date.
+    """
+
+    blocks: dict[str, list[str]] = {}
+    block_end = None
+
+    for day in sorted(set(map(Date.fromisoformat, dates))):
+        if block_end is None or day > block_end:
+            center = day + timedelta(days=flexible_days)
+            block_end = center + timedelta(days=flexible_days)
+            blocks[center.isoformat()] = []
+        blocks[center.isoformat()].append(day.isoformat())
+
+    return blocks
+
+
+def flight_sweep_prices(run_result: ProviderRunResult) -> list[SweepPrice]:
+    """
+    Reduce a flight search result to the cheapest price of its query.
+
+    Prices in different currencies do not compare, so only the currency most of the
+    flights are priced in is considered.
+
+    Args:
+        run_result (ProviderRunResult): A flight search of one provider and date.
+
+    Returns:
+        list[SweepPrice]: The cheapest price, or nothing when no flight has a price.
+    """
+
+    priced = [
+        record
+        for record in normalize_run_result(run_result)
+        if record.price_cents is not None
+    ]
+    if not priced:
+        return []
+
+    currency = Counter(record.currency for record in priced).most_common(1)[0][0]
+    cheapest = min(
+        (record for record in priced if record.currency == currency),
+        key=lambda record: record.price_cents,
+    )
+    query = run_result.query
+    return [
+        SweepPrice(
+            run_result.provider,
+            query.date,
+            query.return_date,
+            cheapest.price_cents,
+            cheapest.currency,
+        )
+    ]
+
+
+def calendar_sweep_prices(
+    provider: str, run_result: ProviderRunResult, dates: list[str]
+) -> list[SweepPrice]:
+    """
+    Read the prices of the requested dates from a flexible-dates view result.
+
+    Args:
+        provider (str): The provider the prices are labelled with.
+        run_result (ProviderRunResult): A flexible-dates view run.
+        dates (list[str]): The departure dates to keep.
+
+    Returns:
+        list[SweepPrice]: One price per requested date the view listed, none when
+            the run failed or its result does not validate.
+    """
+
+    if not (run_result.is_successful and run_result.result):
+        return []
+
+    try:
+        calendar = PriceCalendarOutput.model_validate_json(run_result.result)
+    except ValidationError as e:
+        logger.warning("%s price calendar does not validate: %s", provider, e)
+        return []
+    wanted = set(dates)
+    prices = []
+
+    for date_price in calendar.prices:
+        price_cents, currency = parse_price(date_price.price)
+        if date_price.date in wanted and price_cents is not None:
+            wanted.discard(date_price.date)
+            prices.append(
+                SweepPrice(provider, date_price.date, None, price_cents, currency)
+            )
+
+    return prices
+
+
+async def run_sweep(
+    departure: str,
+    destination: str,
+    date: str,
+    flex_days: int = SWEEP_FLEX_DAYS,
+    trip_lengths: list[int] | None = None,
+    providers: dict[str, AgentFactory] | None = None,
+    concurrency: dict[str, int] | None = None,
+    use_flexible_views: bool = True,
+    timeout: float = PROVIDER_TIMEOUT_SECONDS,
+    browser_pool: BrowserPool | None = None,
+    result_cache: ResultCache | None = None,
+) -> tuple[list[SweepPrice], list[ProviderRunResult]]:
+    """
+    Search every date of a window on every provider, concurrently.
+
+    Args:
+        departure (str): The departure airport code.
+        destination (str): The destination airport code.
+        date (str): The center departure date in YYYY-MM-DD format.
+        flex_days (int, optional): Days searched on each side of the date.
+        trip_lengths (list[int], optional): Nights between departure and return.
+            Defaults to None, which searches one-way trips.
+        providers (dict[str, AgentFactory], optional): Agent factories by provider name.
+            Defaults to every registered provider searched by default.
+        concurrency (dict[str, int], optional): Concurrent agents per provider.
+            Defaults to each provider's `concurrency`.
+        use_flexible_views (bool, optional): Whether to read one-way windows from the
+            providers' flexible-dates views where available. Defaults to True.
+        timeout (float, optional): Seconds allowed for each provider run.
+        browser_pool (BrowserPool, optional): Pool to borrow warm browser contexts from.
+        result_cache (ResultCache, optional): Cache of validated provider results.
+
+    Returns:
+        tuple[list[SweepPrice], list[ProviderRunResult]]: The cheapest price found per
+            provider and date, and every provider run, in completion order.
+    """
+
+    providers = providers or get_agent_factories()
+    concurrency = concurrency or {}
+    limits = {
+        provider: asyncio.Semaphore(
+            max(1, concurrency.get(provider, get_provider(provider).concurrency))
+        )
+        for provider in providers
+    }
+    queries = build_sweep_queries(departure, destination, date, flex_days, trip_lengths)
+    prices: list[SweepPrice] = []
+    run_results: list[ProviderRunResult] = []
+
+    async def search(
+        provider: str,
+        agent_factory: AgentFactory,
+        query: FlightQuery,
+        view: str | None = None,
+    ) -> ProviderRunResult:
+        async with limits[provider]:
+            run_result = await run_provider(
+                view or provider,
+                agent_factory,
+                query.departure,
+                query.destination,
+                query.date,
+                query.return_date,
+                timeout,
+                browser_pool,
+                result_cache,
+            )
+        run_results.append(run_result)
+        return run_result
+
+    async def search_date(
+        provider: str, agent_factory: AgentFactory, query: FlightQuery
+    ) -> None:
+        run_result = await search(provider, agent_factory, query)
+        try:
+            prices.extend(flight_sweep_prices(run_result))
+        except Exception:
+            logger.exception("%s prices for %s could not be read", provider, query.date)
+
+    async def search_block(
+        provider: str,
+        agent_factory: AgentFactory,
+        view: Provider,
+        center: str,
+        dates: list[str],
+    ) -> None:
+        center_query = FlightQuery(
+            departure=departure, destination=destination, date=center
+        )
+        run_result = await search(provider, view.build_agent, center_query, view.name)
+        try:
+            block_prices = calendar_sweep_prices(provider, run_result, dates)
+        except Exception:
+            logger.exception(
+                "%s price calendar for %s could not be read", view.name, center
+            )
+            block_prices = []
+        prices.extend(block_prices)
+
+        missing = set(dates) - {price.date for price in block_prices}
+        async with asyncio.TaskGroup() as task_group:
+            for query in queries:
+                if query.date in missing:
+                    task_group.create_task(search_date(provider, agent_factory, query))
+
+    async with asyncio.TaskGroup() as task_group:
+        for provider, agent_factory in providers.items():
+            spec = get_provider(provider)
+            if use_flexible_views and spec.flexible_dates and not trip_lengths:
+                view = get_provider(spec.flexible_dates)
+                blocks = plan_flexible_blocks(
+                    [query.date for query in queries], spec.flexible_days
+                )
+                for center, dates in blocks.items():
+                    task_group.create_task(
+                        search_block(provider, agent_factory, view, center, dates)
+                    )
+                continue
+
+            for query in queries:
+                task_group.create_task(search_date(provider, agent_factory, query))
+
+    return prices, run_results
+
+
+def build_price_matrix(prices: list[SweepPrice]) -> "pd.DataFrame":
+    """
+    Pivot sweep prices into one row per departure and return date.
+
+    Args:
+        prices (list[SweepPrice]): The prices of a sweep.
+
+    Returns:
+        pd.DataFrame: One row per date, return date (empty for one-way trips) and
+            currency, sorted by date, with one price column per provider (in cents,
+            NaN when the provider has no price), `best_price_cents` and
+            `cheapest_provider`. The provider column names are listed in
+            `attrs["providers"]`.
+    """
+
+    import pandas as pd
+
+    frame = pd.DataFrame(prices, columns=list(SweepPrice.__dataclass_fields__))
+    frame = frame.dropna(subset=["currency"]).fillna({"return_date": ""})
+    if frame.empty:
+        return pd.DataFrame()
+
+    matrix = frame.pivot_table(
+        index=["date", "return_date", "currency"],
+        columns="provider",
+        values="price_cents",
+        aggfunc="min",
+    )
+    providers = list(matrix.columns)
+    matrix["best_price_cents"] = matrix[providers].min(axis=1)
+    matrix["cheapest_provider"] = matrix[providers].idxmin(axis=1)
+
+    matrix = matrix.reset_index().sort_values(
+        ["date", "return_date"], ignore_index=True
+    )
+    matrix.columns.name = None
+    matrix.attrs["providers"] = providers
+    return matrix
@@ -6,6 +6,34 @@ action results, and structured JSON results.
 """
 
 import json
+import math
+
+from src.lib.flight_records import format_price
+
+
+def format_agent_brain(model_thoughts):
+    """
+    Formats the details of each model thought in the provided list.
+
+    Args:
+        model_thoughts (list): A list of objects containing the model's thoughts.
+
+    Returns:
+        str: The thoughts, one block per step.
+    """
+
+    if not model_thoughts:
+        return "No model thoughts available."
+
+    return "".join(
+        f"\nAgent Brain #{i}:\n\n"
+        f"Page Summary:\n{thought.page_summary}\n\n"
+        f"Evaluation of Previous Goal:\n{thought.evaluation_previous_goal}\n\n"
+        f"Memory:\n{thought.memory}\n\n"
+        f"Next Goal:\n{thought.next_goal}\n\n"
+        f"{'-' * 80}\n"
+        for i, thought in enumerate(model_thoughts, start=1)
+    )
 
 
 def print_agent_brain(model_thoughts):
@@ -19,17 +47,29 @@ def print_agent_brain(model_thoughts):
         None
     """
 
-    if not model_thoughts:
-        print("No model thoughts available.")
-        return
+    print(format_agent_brain(model_thoughts))
 
-    for i, thought in enumerate(model_thoughts, start=1):
-        print(f"\nAgent Brain #{i}:\n")
-        print(f"Page Summary:\n{thought.page_summary}\n")
-        print(f"Evaluation of Previous Goal:\n{thought.evaluation_previous_goal}\n")
-        print(f"Memory:\n{thought.memory}\n")
-        print(f"Next Goal:\n{thought.next_goal}\n")
-        print("-" * 80)
+
+def format_extracted_content(action_results):
+    """
+    Formats the extracted content from each action result in the provided list.
+
+    Args:
+        action_results (list): A list of objects containing action results.
+
+    Returns:
+        str: The extracted contents, one block per action result.
+    """
+
+    if not action_results:
+        return "No action results available."
+
+    return "".join(
+        f"\nAction Result #{i}:\n\n"
+        f"Extracted Content:\n{result.extracted_content}\n\n"
+        f"{'-' * 80}\n"
+        for i, result in enumerate(action_results, start=1)
+    )
 
 
 def print_extracted_content(action_results):
@@ -43,14 +83,7 @@ def print_extracted_content(action_results):
         None
     """
 
-    if not action_results:
-        print("No action results available.")
-        return
-
-    for i, result in enumerate(action_results, start=1):
-        print(f"\nAction Result #{i}:\n")
-        print(f"Extracted Content:\n{result.extracted_content}\n")
-        print("-" * 80)
+    print(format_extracted_content(action_results))
 
 
 def print_structured_result(result):
@@ -75,3 +108,213 @@ def print_structured_result(result):
         print(result)
 
     print("\n", "-" * 80)
+
+
+def print_flight_batch(provider, batch):
+    """
+    Prints one line per flight of a streamed batch and flushes stdout, so flights
+    show up while the search is still running.
+
+    Args:
+        provider (str): The provider that found the flights.
+        batch (BaseModel): A controller output holding the new flights.
+
+    Returns:
+        None
+    """
+
+    for airline in batch.airlines:
+        for flight in airline.flights:
+            print(
+                f"[{provider}] {airline.name}: {flight.route} "
+                f"{flight.departure} - {flight.arrival} ({flight.duration}) "
+                f"{flight.price}",
+                flush=True,
+            )
+
+
+def format_run_metrics(metrics):
+    """
+    Formats the step count, time split and token usage of an agent run.
+
+    Args:
+        metrics (RunMetrics): The run totals.
+
+    Returns:
+        str: The step count, the seconds of each phase, the prompt+completion tokens
+            and the LLM calls answered from the cache, if any.
+    """
+
+    summary = (
+        f"{metrics.steps} steps: llm {metrics.llm_seconds:.1f}s, "
+        f"dom {metrics.dom_seconds:.1f}s, action {metrics.action_seconds:.1f}s, "
+        f"{metrics.prompt_tokens}+{metrics.completion_tokens} tokens"
+    )
+    if metrics.cached_llm_calls:
+        summary += f", {metrics.cached_llm_calls}/{metrics.llm_calls} LLM calls cached"
+    return summary
+
+
+def print_provider_timings(provider_results):
+    """
+    Prints the status and wall time of each provider run.
+
+    Args:
+        provider_results (list): A list of ProviderRunResult objects.
+
+    Returns:
+        None
+    """
+
+    print("\n=== Provider Timings ===\n")
+
+    for provider_result in provider_results:
+        status = "ok" if provider_result.is_successful else provider_result.error
+        if provider_result.is_cached:
+            status += ", cached"
+        if provider_result.is_coalesced:
+            status += ", coalesced"
+        if provider_result.extraction_method:
+            status += f", {provider_result.extraction_method}"
+        if provider_result.attempts > 1:
+            status += f", {provider_result.attempts} attempts"
+        if provider_result.metrics:
+            status += f", {format_run_metrics(provider_result.metrics)}"
+        print(
+            f"{provider_result.provider}: {provider_result.elapsed_seconds:.1f}s ({status})"
+        )
+
+    print("\n", "-" * 80)
+
+
+def print_fare_comparison(itineraries):
+    """
+    Prints one line per itinerary with the price of each provider and the best source.
+
+    Args:
+        itineraries (pandas.DataFrame): The itineraries returned by `compare_fares`.
+
+    Returns:
+        None
+    """
+
+    print("\n=== Fare Comparison ===\n")
+
+    if itineraries.empty:
+        print("No comparable flights available.")
+        return
+
+    providers = itineraries.attrs["providers"]
+
+    for itinerary in itineraries.itertuples(index=False):
+        row = itinerary._asdict()
+        prices = ", ".join(
+            f"{provider} {format_price(row[provider], itinerary.currency)}"
+            for provider in providers
+            if not math.isnan(row[provider])
+        )
+        best_price = format_price(itinerary.best_price_cents, itinerary.currency)
+        spread = format_price(itinerary.price_spread_cents, itinerary.currency)
+        print(
+            f"{itinerary.airline} {itinerary.route} "
+            f"{itinerary.departure_at:%H:%M}-{itinerary.arrival_at:%H:%M %d %b}: "
+            f"{best_price} {itinerary.currency} "
+            f"from {itinerary.cheapest_provider} (spread {spread}; {prices})"
+        )
+
+    print("\n", "-" * 80)
+
+
+def print_price_matrix(matrix):
+    """
+    Prints one line per departure (and return) date with the price of each provider.
+
+    Args:
+        matrix (pandas.DataFrame): The price matrix returned by `build_price_matrix`.
+
+    Returns:
+        None
+    """
+
+    print("\n=== Price Matrix ===\n")
+
+    if matrix.empty:
+        print("No prices available.")
+        return
+
+    providers = matrix.attrs["providers"]
+
+    for row in matrix.itertuples(index=False):
+        row = row._asdict()
+        trip = row["date"] + (f"/{row['return_date']}" if row["return_date"] else "")
+        prices = ", ".join(
+            (
+                f"{provider} {format_price(row[provider], row['currency'])}"
+                if not math.isnan(row[provider])
+                else f"{provider} -"
+            )
+            for provider in providers
+        )
+        print(
+            f"{trip}: {format_price(row['best_price_cents'], row['currency'])} "
+            f"{row['currency']} "
+            f"from {row['cheapest_provider']} ({prices})"
+        )
+
+    print("\n", "-" * 80)
+
+
+def print_fare_trend(points):
+    """
+    Prints one line per time bucket with the cheapest fare found in it.
+
+    Args:
+        points (list): The FarePoint objects returned by `FareStore.cheapest_fares`.
+
+    Returns:
+        None
+    """
+
+    print("\n=== Cheapest Fare Trend ===\n")
+
+    if not points:
+        print("No fares recorded.")
+        return
+
+    for point in points:
+        print(
+            f"{point.bucket_start:%Y-%m-%d %H:%M}: "
+            f"{format_price(point.price_cents, point.currency)} {point.currency or ''} "
+            f"{point.airline} on {point.travel_date} from {point.provider}"
+        )
+
+    print("\n", "-" * 80)
+
+
+def print_price_drops(drops):
+    """
+    Prints one line per search whose cheapest fare dropped since the previous one.
+
+    Args:
+        drops (list): The PriceDrop objects returned by `FareStore.price_drops`.
+
+    Returns:
+        None
+    """
+
+    print("\n=== Price Drops ===\n")
+
+    if not drops:
+        print("No price drops recorded.")
+        return
+
+    for drop in drops:
+        print(
+            f"{drop.searched_at:%Y-%m-%d %H:%M} {drop.travel_date} [{drop.provider}]: "
+            f"{format_price(drop.previous_price_cents, drop.currency)} -> "
+            f"{format_price(drop.price_cents, drop.currency)} "
+            f"{drop.currency or ''} (-{drop.drop_percent:.0f}%, {drop.airline}, "
+            f"previous search {drop.previous_searched_at:%Y-%m-%d %H:%M})"
+        )
+
+    print("\n", "-" * 80)
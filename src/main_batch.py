@@ -0,0 +1,152 @@
+"""
+main_batch.py
+
+This module runs a batch of flight searches read from a CSV or JSONL file.
+Each provider result is appended to a JSONL output file as soon as it completes, and
+the flights can also be exported to a Parquet, Arrow IPC or JSONL fare dataset.
+Searched fares are recorded in the fare history (`FARE_STORE_PATH`).
+
+Usage:
+    poetry run python -m src.main_batch queries.csv results.jsonl --concurrency kayak=1
+"""
+
+import argparse
+import asyncio
+from contextlib import ExitStack, nullcontext
+
+from src.constants import (
+    BATCH_QUEUE_SIZE,
+    BROWSER_POOL_SIZE,
+    FARE_STORE_PATH,
+    METRICS_HOST,
+    METRICS_PORT,
+    PROVIDER_TIMEOUT_SECONDS,
+    RESULT_CACHE_TTL_SECONDS,
+)
+from src.lib.batch import (
+    format_result_summary,
+    jsonl_result_sink,
+    parse_concurrency,
+    read_flight_queries,
+    run_batch,
+)
+from src.lib.browser_pool import BrowserPool
+from src.lib.export import EXPORT_FORMATS, fare_export_sink, open_fare_writer
+from src.lib.fare_store import FareStore, fare_store_sink
+from src.lib.instrumentation import metrics_recorder, serve_metrics
+from src.lib.result_cache import ResultCache
+from src.typings import ProviderRunResult
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the batch command line arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description="Run a batch of flight searches.")
+    parser.add_argument("queries", help="CSV or JSONL file with flight queries")
+    parser.add_argument("output", help="JSONL file the results are appended to")
+    parser.add_argument(
+        "--concurrency",
+        action="append",
+        default=[],
+        metavar="PROVIDER=LIMIT",
+        help="Concurrent agents for a provider, e.g. google_flights=4",
+    )
+    parser.add_argument("--queue-size", type=int, default=BATCH_QUEUE_SIZE)
+    parser.add_argument("--timeout", type=float, default=PROVIDER_TIMEOUT_SECONDS)
+    parser.add_argument(
+        "--browser-pool-size",
+        type=int,
+        default=BROWSER_POOL_SIZE,
+        help="Warm browsers shared by all agents; 0 launches one browser per search",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="PATH",
+        help="Dataset directory (or JSONL file) the normalized flights are exported to",
+    )
+    parser.add_argument("--export-format", choices=EXPORT_FORMATS, default="parquet")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=METRICS_PORT,
+        help="Serve Prometheus metrics on this port while the batch runs; 0 disables",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    """
+    Main function to run a batch of flight searches.
+
+    Parameters:
+    None
+
+    Returns:
+    None
+    """
+
+    args = parse_args()
+    concurrency = parse_concurrency(args.concurrency)
+
+    browser_pool = (
+        BrowserPool(size=args.browser_pool_size) if args.browser_pool_size else None
+    )
+    result_cache = ResultCache() if RESULT_CACHE_TTL_SECONDS > 0 else None
+    metrics_server = (
+        await serve_metrics(METRICS_HOST, args.metrics_port)
+        if args.metrics_port
+        else None
+    )
+
+    with ExitStack() as stack:
+        output_file = stack.enter_context(open(args.output, "a", encoding="utf-8"))
+        write_result = jsonl_result_sink(output_file)
+        export_result = (
+            fare_export_sink(
+                stack.enter_context(open_fare_writer(args.export, args.export_format))
+            )
+            if args.export
+            else None
+        )
+        store_result = (
+            fare_store_sink(stack.enter_context(FareStore()))
+            if FARE_STORE_PATH
+            else None
+        )
+
+        def sink(provider_result: ProviderRunResult) -> None:
+            write_result(provider_result)
+            if export_result:
+                export_result(provider_result)
+            if store_result:
+                store_result(provider_result)
+            print(format_result_summary(provider_result), flush=True)
+
+        async with browser_pool or nullcontext():
+            await run_batch(
+                read_flight_queries(args.queries),
+                sink,
+                concurrency=concurrency,
+                queue_size=args.queue_size,
+                timeout=args.timeout,
+                browser_pool=browser_pool,
+                result_cache=result_cache,
+            )
+
+    if result_cache:
+        print(f"Result cache: {result_cache.stats()}")
+        result_cache.close()
+
+    if metrics_server:
+        metrics_server.close()
+        await metrics_server.wait_closed()
+    metrics_recorder.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
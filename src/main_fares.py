@@ -0,0 +1,99 @@
+"""
+main_fares.py
+
+This module queries the fare history recorded by the searches (`FARE_STORE_PATH`):
+the cheapest fare of a route over time, and the searches whose cheapest fare dropped
+since the previous search of the same date and provider.
+
+Usage:
+    poetry run python -m src.main_fares trend SFO-JFK --date 2025-10-10 --days 30
+    poetry run python -m src.main_fares drops SFO-JFK --min-drop 10
+"""
+
+import argparse
+import time
+
+from src.constants import FARE_STORE_PATH
+from src.lib.fare_store import FareStore
+from src.lib.utils import print_fare_trend, print_price_drops
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the fare history command line arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description="Query the recorded fare history.")
+    parser.add_argument("--store", default=FARE_STORE_PATH, help="Fare history file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    trend = commands.add_parser("trend", help="Cheapest fare of a route over time")
+    drops = commands.add_parser("drops", help="Searches whose cheapest fare dropped")
+    for command in (trend, drops):
+        command.add_argument(
+            "route", help="Route as DEPARTURE-DESTINATION, e.g. SFO-JFK"
+        )
+        command.add_argument("--date", help="Departure date in YYYY-MM-DD format")
+        command.add_argument(
+            "--return-date", help="Return date of round trips; one-way by default"
+        )
+        command.add_argument("--provider", help="Only fares of this provider")
+        command.add_argument(
+            "--days", type=float, help="Only searches of the last DAYS days"
+        )
+
+    trend.add_argument("--airline", help="Only fares of this airline")
+    trend.add_argument(
+        "--bucket-hours", type=float, default=24, help="Hours covered by each line"
+    )
+    drops.add_argument(
+        "--min-drop", type=float, default=0, help="Smallest drop reported, in percent"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """
+    Main function to print a fare trend or the price drops of a route.
+
+    Parameters:
+    None
+
+    Returns:
+    None
+    """
+
+    args = parse_args()
+    since = time.time() - args.days * 86400 if args.days else None
+
+    with FareStore(args.store) as fare_store:
+        if args.command == "trend":
+            print_fare_trend(
+                fare_store.cheapest_fares(
+                    args.route,
+                    args.date,
+                    args.return_date,
+                    since=since,
+                    bucket_seconds=args.bucket_hours * 3600,
+                    provider=args.provider,
+                    airline=args.airline,
+                )
+            )
+        else:
+            print_price_drops(
+                fare_store.price_drops(
+                    args.route,
+                    args.date,
+                    args.return_date,
+                    since=since,
+                    min_drop_percent=args.min_drop,
+                    provider=args.provider,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
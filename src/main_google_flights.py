@@ -1,61 +1,58 @@
 """
 main_google_flights.py
 
-This module performs a Google Flights search using an asynchronous agent.
+This module performs a Google Flights search using an asynchronous agent, built from the
+`google_flights` provider (`src/providers/`).
 """
 
-import asyncio
+from typing import TYPE_CHECKING
 
-from browser_use import Agent, Controller
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from src.lib.providers import get_provider
 
-from src.constants import OPENAPI_MODEL_NAME
-from src.lib.google_flights import google_flights_build_url
-from src.tasks.google_flights_task import get_google_flights_task
-from src.typings import GoogleControllerOutput
-
-# Load environment variables from .env
-load_dotenv(override=True)
+if TYPE_CHECKING:
+    from browser_use import Agent
+    from browser_use.browser.context import BrowserContext
+    from langchain_core.language_models import BaseChatModel
 
 
 async def google_flights_search_agent(
-    departure: str, destination: str, date: str, return_date: str = None
-) -> Agent | None:
+    departure: str,
+    destination: str,
+    date: str,
+    return_date: str = None,
+    browser_context: "BrowserContext | None" = None,
+    llm: "BaseChatModel | None" = None,
+    page_extraction_llm: "BaseChatModel | None" = None,
+) -> "Agent | None":
     """
     Perform a Google Flights search using an asynchronous agent.
 
+    Only the agent is built here; the browser is not launched until the agent runs,
+    and pacing against Google is left to `src.lib.politeness`.
+
     Parameters:
     departure (str): The departure location.
     destination (str): The destination location.
     date (str): The departure date.
     return_date (str, optional): The return date. Defaults to None.
+    browser_context (BrowserContext, optional): A pooled browser context to run in.
+        Defaults to None, which makes the agent launch and close its own browser.
+    llm (BaseChatModel, optional): The chat model driving the agent.
+        Defaults to None, which uses the shared `AGENT_LLM` model.
+    page_extraction_llm (BaseChatModel, optional): The chat model for page content
+        extraction steps. Defaults to None, which uses the shared
+        `PAGE_EXTRACTION_LLM` model when configured and the agent's LLM otherwise.
 
     Returns:
     Agent | None: The Google Flights search agent or None if an error occurs.
     """
 
-    google_flights_url = google_flights_build_url(
-        departure, destination, date, return_date
+    return await get_provider("google_flights").build_agent(
+        departure,
+        destination,
+        date,
+        return_date,
+        browser_context=browser_context,
+        llm=llm,
+        page_extraction_llm=page_extraction_llm,
     )
-    google_flights_task_description = get_google_flights_task(
-        google_flights_url, departure, destination
-    )
-
-    controller = Controller(output_model=GoogleControllerOutput)
-
-    try:
-        google_flights_agent = Agent(
-            task=google_flights_task_description,
-            llm=ChatOpenAI(model=OPENAPI_MODEL_NAME),
-            controller=controller,
-        )
-        return google_flights_agent
-    except asyncio.TimeoutError:
-        print("ERROR: Flight search took too long and timed out.")
-        return None
-    except Exception as e:
-        print(f"ERROR: {e}")
-        return None
-    finally:
-        await asyncio.sleep(5)
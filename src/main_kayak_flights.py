@@ -1,60 +1,58 @@
 """
 main_kayak_flights.py
 
-This module performs a Kayak Flights search using an asynchronous agent.
+This module performs a Kayak search using an asynchronous agent, built from the
+`kayak` provider (`src/providers/`).
 """
 
-import asyncio
+from typing import TYPE_CHECKING
 
-from browser_use import Agent, Controller
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from src.lib.providers import get_provider
 
-from src.constants import OPENAPI_MODEL_NAME
-from src.lib.kayak_flights import kayak_flights_build_url
-from src.tasks.kayak_flights_task import get_kayak_flights_task
-from src.typings import KayakControllerOutput
-
-# Load environment variables from .env
-load_dotenv(override=True)
+if TYPE_CHECKING:
+    from browser_use import Agent
+    from browser_use.browser.context import BrowserContext
+    from langchain_core.language_models import BaseChatModel
 
 
 async def kayak_flights_search_agent(
-    departure: str, destination: str, date: str, return_date: str = None
-) -> Agent | None:
+    departure: str,
+    destination: str,
+    date: str,
+    return_date: str = None,
+    browser_context: "BrowserContext | None" = None,
+    llm: "BaseChatModel | None" = None,
+    page_extraction_llm: "BaseChatModel | None" = None,
+) -> "Agent | None":
     """
     Creates an agent to search for flights on Kayak.
 
+    Construction returns immediately; any rate limiting for kayak.com happens
+    before the agent runs.
+
     Parameters:
     departure (str): The departure location.
     destination (str): The destination location.
     date (str): The departure date.
     return_date (str, optional): The return date. Defaults to None.
+    browser_context (BrowserContext, optional): A pooled browser context to run in.
+        Defaults to None, which makes the agent launch and close its own browser.
+    llm (BaseChatModel, optional): The chat model driving the agent.
+        Defaults to None, which uses the shared `AGENT_LLM` model.
+    page_extraction_llm (BaseChatModel, optional): The chat model for page content
+        extraction steps. Defaults to None, which uses the shared
+        `PAGE_EXTRACTION_LLM` model when configured and the agent's LLM otherwise.
 
     Returns:
     Agent | None: The agent configured to search for flights or None if an error occurs.
     """
 
-    kayak_flights_url = kayak_flights_build_url(
-        departure, destination, date, return_date
-    )
-    kayak_flights_task_description = get_kayak_flights_task(
-        kayak_flights_url, departure, destination
+    return await get_provider("kayak").build_agent(
+        departure,
+        destination,
+        date,
+        return_date,
+        browser_context=browser_context,
+        llm=llm,
+        page_extraction_llm=page_extraction_llm,
     )
-    controller = Controller(output_model=KayakControllerOutput)
-
-    try:
-        kayak_flights_agent = Agent(
-            task=kayak_flights_task_description,
-            llm=ChatOpenAI(model=OPENAPI_MODEL_NAME),
-            controller=controller,
-        )
-        return kayak_flights_agent
-    except asyncio.TimeoutError:
-        print("ERROR: Flight search took too long and timed out.")
-        return None
-    except Exception as e:
-        print(f"ERROR: {e}")
-        return None
-    finally:
-        await asyncio.sleep(5)
@@ -0,0 +1,117 @@
+"""
+main_service.py
+
+This module runs the flight search service: a long-running HTTP API that queues
+submitted searches and runs them on a fixed number of workers. The browser pool, the
+result cache and the shared LLM clients (`src/lib/llm.py`) are created once at
+startup and stay warm across requests, so a search pays neither Python imports nor
+browser launches. Searched fares are recorded in the fare history (`FARE_STORE_PATH`).
+
+Usage:
+    poetry run python -m src.main_service --port 8080 --workers 2
+
+    curl -X POST localhost:8080/searches \
+        -d '{"departure": "SFO", "destination": "JFK", "date": "2025-10-10"}'
+    curl localhost:8080/searches/<job_id>/result
+"""
+
+import argparse
+import asyncio
+from contextlib import nullcontext
+
+from src.constants import (
+    BROWSER_POOL_SIZE,
+    FARE_STORE_PATH,
+    PROVIDER_TIMEOUT_SECONDS,
+    RESULT_CACHE_TTL_SECONDS,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_WORKERS,
+)
+from src.lib.browser_pool import BrowserPool
+from src.lib.fare_store import FareStore
+from src.lib.instrumentation import metrics_recorder
+from src.lib.llm import get_agent_llm, get_page_extraction_llm
+from src.lib.result_cache import ResultCache
+from src.lib.search_jobs import SearchJobQueue
+from src.lib.search_service import serve_search_service
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the service command line arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description="Run the flight search service.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SERVICE_WORKERS,
+        help="Searches run concurrently, each against every provider",
+    )
+    parser.add_argument("--timeout", type=float, default=PROVIDER_TIMEOUT_SECONDS)
+    parser.add_argument(
+        "--browser-pool-size",
+        type=int,
+        default=BROWSER_POOL_SIZE,
+        help="Warm browsers shared by all searches; 0 launches one browser per search",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    """
+    Main function to run the flight search service until interrupted.
+
+    Parameters:
+    None
+
+    Returns:
+    None
+    """
+
+    args = parse_args()
+
+    browser_pool = (
+        BrowserPool(size=args.browser_pool_size) if args.browser_pool_size else None
+    )
+    result_cache = ResultCache() if RESULT_CACHE_TTL_SECONDS > 0 else None
+    fare_store = FareStore() if FARE_STORE_PATH else None
+
+    # Build the shared LLM clients before the first search
+    get_agent_llm()
+    get_page_extraction_llm()
+
+    try:
+        async with browser_pool or nullcontext():
+            async with SearchJobQueue(
+                args.workers,
+                timeout=args.timeout,
+                browser_pool=browser_pool,
+                result_cache=result_cache,
+                fare_store=fare_store,
+            ) as job_queue:
+                runner = await serve_search_service(job_queue, args.host, args.port)
+                print(f"Serving flight searches on http://{args.host}:{args.port}")
+                try:
+                    await asyncio.Event().wait()
+                finally:
+                    await runner.cleanup()
+    finally:
+        if result_cache:
+            result_cache.close()
+        if fare_store:
+            fare_store.close()
+        metrics_recorder.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,129 @@
+"""
+main_sweep.py
+
+This module searches a window of departure dates, and optionally several trip lengths,
+on every provider and prints the cheapest price of each date as a price matrix.
+Searched fares are recorded in the fare history (`FARE_STORE_PATH`).
+
+Usage:
+    poetry run python -m src.main_sweep SFO JFK 2025-10-10 --flex-days 7
+    poetry run python -m src.main_sweep SFO JFK 2025-10-10 --trip-length 5 --trip-length 7
+"""
+
+import argparse
+import asyncio
+from contextlib import nullcontext
+
+from src.constants import (
+    BROWSER_POOL_SIZE,
+    FARE_STORE_PATH,
+    PROVIDER_TIMEOUT_SECONDS,
+    RESULT_CACHE_TTL_SECONDS,
+    SWEEP_FLEX_DAYS,
+)
+from src.lib.batch import format_result_summary, parse_concurrency
+from src.lib.browser_pool import BrowserPool
+from src.lib.fare_store import record_results
+from src.lib.instrumentation import metrics_recorder
+from src.lib.result_cache import ResultCache
+from src.lib.sweep import build_price_matrix, run_sweep
+from src.lib.utils import print_price_matrix
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the sweep command line arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description="Search a window of flight dates.")
+    parser.add_argument("departure", help="Departure airport code, e.g. SFO")
+    parser.add_argument("destination", help="Destination airport code, e.g. JFK")
+    parser.add_argument("date", help="Center departure date in YYYY-MM-DD format")
+    parser.add_argument(
+        "--flex-days",
+        type=int,
+        default=SWEEP_FLEX_DAYS,
+        help="Days searched on each side of the date",
+    )
+    parser.add_argument(
+        "--trip-length",
+        action="append",
+        type=int,
+        default=[],
+        metavar="NIGHTS",
+        help="Search round trips of this many nights; repeat for several lengths",
+    )
+    parser.add_argument(
+        "--no-flexible-views",
+        action="store_true",
+        help="Search every date on its own instead of reading flexible-dates views",
+    )
+    parser.add_argument(
+        "--concurrency",
+        action="append",
+        default=[],
+        metavar="PROVIDER=LIMIT",
+        help="Concurrent agents for a provider, e.g. google_flights=4",
+    )
+    parser.add_argument("--timeout", type=float, default=PROVIDER_TIMEOUT_SECONDS)
+    parser.add_argument(
+        "--browser-pool-size",
+        type=int,
+        default=BROWSER_POOL_SIZE,
+        help="Warm browsers shared by all agents; 0 launches one browser per search",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    """
+    Main function to run a date sweep and print its price matrix.
+
+    Parameters:
+    None
+
+    Returns:
+    None
+    """
+
+    args = parse_args()
+
+    browser_pool = (
+        BrowserPool(size=args.browser_pool_size) if args.browser_pool_size else None
+    )
+    result_cache = ResultCache() if RESULT_CACHE_TTL_SECONDS > 0 else None
+
+    try:
+        async with browser_pool or nullcontext():
+            prices, run_results = await run_sweep(
+                args.departure,
+                args.destination,
+                args.date,
+                args.flex_days,
+                args.trip_length,
+                concurrency=parse_concurrency(args.concurrency),
+                use_flexible_views=not args.no_flexible_views,
+                timeout=args.timeout,
+                browser_pool=browser_pool,
+                result_cache=result_cache,
+            )
+    finally:
+        if result_cache:
+            result_cache.close()
+        metrics_recorder.close()
+
+    # Record the searched fares in the fare history
+    if FARE_STORE_PATH:
+        record_results(run_results)
+
+    for run_result in run_results:
+        print(format_result_summary(run_result))
+
+    print_price_matrix(build_price_matrix(prices))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
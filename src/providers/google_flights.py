@@ -0,0 +1,58 @@
+"""
+google_flights.py
+
+This module registers the Google Flights provider: results pages searched by URL, read
+by the DOM extractor or an agent into `GoogleControllerOutput`.
+"""
+
+from urllib.parse import urlsplit
+
+from src.constants import (
+    GOOGLE_FLIGHTS_BASE_URL,
+    GOOGLE_FLIGHTS_DOMAIN,
+    HEADLESS_WINDOW_SIZE,
+    POLITENESS_MIN_INTERVAL_SECONDS,
+    PROVIDER_CONCURRENCY,
+    PROVIDER_MAX_STEPS,
+    PROVIDER_RETRY_ATTEMPTS,
+)
+from src.lib.flight_records import normalize_google_flights
+from src.lib.google_flights import google_flights_build_url
+from src.lib.google_flights_extractor import (
+    GOOGLE_FLIGHTS_RESULT_COUNT_SELECTOR,
+    extract_google_flights,
+)
+from src.lib.providers import Provider, register_provider
+from src.lib.resilience import RetryPolicy
+from src.lib.resource_blocking import ResourceProfile
+from src.tasks.google_flights_task import get_google_flights_task
+from src.typings import GoogleControllerOutput
+
+GOOGLE_FLIGHTS_RESOURCE_PROFILE = ResourceProfile(
+    first_party_hosts=(
+        urlsplit(GOOGLE_FLIGHTS_BASE_URL).hostname,
+        "google.com",
+        "gstatic.com",
+    ),
+    headless_window_size=tuple(HEADLESS_WINDOW_SIZE) or None,
+)
+
+GOOGLE_FLIGHTS = register_provider(
+    Provider(
+        name="google_flights",
+        domain=GOOGLE_FLIGHTS_DOMAIN,
+        build_url=google_flights_build_url,
+        build_task=get_google_flights_task,
+        output_model=GoogleControllerOutput,
+        normalize=normalize_google_flights,
+        extractor=extract_google_flights,
+        result_count_selector=GOOGLE_FLIGHTS_RESULT_COUNT_SELECTOR,
+        max_steps=PROVIDER_MAX_STEPS["google_flights"],
+        concurrency=PROVIDER_CONCURRENCY["google_flights"],
+        min_interval_seconds=POLITENESS_MIN_INTERVAL_SECONDS[GOOGLE_FLIGHTS_DOMAIN],
+        retry_policy=RetryPolicy(
+            max_attempts=PROVIDER_RETRY_ATTEMPTS["google_flights"]
+        ),
+        resource_profile=GOOGLE_FLIGHTS_RESOURCE_PROFILE,
+    )
+)
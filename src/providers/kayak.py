@@ -0,0 +1,78 @@
+"""
+kayak.py
+
+This module registers the Kayak providers: results pages searched by URL, read by the
+DOM extractor or an agent into `KayakControllerOutput`, and the flexible-dates price
+grid that date sweeps read into `PriceCalendarOutput` instead of searching every date.
+"""
+
+from functools import partial
+from urllib.parse import urlsplit
+
+from src.constants import (
+    HEADLESS_WINDOW_SIZE,
+    KAYAK_FLEXIBLE_DAYS,
+    KAYAK_FLIGHTS_BASE_URL,
+    KAYAK_FLIGHTS_DOMAIN,
+    POLITENESS_MIN_INTERVAL_SECONDS,
+    PROVIDER_CONCURRENCY,
+    PROVIDER_MAX_STEPS,
+    PROVIDER_RETRY_ATTEMPTS,
+)
+from src.lib.flight_records import normalize_kayak_flights
+from src.lib.kayak_flights import kayak_flights_build_url
+from src.lib.kayak_flights_extractor import (
+    KAYAK_FLIGHTS_RESULT_COUNT_SELECTOR,
+    extract_kayak_flights,
+)
+from src.lib.providers import Provider, register_provider
+from src.lib.resilience import RetryPolicy
+from src.lib.resource_blocking import ResourceProfile
+from src.tasks.kayak_flexible_dates_task import get_kayak_flexible_dates_task
+from src.tasks.kayak_flights_task import get_kayak_flights_task
+from src.typings import KayakControllerOutput, PriceCalendarOutput
+
+KAYAK_RESOURCE_PROFILE = ResourceProfile(
+    first_party_hosts=(
+        urlsplit(KAYAK_FLIGHTS_BASE_URL).hostname,
+        "kayak.com",
+        "r9cdn.net",
+    ),
+    headless_window_size=tuple(HEADLESS_WINDOW_SIZE) or None,
+)
+
+KAYAK = register_provider(
+    Provider(
+        name="kayak",
+        domain=KAYAK_FLIGHTS_DOMAIN,
+        build_url=kayak_flights_build_url,
+        build_task=get_kayak_flights_task,
+        output_model=KayakControllerOutput,
+        normalize=normalize_kayak_flights,
+        extractor=extract_kayak_flights,
+        result_count_selector=KAYAK_FLIGHTS_RESULT_COUNT_SELECTOR,
+        max_steps=PROVIDER_MAX_STEPS["kayak"],
+        concurrency=PROVIDER_CONCURRENCY["kayak"],
+        min_interval_seconds=POLITENESS_MIN_INTERVAL_SECONDS[KAYAK_FLIGHTS_DOMAIN],
+        retry_policy=RetryPolicy(max_attempts=PROVIDER_RETRY_ATTEMPTS["kayak"]),
+        flexible_dates="kayak_flexible_dates" if KAYAK_FLEXIBLE_DAYS else None,
+        flexible_days=KAYAK_FLEXIBLE_DAYS,
+        resource_profile=KAYAK_RESOURCE_PROFILE,
+    )
+)
+
+KAYAK_FLEXIBLE_DATES = register_provider(
+    Provider(
+        name="kayak_flexible_dates",
+        domain=KAYAK_FLIGHTS_DOMAIN,
+        build_url=partial(kayak_flights_build_url, flexible_days=KAYAK_FLEXIBLE_DAYS),
+        build_task=get_kayak_flexible_dates_task,
+        output_model=PriceCalendarOutput,
+        max_steps=PROVIDER_MAX_STEPS["kayak"],
+        concurrency=PROVIDER_CONCURRENCY["kayak"],
+        min_interval_seconds=POLITENESS_MIN_INTERVAL_SECONDS[KAYAK_FLIGHTS_DOMAIN],
+        retry_policy=RetryPolicy(max_attempts=PROVIDER_RETRY_ATTEMPTS["kayak"]),
+        resource_profile=KAYAK_RESOURCE_PROFILE,
+        is_searched_by_default=False,
+    )
+)
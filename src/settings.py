@@ -0,0 +1,264 @@
+"""
+settings.py
+
+This module loads the configuration once into a typed, immutable `Settings` object.
+The `.env` file is loaded a single time, on the first `get_settings()` call, and
+every setting is parsed from the environment variable named after it in upper case.
+Lists are read as separated values, and booleans are true when set to `true`.
+"""
+
+import os
+import types
+import typing
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from functools import cache
+
+from dotenv import load_dotenv
+
+PROMPT_MODES = ("full", "compact", "structured")
+HISTORY_POLICIES = ("none", "summary", "full")
+
+
+def separated(default: tuple, separator: str = ","):
+    """
+    Declare a tuple setting read as separated values, empty values left out.
+
+    Args:
+        default (tuple): The default value.
+        separator (str): The separator between values.
+
+    Returns:
+        The dataclass field.
+    """
+
+    return field(default=default, metadata={"separator": separator})
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Represents the configuration of every entry point, read from the environment.
+    """
+
+    # OpenAI API key and LLM model name
+    openai_api_key: str | None = None
+    openapi_model_name: str = "gpt-4o-mini"
+
+    # OLLAMA model name
+    ollama_model_name: str = "phi4:latest"
+    ollama_base_url: str = "http://localhost:11434"
+    ollama_temperature: float = 0.1
+    ollama_keep_alive: str = "30m"
+
+    # LLMs as `backend:model` (model defaults to the backend's model name above): the
+    # agent LLM (`openai:` with the OpenAI model name when unset), and an optional
+    # cheaper one for page content extraction steps
+    agent_llm: str | None = None
+    page_extraction_llm: str = ""
+
+    # Keep-alive HTTP connections shared by every LLM client of a backend
+    llm_max_connections: int = 20
+    llm_keepalive_seconds: float = 60.0
+
+    # Seconds allowed for building and running a single provider agent
+    provider_timeout_seconds: float = 600.0
+
+    # Extra provider modules to import, each registering its providers
+    provider_modules: tuple[str, ...] = separated(())
+
+    # Provider search URLs, overridable to point the agents at a replay server
+    google_flights_base_url: str = "https://www.google.com/travel/flights"
+    kayak_flights_base_url: str = "https://www.kayak.com/flights"
+
+    # Minimum seconds between agent runs against the same provider domain
+    google_flights_min_interval_seconds: float = 5.0
+    kayak_flights_min_interval_seconds: float = 5.0
+
+    # Maximum concurrent browser agents per provider in batch mode
+    google_flights_concurrency: int = 2
+    kayak_flights_concurrency: int = 2
+
+    # Pending queries buffered per provider before its batch feeder waits
+    batch_queue_size: int = 10
+
+    # Date sweeps: days searched around the date, and days covered on each side by one
+    # Kayak flexible-dates page (Kayak allows 1 to 3; 0 searches every date on its own)
+    sweep_flex_days: int = 7
+    kayak_flexible_days: int = 3
+
+    # Search service: bind address, concurrent searches, pending and retained jobs
+    service_host: str = "127.0.0.1"
+    service_port: int = 8080
+    service_workers: int = 2
+    service_queue_size: int = 100
+    service_max_jobs: int = 1000
+
+    # Browser pool: warm browsers kept alive and agent runs served before recycling
+    browser_pool_size: int = 4
+    browser_max_uses: int = 20
+    browser_headless: bool = False
+
+    # Lightweight page loading in agent browser contexts: block images, media, fonts,
+    # ads, trackers and third-party scripts, and size headless viewports as
+    # "WIDTHxHEIGHT" (empty keeps the browser-use default)
+    resource_blocking_enabled: bool = True
+    headless_window_size: tuple[int, ...] = separated((1280, 800), "x")
+
+    # Result cache: SQLite file, freshness of cached fares (0 disables) and LRU bound
+    result_cache_path: str = ".cache/results.sqlite3"
+    result_cache_ttl_seconds: float = 900.0
+    result_cache_max_entries: int = 10000
+
+    # LLM response cache: SQLite file, LRU bound, and the step types whose LLM calls
+    # are cached (`agent` planning calls, `extraction` page content calls; empty
+    # disables)
+    llm_cache_path: str = ".cache/llm.sqlite3"
+    llm_cache_max_entries: int = 50000
+    llm_cache_step_types: tuple[str, ...] = separated(("agent", "extraction"))
+
+    # Coalesce concurrent searches for an identical query into a single run
+    search_coalescing_enabled: bool = True
+
+    # DOM extraction fast path: try selectors before falling back to the LLM agent
+    dom_extraction_enabled: bool = True
+    dom_extraction_timeout_seconds: float = 20.0
+
+    # Attempts per provider run: failed or stalled agent runs are resumed from their
+    # last step after an exponential backoff with jitter
+    google_flights_retry_attempts: int = 3
+    kayak_flights_retry_attempts: int = 3
+    retry_base_delay_seconds: float = 2.0
+    retry_max_delay_seconds: float = 30.0
+
+    # Consecutive failed runs before a provider domain is skipped (0 disables), and
+    # seconds before a trial run is let through again
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 300.0
+
+    # Agent step budgets, and early completion once the result list stops growing
+    google_flights_max_steps: int = 25
+    kayak_flights_max_steps: int = 25
+    completion_detection_enabled: bool = True
+    completion_stable_steps: int = 2
+
+    # Output format embedded in task prompts: full, compact or structured
+    prompt_mode: str = "compact"
+
+    # Fare export: records buffered per route/date partition before a columnar write
+    export_batch_size: int = 10000
+
+    # Fare history: SQLite file every searched fare is recorded in (empty disables),
+    # and fares buffered before a bulk insert
+    fare_store_path: str = "data/fares.sqlite3"
+    fare_store_batch_size: int = 5000
+
+    # Streamed flight batches of `main.py`: JSONL file (empty disables)
+    stream_jsonl_path: str = ""
+
+    # Agent history retention: `none` drops screenshots and DOM snapshots, `summary`
+    # spills them to the history directory, keeping the latest runs (0 keeps all),
+    # `full` keeps them in memory (and renders the run GIF)
+    history_policy: str = "summary"
+    history_dir: str = ".cache/history"
+    history_max_runs: int = 50
+
+    # Rotating log of agent thoughts and action results (empty disables)
+    agent_log_path: str = "logs/agent.log"
+    agent_log_max_bytes: int = 10 * 1024 * 1024
+    agent_log_backup_count: int = 5
+
+    # Agent step metrics: JSONL file (empty disables) and Prometheus endpoint (0
+    # disables)
+    metrics_jsonl_path: str = ""
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 0
+
+    def __post_init__(self):
+        if self.prompt_mode not in PROMPT_MODES:
+            raise ValueError(
+                f"PROMPT_MODE={self.prompt_mode!r} is not one of "
+                f"{', '.join(PROMPT_MODES)}"
+            )
+        if self.history_policy not in HISTORY_POLICIES:
+            raise ValueError(
+                f"HISTORY_POLICY={self.history_policy!r} is not one of "
+                f"{', '.join(HISTORY_POLICIES)}"
+            )
+        if self.agent_llm is None:
+            object.__setattr__(self, "agent_llm", f"openai:{self.openapi_model_name}")
+
+    @classmethod
+    def from_environ(cls, environ: Mapping[str, str]) -> "Settings":
+        """
+        Parse the settings set in an environment, the others keeping their defaults.
+
+        Args:
+            environ (Mapping[str, str]): The environment variables.
+
+        Returns:
+            Settings: The settings.
+
+        Raises:
+            ValueError: When a setting is not a valid value of its type, or not one
+                of its allowed values.
+        """
+
+        types_by_name = typing.get_type_hints(cls)
+        values = {}
+        for setting in fields(cls):
+            value = environ.get(setting.name.upper())
+            if value is None:
+                continue
+            setting_type = types_by_name[setting.name]
+            if isinstance(setting_type, types.UnionType):
+                # Optional settings are parsed as their non-None type
+                (setting_type,) = set(typing.get_args(setting_type)) - {type(None)}
+            try:
+                values[setting.name] = parse_value(
+                    value, setting_type, setting.metadata.get("separator", ",")
+                )
+            except ValueError as error:
+                raise ValueError(
+                    f"{setting.name.upper()}={value!r} is not a valid "
+                    f"{getattr(setting_type, '__name__', setting_type)}"
+                ) from error
+        return cls(**values)
+
+
+def parse_value(value: str, value_type: type, separator: str):
+    """
+    Parse an environment variable value as a setting type.
+
+    Args:
+        value (str): The environment variable value.
+        value_type (type): The setting type.
+        separator (str): The separator between the values of a tuple setting.
+
+    Returns:
+        The parsed value.
+    """
+
+    if typing.get_origin(value_type) is tuple:
+        item_type = typing.get_args(value_type)[0]
+        return tuple(
+            parse_value(item.strip(), item_type, separator)
+            for item in value.split(separator)
+            if item.strip()
+        )
+    if value_type is bool:
+        return value.lower() == "true"
+    return value_type(value)
+
+
+@cache
+def get_settings() -> Settings:
+    """
+    Load the `.env` file and the settings, once per process.
+
+    Returns:
+        Settings: The settings.
+    """
+
+    load_dotenv(override=True)
+    return Settings.from_environ(os.environ)
@@ -0,0 +1,46 @@
+"""
+flight_search_task.py
+
+This module provides the task description shared by every flight results page search.
+Providers differ only in the site name, the URL and the output format, so each
+provider's task module renders this one template with its own example and model.
+"""
+
+from pydantic import BaseModel
+
+from src.lib.prompt_schema import render_output_example
+
+
+def render_flight_search_task(
+    site_name: str,
+    url: str,
+    departure: str,
+    destination: str,
+    full_example: dict,
+    output_model: type[BaseModel],
+    prompt_mode: str,
+) -> str:
+    """
+    Render the task description for searching flights on a results page.
+
+    Args:
+        site_name (str): The site shown to the agent, e.g. `Kayak Flights`.
+        url (str): The search URL.
+        departure (str): Departure airport code.
+        destination (str): Destination airport code.
+        full_example (dict): The predefined JSON example used in `full` prompt mode.
+        output_model (type[BaseModel]): The provider's controller output model.
+        prompt_mode (str): `full`, `compact` or `structured`.
+
+    Returns:
+        str: Formatted task description.
+    """
+
+    return (
+        f"- Visit {site_name} at {url} and wait for the flight search results to fully load.\n"
+        "- Extract all the flights scrollable on the page, asking for them in the JSON "
+        "output format below.\n"
+        f"- With the extracted data, please provide the best JSON output grouped by airline "
+        f"(extend JSON output with `route` attribute and value `{departure}-{destination}`)"
+        f"{render_output_example(prompt_mode, full_example, output_model)}"
+    )
@@ -2,16 +2,24 @@
 google_flights_task.py
 
 This module provides a function to create a formatted task description for searching flights on Google.
-It uses a predefined JSON schema for the output format.
+In `full` prompt mode it embeds the predefined JSON example for the output format, in `compact`
+mode a minimal example derived from `GoogleControllerOutput`, and in `structured` mode no example at
+all, relying on the controller's structured `done` output. Rendered tasks are cached.
 """
 
-import json
+from functools import lru_cache
 
-from src.constants import GOOGLE_FLIGHT_SEARCH_JSON_SCHEMA
+from src.constants import GOOGLE_FLIGHT_SEARCH_JSON_SCHEMA, PROMPT_MODE
+from src.tasks.flight_search_task import render_flight_search_task
+from src.typings import GoogleControllerOutput
 
 
+@lru_cache(maxsize=1024)
 def get_google_flights_task(
-    google_flights_url: str, departure: str, destination: str
+    google_flights_url: str,
+    departure: str,
+    destination: str,
+    prompt_mode: str = PROMPT_MODE,
 ) -> str:
     """
     Generates a task description for searching flights on Google Flights.
@@ -20,17 +28,20 @@ def get_google_flights_task(
         google_flights_url (str): The URL to search on Google Flights.
         departure (str): The departure location.
         destination (str): The destination location.
+        prompt_mode (str, optional): `full`, `compact` or `structured`. Defaults to PROMPT_MODE.
 
     Returns:
         str: Formatted task description.
     """
 
-    task_description = (
-        f"- Visit Google Flights at {google_flights_url} and wait for the flight search results to fully load.\n"
-        "- Extract all the flights scrollable on the page.\n"
-        f"- With the extracted data, please provide the best JSON output grouped by airline "
-        f"(extend JSON output with `route` attribute and value `{departure}-{destination}`):\n\n"
-        f"{json.dumps(GOOGLE_FLIGHT_SEARCH_JSON_SCHEMA, indent=4)}\n"
+    task_description = render_flight_search_task(
+        "Google Flights",
+        google_flights_url,
+        departure,
+        destination,
+        GOOGLE_FLIGHT_SEARCH_JSON_SCHEMA,
+        GoogleControllerOutput,
+        prompt_mode,
     )
 
     return task_description
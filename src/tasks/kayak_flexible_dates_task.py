@@ -0,0 +1,44 @@
+"""
+kayak_flexible_dates_task.py
+
+This module provides a function to create a formatted task description for reading the
+flexible-dates price grid of a Kayak search, which lists the cheapest fare of every
+departure date around the searched one on a single page. Rendered tasks are cached.
+"""
+
+from functools import lru_cache
+
+from src.constants import KAYAK_FLEXIBLE_DATES_JSON_SCHEMA, PROMPT_MODE
+from src.lib.prompt_schema import render_output_example
+from src.typings import PriceCalendarOutput
+
+
+@lru_cache(maxsize=1024)
+def get_kayak_flexible_dates_task(
+    kayak_flights_url: str,
+    departure: str,
+    destination: str,
+    prompt_mode: str = PROMPT_MODE,
+) -> str:
+    """
+    Generate the task description for reading a Kayak flexible-dates price grid.
+
+    Args:
+        kayak_flights_url (str): The flexible-dates URL to search on Kayak.
+        departure (str): Departure airport code.
+        destination (str): Destination airport code.
+        prompt_mode (str, optional): `full`, `compact` or `structured`. Defaults to PROMPT_MODE.
+
+    Returns:
+        str: Formatted task description.
+    """
+
+    task_description = (
+        f"- Visit Kayak Flights at {kayak_flights_url} and wait for the flexible dates price grid to fully load.\n"
+        f"- Read the cheapest {departure}-{destination} price shown for every departure date in the grid; "
+        "do not open the individual flights.\n"
+        f"- With the extracted data, please provide the best JSON output with one entry per date in YYYY-MM-DD format"
+        f"{render_output_example(prompt_mode, KAYAK_FLEXIBLE_DATES_JSON_SCHEMA, PriceCalendarOutput)}"
+    )
+
+    return task_description
@@ -2,16 +2,24 @@
 katak_flights_task.py
 
 This module provides a function to create a formatted task description for searching flights on Kayak.
-It uses a predefined JSON schema for the output format.
+In `full` prompt mode it embeds the predefined JSON example for the output format, in `compact`
+mode a minimal example derived from `KayakControllerOutput`, and in `structured` mode no example at
+all, relying on the controller's structured `done` output. Rendered tasks are cached.
 """
 
-import json
+from functools import lru_cache
 
-from src.constants import KAYAK_FLIGHT_SEARCH_JSON_SCHEMA
+from src.constants import KAYAK_FLIGHT_SEARCH_JSON_SCHEMA, PROMPT_MODE
+from src.tasks.flight_search_task import render_flight_search_task
+from src.typings import KayakControllerOutput
 
 
+@lru_cache(maxsize=1024)
 def get_kayak_flights_task(
-    kayak_flights_url: str, departure: str, destination: str
+    kayak_flights_url: str,
+    departure: str,
+    destination: str,
+    prompt_mode: str = PROMPT_MODE,
 ) -> str:
     """
     Generate the task description for Kayak flights search.
@@ -20,17 +28,20 @@ def get_kayak_flights_task(
         kayak_flights_url (str): The URL to search on Kayak.
         departure (str): Departure airport code.
         destination (str): Destination airport code.
+        prompt_mode (str, optional): `full`, `compact` or `structured`. Defaults to PROMPT_MODE.
 
     Returns:
         str: Formatted task description.
     """
 
-    task_description = (
-        f"- Visit Kayak Flights at {kayak_flights_url} and wait for the flight search results to fully load.\n"
-        "- Extract all the flights scrollable on the page.\n"
-        f"- With the extracted data, please provide the best JSON output grouped by airline "
-        f"(extend JSON output with `route` attribute and value `{departure}-{destination}`):\n\n"
-        f"{json.dumps(KAYAK_FLIGHT_SEARCH_JSON_SCHEMA, indent=4)}\n"
+    task_description = render_flight_search_task(
+        "Kayak Flights",
+        kayak_flights_url,
+        departure,
+        destination,
+        KAYAK_FLIGHT_SEARCH_JSON_SCHEMA,
+        KayakControllerOutput,
+        prompt_mode,
     )
 
     return task_description
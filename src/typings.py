@@ -8,21 +8,23 @@ the data retrieved from these sources.
 
 from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class GoogleFlightDetails(BaseModel):
     """
     Represents the details of a flight from Google.
+
+    Field examples show the expected string formats and feed the compact task prompt.
     """
 
-    departure: str
-    arrival: str
-    duration: str
-    route: str
-    price: str
-    emissions: str
-    emissions_percent: str
+    departure: str = Field(examples=["10:33 PM"])
+    arrival: str = Field(examples=["7:10 AM +1"])
+    duration: str = Field(examples=["5 hr 37 min"])
+    route: str = Field(examples=["SFO-JFK"])
+    price: str = Field(examples=["$308"])
+    emissions: str = Field(examples=["583 kg CO2e"])
+    emissions_percent: str = Field(examples=["+59% emissions"])
 
 
 class GoogleAirline(BaseModel):
@@ -34,7 +36,7 @@ class GoogleAirline(BaseModel):
         flights (List[GoogleFlightDetails]): A list of flights operated by the airline.
     """
 
-    name: str
+    name: str = Field(examples=["American Airlines"])
     flights: List[GoogleFlightDetails]
 
 
@@ -52,14 +54,16 @@ class GoogleControllerOutput(BaseModel):
 class KayakFlightDetails(BaseModel):
     """
     Represents the details of a flight from Kayak.
+
+    Field examples show the expected string formats and feed the compact task prompt.
     """
 
-    departure: str
-    arrival: str
-    duration: str
-    route: str
-    price: str
-    cabin: str
+    departure: str = Field(examples=["10:33 pm"])
+    arrival: str = Field(examples=["7:10 am+1"])
+    duration: str = Field(examples=["5h 37m"])
+    route: str = Field(examples=["SFO-JFK"])
+    price: str = Field(examples=["$308"])
+    cabin: str = Field(examples=["Basic Economy"])
 
 
 class KayakAirline(BaseModel):
@@ -71,7 +75,7 @@ class KayakAirline(BaseModel):
         flights (List[KayakFlightDetails]): A list of flights operated by the airline.
     """
 
-    name: str
+    name: str = Field(examples=["American Airlines"])
     flights: List[KayakFlightDetails]
 
 
@@ -84,3 +88,185 @@ class KayakControllerOutput(BaseModel):
     """
 
     airlines: List[KayakAirline] = []
+
+
+class DatePrice(BaseModel):
+    """
+    Represents the cheapest price shown for one departure date in a price grid.
+    """
+
+    date: str = Field(examples=["2025-10-10"])
+    price: str = Field(examples=["$308"])
+
+
+class PriceCalendarOutput(BaseModel):
+    """
+    Represents the output from a flexible-dates price grid.
+
+    Attributes:
+        prices (List[DatePrice]): The cheapest price of each departure date shown.
+    """
+
+    prices: List[DatePrice] = []
+
+
+class FlightQuery(BaseModel):
+    """
+    Represents a single flight search query.
+
+    Attributes:
+        departure (str): The departure airport code.
+        destination (str): The destination airport code.
+        date (str): The departure date in YYYY-MM-DD format.
+        return_date (str | None): The return date in YYYY-MM-DD format, if any.
+    """
+
+    departure: str
+    destination: str
+    date: str
+    return_date: str | None = None
+
+
+class StepMetrics(BaseModel):
+    """
+    Represents the timing and token usage of a single agent step.
+
+    Attributes:
+        provider (str): The provider name.
+        step (int): The 1-based step number within the run.
+        started_at (float): Unix time the step started.
+        dom_seconds (float): Time spent reading and serializing the page state.
+        llm_seconds (float): Time spent waiting for the next action from the LLM.
+        action_seconds (float): Time spent executing the actions in the browser.
+        total_seconds (float): Wall time of the whole step.
+        prompt_tokens (int): Prompt tokens of every LLM call made during the step.
+        completion_tokens (int): Completion tokens of every LLM call made during the step.
+        llm_calls (int): LLM calls made during the step.
+        cached_llm_calls (int): LLM calls answered by the LLM response cache.
+        error (str | None): The step error, or None if the step succeeded.
+        is_done (bool): Whether the step completed the task.
+    """
+
+    provider: str
+    step: int
+    started_at: float
+    dom_seconds: float = 0.0
+    llm_seconds: float = 0.0
+    action_seconds: float = 0.0
+    total_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_calls: int = 0
+    cached_llm_calls: int = 0
+    error: str | None = None
+    is_done: bool = False
+
+
+class RunMetrics(BaseModel):
+    """
+    Represents the totals of the instrumented steps of one agent run.
+
+    Attributes:
+        provider (str): The provider name.
+        steps (int): Steps executed, i.e. the step count to completion when done.
+        failed_steps (int): Steps that ended with an error.
+        is_done (bool): Whether the agent completed the task.
+        dom_seconds (float): Total page state time.
+        llm_seconds (float): Total LLM time.
+        action_seconds (float): Total browser action time.
+        prompt_tokens (int): Total prompt tokens.
+        completion_tokens (int): Total completion tokens.
+        llm_calls (int): Total LLM calls.
+        cached_llm_calls (int): Total LLM calls answered by the LLM response cache.
+    """
+
+    provider: str
+    steps: int = 0
+    failed_steps: int = 0
+    is_done: bool = False
+    dom_seconds: float = 0.0
+    llm_seconds: float = 0.0
+    action_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_calls: int = 0
+    cached_llm_calls: int = 0
+
+
+class ProviderRunResult(BaseModel):
+    """
+    Represents the outcome of a single provider run in a concurrent search.
+
+    Attributes:
+        provider (str): The provider name, e.g. `google_flights` or `kayak`.
+        query (FlightQuery | None): The query that was searched, when known.
+        result (str | None): The result validated against the provider's output
+            model, or None if the run failed or its result did not validate.
+        error (str | None): The error that stopped the run, or None if it succeeded.
+        is_cached (bool): Whether the result was served from the result cache.
+        is_coalesced (bool): Whether the result was shared from a concurrent run of
+            the same query.
+        extraction_method (str | None): `dom` when the fast path extracted the page,
+            `agent` when the LLM agent did, or None when nothing ran.
+        attempts (int): Agent run attempts made; an attempt after the first resumes
+            the run from its last step. 0 when no agent ran.
+        is_circuit_open (bool): Whether the run was refused because the provider
+            domain's circuit breaker is open.
+        metrics (RunMetrics | None): Step totals of the LLM agent, when it ran.
+        elapsed_seconds (float): Wall time spent building and running the agent.
+    """
+
+    provider: str
+    query: FlightQuery | None = None
+    result: str | None = None
+    error: str | None = None
+    is_cached: bool = False
+    is_coalesced: bool = False
+    extraction_method: str | None = None
+    attempts: int = 0
+    is_circuit_open: bool = False
+    metrics: RunMetrics | None = None
+    elapsed_seconds: float
+
+    @property
+    def is_successful(self) -> bool:
+        """
+        Whether the provider run finished without an error.
+        """
+
+        return self.error is None
+
+
+class SearchJob(BaseModel):
+    """
+    Represents a flight search submitted to the search service.
+
+    Attributes:
+        job_id (str): The job identifier returned on submission.
+        query (FlightQuery): The query to search.
+        status (str): `queued`, `running`, `done` or `failed`.
+        submitted_at (float): Unix time the job was submitted.
+        started_at (float | None): Unix time a worker picked the job up.
+        finished_at (float | None): Unix time the job finished.
+        flights_found (int): Flights streamed so far by every provider.
+        results (list[ProviderRunResult]): One result per provider, once done.
+        error (str | None): The error that failed the whole job, if any.
+    """
+
+    job_id: str
+    query: FlightQuery
+    status: str = "queued"
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    flights_found: int = 0
+    results: list[ProviderRunResult] = []
+    error: str | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        Whether the job is done or failed.
+        """
+
+        return self.status in ("done", "failed")
@@ -0,0 +1,16 @@
+"""
+conftest.py
+
+This module configures the test suite. Tests run offline: the OpenAI key is a
+placeholder (no test calls the API), browser-use telemetry is off, and the result
+cache, fare history and agent log are disabled so no test writes outside its
+temporary directory.
+"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ["ANONYMIZED_TELEMETRY"] = "false"
+os.environ["RESULT_CACHE_TTL_SECONDS"] = "0"
+os.environ["FARE_STORE_PATH"] = ""
+os.environ["AGENT_LOG_PATH"] = ""
@@ -0,0 +1,48 @@
+"""
+test_agent_construction.py
+
+Tests that building the provider agents stays fast: no fixed sleep, no browser launch
+and no network call happens before the agent runs.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.main_google_flights import google_flights_search_agent
+from src.main_kayak_flights import kayak_flights_search_agent
+
+ITERATIONS = 5
+BUDGET_SECONDS = 0.5
+
+
+@pytest.mark.parametrize(
+    "agent_factory", [google_flights_search_agent, kayak_flights_search_agent]
+)
+def test_agent_construction_is_fast(agent_factory, monkeypatch):
+    sleeps = []
+
+    async def record_sleep(delay, *args, **kwargs):
+        sleeps.append(delay)
+
+    async def build_agents():
+        # The first agent pays for the one-time imports and shared LLM client
+        await agent_factory("SFO", "JFK", "2025-10-10", "2025-11-10")
+        monkeypatch.setattr(asyncio, "sleep", record_sleep)
+        started_at = time.perf_counter()
+        for _ in range(ITERATIONS):
+            agent = await agent_factory("SFO", "JFK", "2025-10-10", "2025-11-10")
+            assert agent is not None
+        return (time.perf_counter() - started_at) / ITERATIONS
+
+    mean_seconds = asyncio.run(build_agents())
+
+    assert sleeps == []
+    assert mean_seconds <= BUDGET_SECONDS
+
+
+def test_agent_construction_does_not_launch_a_browser():
+    agent = asyncio.run(google_flights_search_agent("SFO", "JFK", "2025-10-10"))
+
+    assert agent.browser.playwright_browser is None
@@ -0,0 +1,64 @@
+"""
+test_batch.py
+
+Tests the batch engine with the provider runs replaced by fixed delays, so the
+feeding and sink handling are checked without browsers.
+"""
+
+import asyncio
+
+from src.lib import batch
+from src.typings import FlightQuery, ProviderRunResult
+
+QUERIES = [
+    FlightQuery(departure="SFO", destination="JFK", date=f"2025-10-{day:02d}")
+    for day in range(1, 11)
+]
+DELAYS = {"kayak": 0.001, "google_flights": 0.05}
+
+
+async def fake_run_provider(provider, agent_factory, departure, destination, date, *_):
+    await asyncio.sleep(DELAYS[provider])
+    return ProviderRunResult(
+        provider=provider,
+        query=FlightQuery(departure=departure, destination=destination, date=date),
+        result="{}",
+        elapsed_seconds=DELAYS[provider],
+    )
+
+
+def run_batch(monkeypatch, sink) -> None:
+    monkeypatch.setattr(batch, "run_provider", fake_run_provider)
+    asyncio.run(
+        batch.run_batch(
+            iter(QUERIES),
+            sink,
+            providers={"kayak": None, "google_flights": None},
+            concurrency={"kayak": 1, "google_flights": 1},
+            queue_size=1,
+        )
+    )
+
+
+def test_slow_provider_does_not_hold_back_the_others(monkeypatch):
+    results = []
+    run_batch(monkeypatch, results.append)
+
+    providers = [result.provider for result in results]
+    assert providers.count("kayak") == providers.count("google_flights") == len(QUERIES)
+    # Every Kayak run finishes before slow Google Flights is halfway through
+    last_kayak = max(index for index, name in enumerate(providers) if name == "kayak")
+    assert providers[:last_kayak].count("google_flights") < len(QUERIES) // 2
+
+
+def test_failing_sink_does_not_cancel_the_batch(monkeypatch):
+    results = []
+
+    def sink(provider_result: ProviderRunResult) -> None:
+        if provider_result.query.date == QUERIES[0].date:
+            raise OSError("disk full")
+        results.append(provider_result)
+
+    run_batch(monkeypatch, sink)
+
+    assert len(results) == 2 * (len(QUERIES) - 1)
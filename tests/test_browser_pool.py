@@ -0,0 +1,121 @@
+"""
+test_browser_pool.py
+
+Tests that pooled browsers are recycled after their uses, that unhealthy browsers are
+replaced, and that the pool size bounds concurrent runs, with browser-use's browser
+replaced by a fake.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import browser_use
+import pytest
+
+from src.lib.browser_pool import BrowserPool
+
+
+class FakePlaywrightBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+
+class FakeBrowserContext:
+    async def close(self) -> None:
+        pass
+
+
+class FakeBrowser:
+    launched: list["FakeBrowser"] = []
+
+    def __init__(self, config=None) -> None:
+        self.config = config
+        self.playwright_browser = None
+        self.is_closed = False
+        FakeBrowser.launched.append(self)
+
+    async def get_playwright_browser(self) -> FakePlaywrightBrowser:
+        self.playwright_browser = FakePlaywrightBrowser()
+        return self.playwright_browser
+
+    async def new_context(self, config=None) -> FakeBrowserContext:
+        context = FakeBrowserContext()
+        context.browser = self
+        return context
+
+    async def close(self) -> None:
+        # browser-use drops the Playwright browser when closing
+        self.is_closed = True
+        self.playwright_browser = None
+
+
+@pytest.fixture(autouse=True)
+def fake_browser(monkeypatch):
+    monkeypatch.setattr(FakeBrowser, "launched", [])
+    monkeypatch.setattr(browser_use, "Browser", FakeBrowser)
+
+
+def make_pool(size: int, max_uses: int = 10) -> BrowserPool:
+    return BrowserPool(
+        size=size,
+        max_uses=max_uses,
+        browser_config=SimpleNamespace(headless=True),
+        context_config=SimpleNamespace(),
+    )
+
+
+async def used_browser(pool: BrowserPool) -> FakeBrowser:
+    async with pool.context() as browser_context:
+        return browser_context.browser
+
+
+def test_browser_is_recycled_after_max_uses():
+    async def run():
+        async with make_pool(size=1, max_uses=2) as pool:
+            browsers = [await used_browser(pool) for _ in range(3)]
+        return browsers
+
+    first, second, third = asyncio.run(run())
+
+    assert first is second
+    assert third is not first
+    assert first.is_closed
+    assert len(FakeBrowser.launched) == 2
+
+
+def test_unhealthy_browser_is_replaced_and_not_handed_out():
+    async def run():
+        async with make_pool(size=1) as pool:
+            (disconnected,) = FakeBrowser.launched
+            await disconnected.close()
+            return disconnected, await used_browser(pool)
+
+    disconnected, handed_out = asyncio.run(run())
+
+    assert handed_out is not disconnected
+    assert len(FakeBrowser.launched) == 2
+
+
+def test_pool_size_bounds_concurrent_runs():
+    active = []
+    peak = []
+
+    async def run_agent(pool: BrowserPool) -> None:
+        async with pool.context():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+
+    async def run():
+        async with make_pool(size=2) as pool:
+            await asyncio.gather(*(run_agent(pool) for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert max(peak) == 2
+    assert len(peak) == 6
+    assert len(FakeBrowser.launched) == 2
@@ -0,0 +1,96 @@
+"""
+test_compare.py
+
+Tests the matching of flight records across providers into itineraries, the
+deduplication of repeated listings and the choice of the cheapest provider.
+"""
+
+from datetime import datetime
+
+from src.lib.compare import compare_fares
+from src.lib.flight_records import FlightRecord
+from src.lib.utils import print_fare_comparison
+
+DEPARTURE = datetime(2025, 10, 10, 7, 40)
+ARRIVAL = datetime(2025, 10, 10, 16, 12)
+LATE_DEPARTURE = datetime(2025, 10, 10, 22, 33)
+LATE_ARRIVAL = datetime(2025, 10, 11, 7, 10)
+
+
+def record(
+    provider: str,
+    airline: str,
+    price_cents: int | None,
+    departure_at: datetime = DEPARTURE,
+    arrival_at: datetime = ARRIVAL,
+    currency: str = "USD",
+) -> FlightRecord:
+    return FlightRecord(
+        provider=provider,
+        airline=airline,
+        route="SFO-JFK",
+        departure_at=departure_at,
+        arrival_at=arrival_at,
+        duration_minutes=332,
+        price_cents=price_cents,
+        currency=currency,
+    )
+
+
+GOOGLE_FLIGHTS = [
+    record("google_flights", "JetBlue", 40700),
+    record("google_flights", "American Airlines", 30800, LATE_DEPARTURE, LATE_ARRIVAL),
+]
+KAYAK = [
+    record("kayak", "Jetblue", 39000),
+    record("kayak", "JetBlue", 41200),
+    record("kayak", "Delta", 51200),
+    record("kayak", "Alaska", None),
+]
+
+
+def test_same_flight_is_matched_across_providers():
+    itineraries = compare_fares(GOOGLE_FLIGHTS + KAYAK)
+
+    assert itineraries.attrs["providers"] == ["google_flights", "kayak"]
+    assert list(itineraries["airline"]) == ["American Airlines", "JetBlue", "Delta"]
+    assert list(itineraries["provider_count"]) == [1, 2, 1]
+
+
+def test_repeated_listings_keep_the_lowest_price():
+    itineraries = compare_fares(KAYAK)
+
+    jetblue = itineraries[itineraries["airline"].str.casefold() == "jetblue"]
+    assert len(jetblue) == 1
+    assert jetblue["kayak"].item() == 39000
+
+
+def test_cheapest_provider_and_spread_per_flight():
+    itineraries = compare_fares(GOOGLE_FLIGHTS + KAYAK).set_index("airline")
+
+    assert itineraries.loc["JetBlue", "best_price_cents"] == 39000
+    assert itineraries.loc["JetBlue", "cheapest_provider"] == "kayak"
+    assert itineraries.loc["JetBlue", "price_spread_cents"] == 1700
+    assert itineraries.loc["American Airlines", "cheapest_provider"] == (
+        "google_flights"
+    )
+    assert itineraries.loc["American Airlines", "price_spread_cents"] == 0
+
+
+def test_records_without_prices_compare_to_nothing():
+    assert compare_fares([record("kayak", "Alaska", None)]).empty
+
+
+def test_comparison_prints_prices_in_major_units(capsys):
+    print_fare_comparison(
+        compare_fares(
+            [
+                record("google_flights", "ANA", 45000, currency="JPY"),
+                record("kayak", "ANA", 43800, currency="JPY"),
+            ]
+        )
+    )
+
+    assert "ANA SFO-JFK 07:40-16:12 10 Oct: 43800 JPY from kayak" in (
+        capsys.readouterr().out
+    )
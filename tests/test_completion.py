@@ -0,0 +1,160 @@
+"""
+test_completion.py
+
+Tests that flights are streamed and the run completed early from the agent's own page
+content extractions, the only source of flights once the DOM extractor has failed. A
+real Kayak agent runs its browser-use run loop with the step replaced by scripted
+action results, which also checks the browser-use internals the step hook relies on.
+"""
+
+import asyncio
+import inspect
+import json
+
+import pytest
+from browser_use import Agent
+from browser_use.agent.views import ActionResult
+
+from src.lib.completion import parse_extracted_flights
+from src.lib.streaming import stream_agent
+from src.main_kayak_flights import kayak_flights_search_agent
+from src.typings import KayakControllerOutput
+
+ROUTE = "SFO-JFK"
+FLIGHT = {
+    "departure": "7:40 am",
+    "arrival": "4:12 pm",
+    "duration": "5h 32m",
+    "price": "$407",
+    "cabin": "Blue Basic",
+}
+FLIGHTS = {
+    "airlines": [
+        {"name": "JetBlue", "flights": [FLIGHT]},
+        {"name": "Delta", "flights": [{**FLIGHT, "price": "$512"}]},
+    ]
+}
+
+
+def extracted(data: dict) -> ActionResult:
+    """
+    Return the result of an `extract_content` action that answered `data`.
+    """
+
+    content = f"```json\n{json.dumps(data)}\n```"
+    return ActionResult(
+        extracted_content=f"📄  Extracted from page\n: {content}\n",
+        include_in_memory=True,
+    )
+
+
+class FakePage:
+    url = "https://www.kayak.com/flights/SFO-JFK/2025-10-10"
+
+    async def title(self) -> str:
+        return "Kayak"
+
+
+class FakeBrowserContext:
+    async def get_current_page(self) -> FakePage:
+        return FakePage()
+
+    async def get_tabs_info(self) -> list:
+        return []
+
+
+def build_agent(step_results: list[list[ActionResult]]) -> tuple[Agent, list]:
+    """
+    Build a Kayak agent whose steps return the given action results in turn, and the
+    list its steps are recorded in.
+    """
+
+    agent = asyncio.run(
+        kayak_flights_search_agent(
+            "SFO", "JFK", "2025-10-10", browser_context=FakeBrowserContext()
+        )
+    )
+    scripted_results = iter(step_results)
+    steps = []
+
+    async def step(*args, **kwargs):
+        agent._last_result = next(scripted_results, [])
+        steps.append(agent._last_result)
+
+    agent.step = step
+    return agent, steps
+
+
+def stream(agent: Agent, **kwargs) -> list:
+    async def collect():
+        return [batch async for batch in stream_agent(agent, ROUTE, 10, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def test_extracted_flights_are_validated_and_get_the_route():
+    output = parse_extracted_flights(
+        extracted(FLIGHTS).extracted_content, KayakControllerOutput, ROUTE
+    )
+
+    assert [airline.name for airline in output.airlines] == ["JetBlue", "Delta"]
+    assert output.airlines[0].flights[0].route == ROUTE
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "🔗  Navigated to https://www.kayak.com/flights",
+        "📄  Extracted from page\n: {not json}",
+        '📄  Extracted from page\n: {"flights": ["7:40 am"]}',
+        '📄  Extracted from page\n: {"airlines": [{"name": "JetBlue"}]}',
+    ],
+)
+def test_content_without_flights_is_ignored(content):
+    assert parse_extracted_flights(content, KayakControllerOutput, ROUTE) is None
+
+
+def test_agent_extractions_stream_and_complete_the_run():
+    first_airline = {"airlines": FLIGHTS["airlines"][:1]}
+    agent, steps = build_agent(
+        [
+            [ActionResult(extracted_content="🔗  Navigated to the results")],
+            [extracted(first_airline)],
+            [extracted(FLIGHTS)],
+            [extracted(FLIGHTS)],
+        ],
+    )
+
+    batches = stream(agent, stable_steps=1)
+
+    assert [batch.model_dump() for batch in batches] == [
+        KayakControllerOutput.model_validate(
+            {"airlines": [{"name": name, "flights": flights}]}
+        ).model_dump()
+        for name, flights in [
+            ("JetBlue", [{**FLIGHT, "route": ROUTE}]),
+            ("Delta", [{**FLIGHT, "price": "$512", "route": ROUTE}]),
+        ]
+    ]
+    assert len(steps) == 4
+    assert agent.history.is_done()
+    final_output = KayakControllerOutput.model_validate_json(
+        agent.history.final_result()
+    )
+    assert final_output == parse_extracted_flights(
+        json.dumps(FLIGHTS), KayakControllerOutput, ROUTE
+    )
+
+
+def test_run_is_not_completed_when_disabled():
+    agent, steps = build_agent([[extracted(FLIGHTS)], [extracted(FLIGHTS)]])
+
+    batches = stream(agent, stable_steps=1, stop_when_complete=False)
+
+    assert len(batches) == 1
+    assert len(steps) == 10
+    assert not agent.history.is_done()
+
+
+def test_browser_use_keeps_the_step_results_on_the_agent():
+    assert "self._last_result = result" in inspect.getsource(Agent.step)
@@ -0,0 +1,68 @@
+"""
+test_export.py
+
+Tests the fare export sink and the layout of the exported dataset.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.lib.export import fare_export_sink, open_fare_writer, query_partition
+from src.typings import FlightQuery, ProviderRunResult
+
+QUERY = FlightQuery(departure="SFO", destination="JFK", date="2025-10-10")
+RESULT = (
+    '{"airlines": [{"name": "JetBlue", "flights": [{"departure": "7:40 am", '
+    '"arrival": "4:12 pm", "duration": "5h 32m", "route": "SFO-JFK", '
+    '"price": "$407", "cabin": "Blue Basic"}]}]}'
+)
+
+
+def run_result(**kwargs) -> ProviderRunResult:
+    return ProviderRunResult(
+        **{"provider": "kayak", "query": QUERY, "elapsed_seconds": 1.0, **kwargs}
+    )
+
+
+def test_export_is_partitioned_by_travel_date(tmp_path: Path):
+    pytest.importorskip("pyarrow")
+
+    with open_fare_writer(tmp_path, "parquet") as writer:
+        fare_export_sink(writer)(run_result(result=RESULT))
+
+    (part,) = tmp_path.glob("route=SFO-JFK/travel_date=2025-10-10/*.parquet")
+    assert part.stat().st_size > 0
+
+
+def test_partitions_follow_the_query_route(tmp_path: Path):
+    pytest.importorskip("pyarrow")
+
+    with open_fare_writer(tmp_path, "parquet") as writer:
+        fare_export_sink(writer)(
+            run_result(result=RESULT.replace("SFO-JFK", "SFO/EWR"))
+        )
+
+    (part,) = tmp_path.rglob("*.parquet")
+    assert part.parent.relative_to(tmp_path) == Path(
+        "route=SFO-JFK/travel_date=2025-10-10"
+    )
+
+
+def test_partition_values_are_safe_directory_names():
+    query = FlightQuery(departure="SFO/..", destination="JFK", date="2025/10/10")
+
+    assert query_partition(query) == ("SFO___-JFK", "2025_10_10")
+
+
+def test_export_sink_skips_bad_results(tmp_path: Path):
+    path = tmp_path / "fares.jsonl"
+
+    with open_fare_writer(path, "jsonl") as writer:
+        export = fare_export_sink(writer)
+        export(run_result(error="Timed out after 600 seconds"))
+        export(run_result(result="Sorry, I could not find flights"))
+        export(run_result(result=RESULT))
+
+    (line,) = path.read_text(encoding="utf-8").splitlines()
+    assert '"travel_date": "2025-10-10"' in line
@@ -0,0 +1,157 @@
+"""
+test_extraction.py
+
+Tests the DOM extractors. Row validation is tested on extracted rows directly. The
+saved results pages in `benchmarks/fixtures/` (every `.html` with its expected `.json`)
+are loaded into headless Chromium and extracted, intact and with their markup
+degraded; those tests are skipped when no Playwright Chromium is installed.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.lib.extraction import ExtractionError
+from src.lib.google_flights_extractor import (
+    extract_google_flights,
+    google_flights_rows_to_output,
+)
+from src.lib.kayak_flights_extractor import (
+    extract_kayak_flights,
+    kayak_flights_rows_to_output,
+)
+
+FIXTURES_DIR = Path(__file__).parent.parent / "benchmarks" / "fixtures"
+EXTRACTORS = {
+    "google_flights": extract_google_flights,
+    "kayak_flights": extract_kayak_flights,
+}
+FIXTURES = sorted(FIXTURES_DIR.glob("*.html"))
+
+KAYAK_ROW = {
+    "airline": "JetBlue",
+    "times": "7:40 am – 4:12 pm",
+    "duration": "5h 32m",
+    "price": "$407",
+    "cabin": "Blue Basic",
+}
+GOOGLE_ROW = {
+    "airline": "JetBlue",
+    "departure": "7:40 AM",
+    "arrival": "4:12 PM",
+    "day_offset": "",
+    "duration": "5 hr 32 min",
+    "price": "$407",
+    "emissions": "422 kg CO2e",
+    "emissions_percent": "+15% emissions",
+}
+
+
+def extract_html(extractor, html: str, route: str):
+    """
+    Load a page into headless Chromium and extract it, skipping without Chromium.
+    """
+
+    playwright_api = pytest.importorskip("playwright.async_api")
+
+    async def extract():
+        async with playwright_api.async_playwright() as playwright:
+            try:
+                browser = await playwright.chromium.launch(headless=True)
+            except playwright_api.Error as e:
+                pytest.skip(f"Playwright Chromium is not installed: {e}")
+            try:
+                page = await browser.new_page()
+                await page.set_content(html)
+                return await extractor(page, route, timeout=1)
+            finally:
+                await browser.close()
+
+    return asyncio.run(extract())
+
+
+def load_fixture(html_path: Path) -> tuple:
+    """
+    Return the extractor, page and expected output of a fixture.
+    """
+
+    expected_path = html_path.with_suffix(".json")
+    if not expected_path.exists():
+        pytest.skip(f"{html_path.name} has no expected result ({expected_path.name})")
+
+    expected = json.loads(expected_path.read_text(encoding="utf-8"))
+    extractor = next(
+        extractor
+        for prefix, extractor in EXTRACTORS.items()
+        if html_path.name.startswith(prefix)
+    )
+    return extractor, html_path.read_text(encoding="utf-8"), expected
+
+
+def expected_route(expected: dict) -> str:
+    return expected["airlines"][0]["flights"][0]["route"]
+
+
+@pytest.mark.parametrize("html_path", FIXTURES, ids=lambda path: path.stem)
+def test_fixture_extracts_expected_result(html_path):
+    extractor, html, expected = load_fixture(html_path)
+
+    output = extract_html(extractor, html, expected_route(expected))
+
+    assert output.model_dump() == expected
+
+
+@pytest.mark.parametrize("html_path", FIXTURES, ids=lambda path: path.stem)
+def test_fixture_with_a_missing_price_falls_back(html_path):
+    extractor, html, expected = load_fixture(html_path)
+    price = expected["airlines"][0]["flights"][0]["price"]
+
+    with pytest.raises(ExtractionError, match="missing price"):
+        extract_html(extractor, html.replace(price, "", 1), expected_route(expected))
+
+
+@pytest.mark.parametrize("html_path", FIXTURES, ids=lambda path: path.stem)
+def test_fixture_with_changed_markup_falls_back(html_path):
+    extractor, html, expected = load_fixture(html_path)
+    html = html.replace('class="nrc6"', 'class="nrc7"').replace("Rk10dc", "Rk11dc")
+
+    with pytest.raises(ExtractionError):
+        extract_html(extractor, html, expected_route(expected))
+
+
+@pytest.mark.parametrize(
+    "rows_to_output, row",
+    [
+        (kayak_flights_rows_to_output, KAYAK_ROW),
+        (google_flights_rows_to_output, GOOGLE_ROW),
+    ],
+)
+def test_complete_rows_are_grouped_by_airline(rows_to_output, row):
+    output = rows_to_output([row, {**row, "airline": "Delta"}, row], "SFO-JFK")
+
+    assert [airline.name for airline in output.airlines] == ["JetBlue", "Delta"]
+    assert len(output.airlines[0].flights) == 2
+
+
+@pytest.mark.parametrize(
+    "rows_to_output, row, field",
+    [
+        (kayak_flights_rows_to_output, KAYAK_ROW, "price"),
+        (kayak_flights_rows_to_output, KAYAK_ROW, "times"),
+        (google_flights_rows_to_output, GOOGLE_ROW, "price"),
+        (google_flights_rows_to_output, GOOGLE_ROW, "airline"),
+    ],
+)
+def test_incomplete_row_fails_the_page(rows_to_output, row, field):
+    with pytest.raises(ExtractionError, match=f"result 2 of 3 is missing {field}"):
+        rows_to_output([row, {**row, field: ""}, row], "SFO-JFK")
+
+
+@pytest.mark.parametrize(
+    "rows_to_output", [kayak_flights_rows_to_output, google_flights_rows_to_output]
+)
+def test_no_rows_fail_the_page(rows_to_output):
+    with pytest.raises(ExtractionError):
+        rows_to_output([], "SFO-JFK")
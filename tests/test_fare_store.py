@@ -0,0 +1,84 @@
+"""
+test_fare_store.py
+
+Tests that only validated provider runs are recorded in the fare history, and that a
+run or a fare history that cannot be recorded is logged instead of failing the search.
+"""
+
+import json
+
+from src.lib import fare_store
+from src.lib.fare_store import FareStore, record_results
+from src.typings import FlightQuery, ProviderRunResult
+
+QUERY = FlightQuery(departure="SFO", destination="JFK", date="2025-10-10")
+VALID_RESULT = json.dumps(
+    {
+        "airlines": [
+            {
+                "name": "JetBlue",
+                "flights": [
+                    {
+                        "departure": "7:40 am",
+                        "arrival": "4:12 pm",
+                        "duration": "5h 32m",
+                        "route": "SFO-JFK",
+                        "price": "$407",
+                        "cabin": "Blue Basic",
+                    }
+                ],
+            }
+        ]
+    }
+)
+
+
+def run_result(**kwargs) -> ProviderRunResult:
+    return ProviderRunResult(
+        **{
+            "provider": "kayak",
+            "query": QUERY,
+            "result": VALID_RESULT,
+            "elapsed_seconds": 1.0,
+            **kwargs,
+        }
+    )
+
+
+def test_only_successful_runs_are_recorded():
+    with FareStore(":memory:") as store:
+        added = [
+            store.add_result(run_result()),
+            store.add_result(run_result(error="Result did not validate")),
+            store.add_result(run_result(is_cached=True)),
+            store.add_result(run_result(result="Sorry, no flights")),
+        ]
+        store.flush()
+
+        assert added == [1, 0, 0, 0]
+        assert store.stats() == {"searches": 1, "fares": 1}
+
+
+def test_run_that_fails_to_normalize_is_skipped(monkeypatch, caplog):
+    def fail_to_normalize(provider_result):
+        raise ValueError("unexpected duration")
+
+    monkeypatch.setattr(fare_store, "normalize_run_result", fail_to_normalize)
+
+    with FareStore(":memory:") as store:
+        assert store.add_result(run_result()) == 0
+
+    assert "Recording the kayak fares" in caplog.text
+
+
+def test_unwritable_fare_history_is_logged(tmp_path, caplog):
+    assert record_results([run_result()], tmp_path) == 0
+    assert "Recording fares in" in caplog.text
+
+
+def test_results_are_recorded(tmp_path):
+    path = tmp_path / "fares.sqlite3"
+
+    assert record_results([run_result(), run_result(error="Timed out")], path) == 1
+    with FareStore(path) as store:
+        assert store.stats() == {"searches": 1, "fares": 1}
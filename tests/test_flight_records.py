@@ -0,0 +1,125 @@
+"""
+test_flight_records.py
+
+Tests the parsing of provider display strings and the normalization of provider runs
+into flight records.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src.lib.flight_records import (
+    FlightRecord,
+    fare_sort_key,
+    format_price,
+    normalize_run_result,
+    parse_price,
+    parse_time,
+)
+from src.typings import FlightQuery, ProviderRunResult
+
+QUERY = FlightQuery(departure="SFO", destination="JFK", date="2025-10-10")
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("$1,308", (130800, "USD")),
+        ("US$1,308.99", (130899, "USD")),
+        ("$12.5", (1250, "USD")),
+        ("€1.308", (130800, "EUR")),
+        ("€12,50", (1250, "EUR")),
+        ("1.308,50 €", (130850, "EUR")),
+        ("1 308 €", (130800, "EUR")),
+        ("€1.234.567", (123456700, "EUR")),
+        ("EUR 1.308", (130800, "EUR")),
+        ("£99", (9900, "GBP")),
+        ("¥45,000", (45000, "JPY")),
+        ("KWD 1.234", (1234, "KWD")),
+        ("CHF 1'308.50", (130850, "CHF")),
+        ("$308 2 stops", (30800, "USD")),
+        ("₿308", (30800, None)),
+        ("Price unavailable", (None, None)),
+    ],
+)
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+
+
+@pytest.mark.parametrize(
+    "price_cents, currency, expected",
+    [
+        (40700, "USD", "407.00"),
+        (45000, "JPY", "45000"),
+        (1234, "KWD", "1.234"),
+        (1250, None, "12.50"),
+        (39000.0, "EUR", "390.00"),
+    ],
+)
+def test_format_price(price_cents, currency, expected):
+    assert format_price(price_cents, currency) == expected
+
+
+def test_parse_time_applies_the_day_offset():
+    assert parse_time("7:10 am+1", datetime(2025, 10, 10).date()) == datetime(
+        2025, 10, 11, 7, 10
+    )
+
+
+def test_unvalidated_result_normalizes_to_no_records():
+    run_result = ProviderRunResult(
+        provider="kayak",
+        query=QUERY,
+        result="Sorry, I could not find flights",
+        elapsed_seconds=1.0,
+    )
+
+    assert normalize_run_result(run_result) == []
+
+
+def test_non_iso_query_date_normalizes_to_no_records(caplog):
+    result = {
+        "airlines": [
+            {
+                "name": "JetBlue",
+                "flights": [
+                    {
+                        "departure": "7:40 am",
+                        "arrival": "4:12 pm",
+                        "duration": "5h 32m",
+                        "route": "SFO-JFK",
+                        "price": "$407",
+                        "cabin": "Blue Basic",
+                    }
+                ],
+            }
+        ]
+    }
+    run_result = ProviderRunResult(
+        provider="kayak",
+        query=FlightQuery(departure="SFO", destination="JFK", date="2025-4-5"),
+        result=json.dumps(result),
+        elapsed_seconds=1.0,
+    )
+
+    assert normalize_run_result(run_result) == []
+    assert "'2025-4-5' is not YYYY-MM-DD" in caplog.text
+
+
+def test_fare_sort_key_puts_unknown_prices_last():
+    fares = [(None, 300), (40700, None), (40700, 330), (30800, 400)]
+    records = [
+        FlightRecord("kayak", "JetBlue", "SFO-JFK", None, None, duration, price, None)
+        for price, duration in fares
+    ]
+
+    ordered = sorted(records, key=fare_sort_key)
+
+    assert [(record.price_cents, record.duration_minutes) for record in ordered] == [
+        (30800, 400),
+        (40700, 330),
+        (40700, None),
+        (None, 300),
+    ]
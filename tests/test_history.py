@@ -0,0 +1,61 @@
+"""
+test_history.py
+
+Tests that the `summary` history policy spills step screenshots to disk and keeps
+only the latest runs there, with the agent replaced by a fake.
+"""
+
+import base64
+import os
+from types import SimpleNamespace
+
+from src.lib.history import HistoryRetention
+
+SCREENSHOT = base64.b64encode(b"png").decode()
+
+
+def fake_agent(agent_id: str) -> SimpleNamespace:
+    agent = SimpleNamespace(agent_id=agent_id, history=SimpleNamespace(history=[]))
+
+    def make_history_item(*args, **kwargs):
+        state = SimpleNamespace(screenshot=SCREENSHOT, interacted_element=[None])
+        agent.history.history.append(SimpleNamespace(state=state))
+
+    agent._make_history_item = make_history_item
+    return agent
+
+
+def run_steps(agent: SimpleNamespace, history_dir, max_runs: int) -> None:
+    retention = HistoryRetention(agent, "summary", history_dir, max_runs)
+    agent._make_history_item()
+    agent._make_history_item()
+    retention.finish()
+
+
+def test_steps_are_spilled_and_released(tmp_path):
+    agent = fake_agent("run")
+
+    run_steps(agent, tmp_path, max_runs=5)
+
+    assert sorted(path.name for path in (tmp_path / "run").iterdir()) == [
+        "step_001.png",
+        "step_002.png",
+    ]
+    assert [item.state.screenshot for item in agent.history.history] == [None, None]
+
+
+def test_only_the_latest_runs_are_kept(tmp_path):
+    for age, agent_id in enumerate(["old", "older", "oldest"], start=1):
+        (tmp_path / agent_id).mkdir()
+        os.utime(tmp_path / agent_id, (1000 - age, 1000 - age))
+
+    run_steps(fake_agent("new"), tmp_path, max_runs=2)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["new", "old"]
+
+
+def test_zero_max_runs_keeps_every_run(tmp_path):
+    for agent_id in ["a", "b", "c"]:
+        run_steps(fake_agent(agent_id), tmp_path, max_runs=0)
+
+    assert len(list(tmp_path.iterdir())) == 3
@@ -0,0 +1,178 @@
+"""
+test_instrumentation.py
+
+Tests the per-step split of agent time into page state, LLM and action phases, the
+token counts of the step's LLM calls, and the JSONL and Prometheus output, with the
+agent and the clock replaced by fakes.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from browser_use.agent.views import ActionResult
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.lib import instrumentation
+from src.lib.instrumentation import AgentInstrumentation, MetricsRecorder
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return 1760000000.0
+
+
+class FakeAgent:
+    """
+    An agent whose step reads the page state, asks the LLM and acts, each phase
+    taking a fixed time on the fake clock.
+    """
+
+    def __init__(self, clock: FakeClock, results: list[list[ActionResult]]) -> None:
+        self.clock = clock
+        self.results = iter(results)
+        self._last_result = None
+        self.history = SimpleNamespace(is_done=lambda: True)
+        self.llm = GenericFakeChatModel(
+            messages=iter(
+                AIMessage(
+                    content="{}",
+                    usage_metadata={
+                        "input_tokens": 1200,
+                        "output_tokens": 80,
+                        "total_tokens": 1280,
+                    },
+                )
+                for _ in range(10)
+            )
+        )
+        self.browser_context = SimpleNamespace(get_state=self.get_state)
+        self.controller = SimpleNamespace(multi_act=self.multi_act)
+
+    async def get_state(self) -> None:
+        self.clock.now += 0.5
+
+    async def get_next_action(self) -> None:
+        await self.llm.ainvoke("Find flights")
+        self.clock.now += 2.0
+
+    async def multi_act(self) -> None:
+        self.clock.now += 1.0
+
+    async def step(self) -> None:
+        await self.browser_context.get_state()
+        await self.get_next_action()
+        await self.controller.multi_act()
+        self.clock.now += 0.25
+        self._last_result = next(self.results)
+
+
+def run_steps(monkeypatch, tmp_path, results: list[list[ActionResult]]):
+    """
+    Run an instrumented fake agent for one step per result list; returns the
+    recorder and the run metrics.
+    """
+
+    clock = FakeClock()
+    monkeypatch.setattr(instrumentation, "time", clock)
+    recorder = MetricsRecorder(tmp_path / "metrics.jsonl")
+    agent = FakeAgent(clock, results)
+    agent_instrumentation = AgentInstrumentation(agent, "kayak", recorder)
+
+    async def run():
+        for _ in results:
+            await agent.step()
+
+    asyncio.run(run())
+    run_metrics = agent_instrumentation.finish()
+    recorder.close()
+    return recorder, run_metrics
+
+
+def test_step_time_is_split_by_phase_and_tokens_counted(monkeypatch, tmp_path):
+    recorder, run_metrics = run_steps(
+        monkeypatch,
+        tmp_path,
+        [[ActionResult(error="Element not found")], [ActionResult(is_done=True)]],
+    )
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "metrics.jsonl").read_text().splitlines()
+    ]
+    assert [record["kind"] for record in records] == ["step", "step", "run"]
+    first_step, second_step, run = records
+    assert first_step == {
+        "kind": "step",
+        "provider": "kayak",
+        "step": 1,
+        "started_at": 1760000000.0,
+        "dom_seconds": 0.5,
+        "llm_seconds": 2.0,
+        "action_seconds": 1.0,
+        "total_seconds": 3.75,
+        "prompt_tokens": 1200,
+        "completion_tokens": 80,
+        "llm_calls": 1,
+        "cached_llm_calls": 0,
+        "error": "Element not found",
+        "is_done": False,
+    }
+    assert second_step["step"] == 2
+    assert second_step["error"] is None
+    assert second_step["is_done"]
+    assert run == {"kind": "run", **run_metrics.model_dump()}
+    assert run_metrics.steps == 2
+    assert run_metrics.failed_steps == 1
+    assert run_metrics.llm_seconds == 4.0
+    assert run_metrics.prompt_tokens == 2400
+    assert run_metrics.is_done
+
+
+def test_finish_removes_the_wrappers(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(instrumentation, "time", clock)
+    agent = FakeAgent(clock, [])
+    agent_instrumentation = AgentInstrumentation(agent, "kayak", MetricsRecorder(""))
+
+    agent_instrumentation.finish()
+
+    assert "step" not in vars(agent)
+    assert "get_next_action" not in vars(agent)
+
+
+def test_prometheus_page(monkeypatch, tmp_path):
+    recorder, _ = run_steps(
+        monkeypatch, tmp_path, [[ActionResult()], [ActionResult(is_done=True)]]
+    )
+    recorder.record_coalesced("kayak")
+
+    lines = recorder.render_prometheus().splitlines()
+
+    for line in [
+        "# TYPE flight_search_step_phase_seconds_total counter",
+        'flight_search_step_phase_seconds_total{provider="kayak",phase="dom"} '
+        "1.000000",
+        'flight_search_step_phase_seconds_total{provider="kayak",phase="llm"} '
+        "4.000000",
+        'flight_search_steps_total{provider="kayak",status="ok"} 2',
+        'flight_search_llm_tokens_total{provider="kayak",type="completion"} 160',
+        'flight_search_llm_tokens_total{provider="kayak",type="prompt"} 2400',
+        'flight_search_llm_calls_total{provider="kayak",source="live"} 2',
+        'flight_search_runs_total{provider="kayak",status="done"} 1',
+        'flight_search_coalesced_runs_total{provider="kayak"} 1',
+        "# TYPE flight_search_step_seconds histogram",
+        'flight_search_step_seconds_bucket{provider="kayak",le="2.5"} 0',
+        'flight_search_step_seconds_bucket{provider="kayak",le="5"} 2',
+        'flight_search_step_seconds_bucket{provider="kayak",le="+Inf"} 2',
+        'flight_search_step_seconds_sum{provider="kayak"} 7.500000',
+        'flight_search_step_seconds_count{provider="kayak"} 2',
+    ]:
+        assert line in lines
@@ -0,0 +1,82 @@
+"""
+test_llm.py
+
+Tests the parsing of `backend:model` specs, backend registration and the step models
+that read the LLM response cache, with a fake chat model backend.
+"""
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.lib import llm
+from src.lib.llm import get_llm, get_step_llm, parse_llm_spec, register_llm_backend
+from src.lib.llm_cache import LlmResponseCache
+
+
+def build_fake_llm(model: str) -> FakeListChatModel:
+    return FakeListChatModel(responses=[model])
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """
+    Register a `fake` backend for the test only, with an in-memory response cache.
+    """
+
+    monkeypatch.setattr(llm, "LLM_BACKENDS", dict(llm.LLM_BACKENDS))
+    monkeypatch.setattr(llm, "DEFAULT_MODEL_NAMES", dict(llm.DEFAULT_MODEL_NAMES))
+    llm_cache = LlmResponseCache(":memory:")
+    monkeypatch.setattr(llm, "get_llm_cache", lambda: llm_cache)
+    register_llm_backend("fake", build_fake_llm, default_model="fake-small")
+    yield llm_cache
+    get_llm.cache_clear()
+    get_step_llm.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("ollama:phi4:latest", ("ollama", "phi4:latest")),
+        ("openai:gpt-4o", ("openai", "gpt-4o")),
+        (" openai:gpt-4o ", ("openai", "gpt-4o")),
+        ("ollama", ("ollama", llm.DEFAULT_MODEL_NAMES["ollama"])),
+    ],
+)
+def test_parse_llm_spec(spec, expected):
+    assert parse_llm_spec(spec) == expected
+
+
+def test_backend_only_spec_uses_the_default_model(fake_backend):
+    assert parse_llm_spec("fake") == ("fake", "fake-small")
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown LLM backend: anthropic"):
+        parse_llm_spec("anthropic:claude")
+
+
+def test_registering_a_backend_clears_the_built_models(fake_backend):
+    first = get_llm("fake:model")
+    step_llm = get_step_llm("fake:model", "agent")
+
+    register_llm_backend("fake", build_fake_llm)
+
+    assert get_llm("fake:model") is not first
+    assert get_step_llm("fake:model", "agent") is not step_llm
+
+
+def test_models_are_shared_per_spec(fake_backend):
+    assert get_llm("fake:model") is get_llm("fake:model")
+    assert get_llm("fake:model").responses == ["model"]
+
+
+def test_cache_is_attached_only_to_cached_step_types(fake_backend, monkeypatch):
+    monkeypatch.setattr(llm, "LLM_CACHE_STEP_TYPES", ["agent"])
+
+    agent_llm = get_step_llm("fake:model", "agent")
+    extraction_llm = get_step_llm("fake:model", "extraction")
+
+    assert agent_llm.cache is fake_backend
+    assert agent_llm is not get_llm("fake:model")
+    assert extraction_llm is get_llm("fake:model")
+    assert extraction_llm.cache is None
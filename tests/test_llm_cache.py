@@ -0,0 +1,103 @@
+"""
+test_llm_cache.py
+
+Tests the LLM response cache keys, its LRU eviction, and a chat model answering a
+repeated request from the cache, with a fake chat model in place of the LLM.
+"""
+
+import json
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import HumanMessage
+
+from src.lib import llm_cache
+from src.lib.llm_cache import LlmResponseCache, build_llm_cache_key, normalize_prompt
+
+
+def page_state(timestamp: str) -> str:
+    return json.dumps(
+        [
+            {
+                "type": "human",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Current url: https://www.kayak.com\n"
+                        f"Current date and time: {timestamp}",
+                    },
+                    {"type": "image_url", "image_url": {"url": "data:image/png;..."}},
+                ],
+            }
+        ]
+    )
+
+
+def cache_request(model: FakeListChatModel, text: str) -> tuple[str, str]:
+    """
+    Return the prompt and LLM string LangChain looks a text message up with.
+    """
+
+    return dumps([HumanMessage(content=text)]), model._get_llm_string()
+
+
+def test_prompt_is_normalized_without_images_and_timestamps():
+    normalized = normalize_prompt(json.loads(page_state("2025-10-10 07:40")))
+
+    assert normalized == [
+        {
+            "type": "human",
+            "content": [
+                {"type": "text", "text": "Current url: https://www.kayak.com\n"}
+            ],
+        }
+    ]
+
+
+def test_same_step_at_another_time_has_the_same_key():
+    assert build_llm_cache_key(
+        page_state("2025-10-10 07:40"), "gpt-4o-mini"
+    ) == build_llm_cache_key(page_state("2025-11-02 21:05"), "gpt-4o-mini")
+
+
+def test_key_depends_on_the_model_and_its_parameters():
+    prompt = page_state("2025-10-10 07:40")
+    keys = {
+        build_llm_cache_key(prompt, llm_string)
+        for llm_string in [
+            '{"model_name": "gpt-4o-mini", "temperature": 0}',
+            '{"model_name": "gpt-4o", "temperature": 0}',
+            '{"model_name": "gpt-4o-mini", "temperature": 1}',
+        ]
+    }
+
+    assert len(keys) == 3
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    now = iter(range(1000, 2000))
+    monkeypatch.setattr(llm_cache.time, "time", lambda: next(now))
+    cache = LlmResponseCache(":memory:", max_entries=2)
+    model = FakeListChatModel(responses=["first", "second", "third"], cache=cache)
+
+    model.invoke("first")
+    model.invoke("second")
+    model.invoke("first")
+    model.invoke("third")
+
+    assert cache.stats()["entries"] == 2
+    assert model.invoke("first").content == "first"
+    assert cache.lookup(*cache_request(model, "second")) is None
+
+
+def test_repeated_request_is_answered_from_the_cache():
+    cache = LlmResponseCache(":memory:")
+    model = FakeListChatModel(responses=["live", "not called"], cache=cache)
+
+    first = model.invoke("Find flights from SFO to JFK")
+    second = model.invoke("Find flights from SFO to JFK")
+
+    assert first.content == second.content == "live"
+    assert second.response_metadata["cache_hit"]
+    assert second.usage_metadata is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
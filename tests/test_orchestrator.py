@@ -0,0 +1,178 @@
+"""
+test_orchestrator.py
+
+Tests provider runs with the browser, the DOM extractor and the agent replaced by
+fakes, so result validation, cache keys and coalescing are checked offline.
+"""
+
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+from src.lib import orchestrator
+from src.lib.politeness import politeness_scheduler
+from src.lib.providers import get_provider
+from src.lib.result_cache import ResultCache, build_query_key
+from src.typings import FlightQuery
+
+VALID_RESULT = (
+    '{"airlines": [{"name": "JetBlue", "flights": [{"departure": "7:40 am", '
+    '"arrival": "4:12 pm", "duration": "5h 32m", "route": "SFO-JFK", '
+    '"price": "$407", "cabin": "Blue Basic"}]}]}'
+)
+
+
+class FakeHistory:
+    def __init__(self, final_result: str | None) -> None:
+        self._final_result = final_result
+
+    def is_done(self) -> bool:
+        return True
+
+    def final_result(self) -> str | None:
+        return self._final_result
+
+
+@pytest.fixture
+def fake_agent_runs(monkeypatch):
+    """
+    Replace the browser and the agent run; returns the list of agents run.
+    """
+
+    runs = []
+
+    @contextlib.asynccontextmanager
+    async def fake_browser_context(*args, **kwargs):
+        yield None
+
+    async def fake_stream_agent(agent, *args, **kwargs):
+        runs.append(agent)
+        await asyncio.sleep(0.05)
+        return
+        yield
+
+    monkeypatch.setattr(
+        orchestrator, "standalone_browser_context", fake_browser_context
+    )
+    monkeypatch.setattr(orchestrator, "stream_agent", fake_stream_agent)
+    monkeypatch.setattr(orchestrator, "DOM_EXTRACTION_ENABLED", False)
+    monkeypatch.setattr(
+        orchestrator,
+        "AgentInstrumentation",
+        lambda *args: SimpleNamespace(finish=lambda: None),
+    )
+    monkeypatch.setitem(politeness_scheduler.min_intervals, "www.kayak.com", 0)
+    return runs
+
+
+def agent_factory(final_result: str | None):
+    async def build_agent(*args, **kwargs):
+        return SimpleNamespace(
+            n_steps=1, consecutive_failures=0, history=FakeHistory(final_result)
+        )
+
+    return build_agent
+
+
+def run_kayak(final_result: str | None, departure: str = "SFO", **kwargs):
+    return orchestrator.run_provider(
+        "kayak", agent_factory(final_result), departure, "JFK", "2025-10-10", **kwargs
+    )
+
+
+def test_valid_result_succeeds(fake_agent_runs):
+    provider_result = asyncio.run(run_kayak(VALID_RESULT))
+
+    assert provider_result.is_successful
+    assert provider_result.result is not None
+
+
+def test_unvalidated_result_is_an_error(fake_agent_runs):
+    provider_result = asyncio.run(run_kayak("Sorry, I could not find flights"))
+
+    assert not provider_result.is_successful
+    assert provider_result.result is None
+    assert provider_result.error == (
+        "Result did not validate against KayakControllerOutput"
+    )
+
+
+@pytest.mark.parametrize("departure", ["sfo", " SFO", "Sfo "])
+def test_equivalent_queries_share_a_cache_key(fake_agent_runs, departure):
+    result_cache = ResultCache(":memory:", ttl_seconds=60)
+    query = FlightQuery(departure="SFO", destination="JFK", date="2025-10-10")
+    url = get_provider("kayak").build_url("SFO", "JFK", "2025-10-10")
+    result_cache.set(build_query_key("kayak", query, url), "kayak", VALID_RESULT)
+
+    provider_result = asyncio.run(
+        run_kayak(None, departure=departure, result_cache=result_cache)
+    )
+
+    assert provider_result.is_cached
+    assert provider_result.query == query
+    assert fake_agent_runs == []
+
+
+def test_queries_differing_in_case_are_coalesced(fake_agent_runs):
+    async def run_both():
+        return await asyncio.gather(
+            run_kayak(VALID_RESULT), run_kayak(VALID_RESULT, departure="sfo ")
+        )
+
+    provider_results = asyncio.run(run_both())
+
+    assert len(fake_agent_runs) == 1
+    assert [result.is_coalesced for result in provider_results] == [False, True]
+    assert provider_results[0].query == provider_results[1].query
+    assert all(result.is_successful for result in provider_results)
+
+
+def failing_on_batch(provider, batch):
+    raise OSError("stream closed")
+
+
+def test_failing_callback_on_cached_and_coalesced_results_is_logged(
+    fake_agent_runs, caplog
+):
+    result_cache = ResultCache(":memory:", ttl_seconds=60)
+    query = FlightQuery(departure="SFO", destination="JFK", date="2025-10-10")
+    url = get_provider("kayak").build_url("SFO", "JFK", "2025-10-10")
+    result_cache.set(build_query_key("kayak", query, url), "kayak", VALID_RESULT)
+
+    async def run_both():
+        return await asyncio.gather(
+            run_kayak(VALID_RESULT, departure="LAX"),
+            run_kayak(VALID_RESULT, departure="LAX", on_batch=failing_on_batch),
+        )
+
+    cached_result = asyncio.run(
+        run_kayak(None, result_cache=result_cache, on_batch=failing_on_batch)
+    )
+    provider_results = asyncio.run(run_both())
+
+    assert cached_result.is_cached
+    assert [result.is_coalesced for result in provider_results] == [False, True]
+    assert all(result.is_successful for result in provider_results)
+    assert caplog.text.count("kayak batch callback failed") == 2
+
+
+def test_failing_stream_consumer_does_not_fail_the_search(
+    fake_agent_runs, monkeypatch, caplog
+):
+    async def fake_stream_agent(agent, *args, **kwargs):
+        yield get_provider("kayak").output_model.model_validate_json(VALID_RESULT)
+
+    monkeypatch.setattr(orchestrator, "stream_agent", fake_stream_agent)
+    circuit_breaker = orchestrator.circuit_breakers["www.kayak.com"]
+    monkeypatch.setattr(circuit_breaker, "failures", 0)
+
+    provider_result = asyncio.run(
+        run_kayak(VALID_RESULT, departure="BOS", on_batch=failing_on_batch)
+    )
+
+    assert provider_result.is_successful
+    assert provider_result.attempts == 1
+    assert circuit_breaker.failures == 0
+    assert "kayak batch callback failed" in caplog.text
@@ -0,0 +1,33 @@
+"""
+test_prompt_schema.py
+
+Tests that the compact output example of every provider's task prompt validates
+against the provider's output model, and that unknown prompt modes are rejected.
+"""
+
+import pytest
+
+from src.lib.prompt_schema import render_compact_schema, render_output_example
+from src.lib.providers import load_providers
+
+
+@pytest.mark.parametrize("provider", sorted(load_providers()))
+def test_compact_example_validates_against_the_output_model(provider):
+    output_model = load_providers()[provider].output_model
+
+    output_model.model_validate_json(render_compact_schema(output_model))
+
+
+def test_compact_mode_renders_the_compact_example():
+    output_model = load_providers()["kayak"].output_model
+
+    assert render_output_example("compact", {}, output_model) == (
+        f", shaped like:\n{render_compact_schema(output_model)}\n"
+    )
+
+
+def test_unknown_prompt_mode_is_rejected():
+    output_model = load_providers()["kayak"].output_model
+
+    with pytest.raises(ValueError, match="Unknown prompt mode: structred"):
+        render_output_example("structred", {}, output_model)
@@ -0,0 +1,87 @@
+"""
+test_providers.py
+
+Tests the provider registry: registering and looking up providers, and loading the
+provider modules named in `PROVIDER_MODULES`.
+"""
+
+import sys
+
+import pytest
+
+from src.lib import providers
+from src.lib.politeness import politeness_scheduler
+from src.lib.providers import Provider, get_provider, load_providers, register_provider
+from src.typings import KayakControllerOutput
+
+PLUGIN_MODULE = """
+from src.lib.providers import Provider, register_provider
+from src.typings import KayakControllerOutput
+
+register_provider(
+    Provider(
+        name="momondo",
+        domain="www.momondo.com",
+        build_url=lambda *args: "https://www.momondo.com/flight-search",
+        build_task=lambda url, departure, destination: f"Search {url}",
+        output_model=KayakControllerOutput,
+        is_searched_by_default=False,
+    )
+)
+"""
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """
+    Give the test its own provider registry, loaded from the built-in providers.
+    """
+
+    built_in = dict(load_providers())
+    monkeypatch.setattr(providers, "PROVIDERS", built_in)
+    monkeypatch.setattr(providers, "circuit_breakers", {})
+    monkeypatch.setattr(
+        politeness_scheduler, "min_intervals", dict(politeness_scheduler.min_intervals)
+    )
+    load_providers.cache_clear()
+    yield built_in
+    load_providers.cache_clear()
+
+
+def make_provider(name: str) -> Provider:
+    return Provider(
+        name=name,
+        domain=f"www.{name}.com",
+        build_url=lambda *args: f"https://www.{name}.com/flights",
+        build_task=lambda url, departure, destination: f"Search {url}",
+        output_model=KayakControllerOutput,
+        min_interval_seconds=3.0,
+    )
+
+
+def test_registered_provider_is_looked_up_by_name(registry):
+    provider = register_provider(make_provider("skyscanner"))
+
+    assert get_provider("skyscanner") is provider
+    assert politeness_scheduler.min_intervals["www.skyscanner.com"] == 3.0
+    assert "www.skyscanner.com" in providers.circuit_breakers
+
+
+def test_unknown_provider_is_rejected(registry):
+    with pytest.raises(ValueError, match="Unknown provider: expedia"):
+        get_provider("expedia")
+
+
+def test_provider_modules_are_imported(registry, monkeypatch, tmp_path):
+    (tmp_path / "momondo_provider.py").write_text(PLUGIN_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(providers, "PROVIDER_MODULES", ["momondo_provider"])
+
+    try:
+        loaded = load_providers()
+    finally:
+        sys.modules.pop("momondo_provider", None)
+
+    assert {"google_flights", "kayak", "momondo"} <= set(loaded)
+    assert "momondo" not in providers.get_agent_factories()
+    assert "kayak" in providers.get_agent_factories()
@@ -0,0 +1,171 @@
+"""
+test_resilience.py
+
+Tests the retry backoff and attempts, and the circuit breaker's transitions, with the
+sleep and the clock replaced by fakes.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.lib import resilience
+from src.lib.resilience import CircuitBreaker, RetryPolicy, retry
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Replace the backoff sleep; returns the list of delays slept.
+    """
+
+    delays = []
+
+    async def fake_sleep(seconds: float) -> None:
+        delays.append(seconds)
+
+    monkeypatch.setattr(resilience, "asyncio", SimpleNamespace(sleep=fake_sleep))
+    return delays
+
+
+@pytest.mark.parametrize(
+    "attempt, bound", [(1, 2.0), (2, 4.0), (3, 8.0), (4, 10.0), (10, 10.0)]
+)
+def test_backoff_is_full_jitter_up_to_the_capped_bound(monkeypatch, attempt, bound):
+    policy = RetryPolicy(base_delay_seconds=2.0, max_delay_seconds=10.0)
+    drawn = []
+    monkeypatch.setattr(
+        resilience.random,
+        "uniform",
+        lambda low, high: drawn.append((low, high)) or high,
+    )
+
+    assert policy.backoff(attempt) == bound
+    assert drawn == [(0, bound)]
+
+
+def test_backoff_stays_within_its_bounds():
+    policy = RetryPolicy(base_delay_seconds=2.0, max_delay_seconds=10.0)
+
+    assert all(0 <= policy.backoff(3) <= 8.0 for _ in range(200))
+
+
+def test_failing_attempts_are_retried_and_the_last_error_raised(sleeps):
+    attempts = []
+
+    async def attempt(number: int) -> None:
+        attempts.append(number)
+        raise RuntimeError(f"attempt {number} failed")
+
+    with pytest.raises(RuntimeError, match="attempt 3 failed"):
+        asyncio.run(retry(RetryPolicy(max_attempts=3), attempt))
+
+    assert attempts == [1, 2, 3]
+    assert len(sleeps) == 2
+
+
+def test_incomplete_values_are_retried_until_complete(sleeps):
+    async def attempt(number: int) -> int:
+        return number
+
+    assert (
+        asyncio.run(retry(RetryPolicy(max_attempts=5), attempt, lambda n: n == 2)) == 2
+    )
+    assert len(sleeps) == 1
+
+
+def test_last_incomplete_value_is_returned(sleeps):
+    async def attempt(number: int) -> int:
+        return number
+
+    assert (
+        asyncio.run(retry(RetryPolicy(max_attempts=2), attempt, lambda n: False)) == 2
+    )
+
+
+def test_circuit_opens_at_the_threshold_and_refuses_runs(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.is_open
+    assert not breaker.allow()
+    clock.now += 59
+    assert not breaker.allow()
+    assert breaker.retry_after() == pytest.approx(1)
+
+
+def test_single_trial_run_after_the_reset(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    clock.now += 60
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    clock.now += 60
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert not breaker.is_open
+    assert breaker.failures == 0
+    assert breaker.allow()
+    assert breaker.allow()
+
+
+def test_failed_trial_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 60
+    breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.is_open
+    assert not breaker.allow()
+    clock.now += 60
+    assert breaker.allow()
+
+
+def test_trial_that_never_reports_back_is_replaced(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    clock.now += 60
+    breaker.allow()
+
+    clock.now += 30
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+
+
+def test_zero_threshold_never_opens(clock):
+    breaker = CircuitBreaker(failure_threshold=0, reset_seconds=60)
+    for _ in range(10):
+        breaker.record_failure()
+
+    assert breaker.allow()
@@ -0,0 +1,66 @@
+"""
+test_resource_blocking.py
+
+Tests which requests the Kayak and Google Flights resource profiles block, and which
+hosts count as first-party.
+"""
+
+import pytest
+
+from src.providers.google_flights import GOOGLE_FLIGHTS_RESOURCE_PROFILE
+from src.providers.kayak import KAYAK_RESOURCE_PROFILE
+
+
+@pytest.mark.parametrize(
+    "resource_type, url, is_blocked",
+    [
+        ("image", "https://www.kayak.com/logo.png", True),
+        ("media", "https://www.kayak.com/hero.mp4", True),
+        ("font", "https://content.r9cdn.net/fonts/kayak.woff2", True),
+        ("document", "https://www.kayak.com/flights/SFO-JFK/2025-10-10", False),
+        ("xhr", "https://www.kayak.com/api/search/poll", False),
+        ("stylesheet", "https://content.r9cdn.net/res/combined.css", False),
+        ("script", "https://www.googletagmanager.com/gtm.js", True),
+        ("xhr", "https://stats.g.doubleclick.net/collect", True),
+        ("ping", "https://bat.bing.com/action/0", True),
+        ("script", "https://STATIC.CRITEO.NET/js/ld/publishertag.js", True),
+        ("script", "https://www.kayak.com/res/search.js", False),
+        ("script", "https://content.r9cdn.net/res/combined.js", False),
+        ("script", "https://kayak.com/res/search.js", False),
+        ("script", "https://cdn.example-ads.com/tag.js", True),
+        ("script", "https://notkayak.com/res/search.js", True),
+        ("stylesheet", "https://cdn.example-ads.com/tag.css", False),
+    ],
+)
+def test_kayak_requests(resource_type, url, is_blocked):
+    assert KAYAK_RESOURCE_PROFILE.is_blocked(resource_type, url) is is_blocked
+
+
+@pytest.mark.parametrize(
+    "url, is_first_party",
+    [
+        ("https://www.kayak.com/flights", True),
+        ("https://kayak.com/flights", True),
+        ("https://content.r9cdn.net/res/combined.js", True),
+        ("https://r9cdn.net/res/combined.js", True),
+        ("https://kayak.com.evil.net/res/search.js", False),
+        ("https://notkayak.com/res/search.js", False),
+        ("data:text/javascript,void(0)", False),
+    ],
+)
+def test_kayak_first_party_hosts(url, is_first_party):
+    assert KAYAK_RESOURCE_PROFILE.is_first_party(url) is is_first_party
+
+
+@pytest.mark.parametrize(
+    "resource_type, url, is_blocked",
+    [
+        ("script", "https://www.google.com/travel/flights/app.js", False),
+        ("script", "https://www.gstatic.com/_/mss/boq-travel/js/main.js", False),
+        ("image", "https://www.gstatic.com/flights/airline_logos/AA.png", True),
+        ("script", "https://www.google-analytics.com/analytics.js", True),
+        ("xhr", "https://adservice.google.com/ddm/fls", True),
+    ],
+)
+def test_google_flights_requests(resource_type, url, is_blocked):
+    assert GOOGLE_FLIGHTS_RESOURCE_PROFILE.is_blocked(resource_type, url) is is_blocked
@@ -0,0 +1,75 @@
+"""
+test_settings.py
+
+Tests that the settings are parsed from the environment by their types, and that the
+`.env` file and the settings are loaded once.
+"""
+
+import pytest
+
+from src import settings
+from src.settings import Settings
+
+
+def test_unset_settings_keep_their_defaults():
+    defaults = Settings.from_environ({})
+
+    assert defaults == Settings()
+    assert defaults.agent_llm == "openai:gpt-4o-mini"
+    assert defaults.headless_window_size == (1280, 800)
+    assert defaults.llm_cache_step_types == ("agent", "extraction")
+
+
+def test_settings_are_parsed_by_type():
+    parsed = Settings.from_environ(
+        {
+            "OPENAI_API_KEY": "sk-test",
+            "OPENAPI_MODEL_NAME": "gpt-4o",
+            "OLLAMA_TEMPERATURE": "0.5",
+            "SERVICE_PORT": "9000",
+            "BROWSER_HEADLESS": "True",
+            "DOM_EXTRACTION_ENABLED": "no",
+            "PROVIDER_MODULES": " plugins.momondo, ,plugins.skyscanner",
+            "HEADLESS_WINDOW_SIZE": "1920x1080",
+            "LLM_CACHE_STEP_TYPES": "",
+        }
+    )
+
+    assert parsed.openai_api_key == "sk-test"
+    assert parsed.agent_llm == "openai:gpt-4o"
+    assert parsed.ollama_temperature == 0.5
+    assert parsed.service_port == 9000
+    assert parsed.browser_headless is True
+    assert parsed.dom_extraction_enabled is False
+    assert parsed.provider_modules == ("plugins.momondo", "plugins.skyscanner")
+    assert parsed.headless_window_size == (1920, 1080)
+    assert parsed.llm_cache_step_types == ()
+
+
+def test_invalid_setting_is_named():
+    with pytest.raises(ValueError, match="SERVICE_PORT='http' is not a valid int"):
+        Settings.from_environ({"SERVICE_PORT": "http"})
+
+
+def test_settings_are_loaded_once(monkeypatch):
+    loads = []
+    monkeypatch.setattr(settings, "load_dotenv", lambda **kwargs: loads.append(1))
+    monkeypatch.setenv("SERVICE_PORT", "9000")
+    settings.get_settings.cache_clear()
+
+    try:
+        assert settings.get_settings() is settings.get_settings()
+        assert settings.get_settings().service_port == 9000
+        assert loads == [1]
+    finally:
+        settings.get_settings.cache_clear()
+
+
+def test_unknown_prompt_mode_is_rejected():
+    with pytest.raises(ValueError, match="PROMPT_MODE='structred' is not one of"):
+        Settings.from_environ({"PROMPT_MODE": "structred"})
+
+
+def test_unknown_history_policy_is_rejected():
+    with pytest.raises(ValueError, match="HISTORY_POLICY='summry' is not one of"):
+        Settings.from_environ({"HISTORY_POLICY": "summry"})
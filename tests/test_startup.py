@@ -0,0 +1,41 @@
+"""
+test_startup.py
+
+Tests, under `python -X importtime` in fresh interpreters, that only building an
+agent imports browser-use, LangChain's OpenAI client, OpenAI or Playwright, and that
+every entry point together loads the `.env` file once.
+"""
+
+import pytest
+
+from benchmarks.bench_startup import (
+    COUNT_DOTENV_LOADS,
+    ENTRY_POINTS,
+    HEAVY_PACKAGES,
+    start,
+)
+
+
+@pytest.mark.parametrize(
+    "arguments, runs_agent",
+    [(arguments, runs_agent) for _, arguments, runs_agent in ENTRY_POINTS],
+    ids=[name for name, _, _ in ENTRY_POINTS],
+)
+def test_heavy_packages_are_imported_only_to_run_an_agent(arguments, runs_agent):
+    _, imports, _ = start(arguments)
+
+    heavy = {
+        module.split(".")[0]
+        for module in imports
+        if module.split(".")[0] in HEAVY_PACKAGES
+    }
+    if runs_agent:
+        assert "browser_use" in heavy
+    else:
+        assert not heavy
+
+
+def test_dotenv_is_loaded_once():
+    _, _, loads = start(["-c", COUNT_DOTENV_LOADS])
+
+    assert loads.strip() == "1"
@@ -0,0 +1,80 @@
+"""
+test_sweep.py
+
+Tests the reduction of sweep results to prices, and that a price calendar that cannot
+be read falls back to per-date searches, with the provider runs replaced by fakes.
+"""
+
+import asyncio
+import json
+
+from src.lib import sweep
+from src.typings import FlightQuery, ProviderRunResult
+
+QUERY = FlightQuery(departure="SFO", destination="JFK", date="2025-10-10")
+
+
+def kayak_result(*prices: str) -> str:
+    flight = {
+        "departure": "7:40 am",
+        "arrival": "4:12 pm",
+        "duration": "5h 32m",
+        "route": "SFO-JFK",
+        "cabin": "Economy",
+    }
+    flights = [{**flight, "price": price} for price in prices]
+    return json.dumps({"airlines": [{"name": "JetBlue", "flights": flights}]})
+
+
+def run_result(provider: str, result: str, query: FlightQuery = QUERY):
+    return ProviderRunResult(
+        provider=provider, query=query, result=result, elapsed_seconds=1.0
+    )
+
+
+def test_cheapest_price_is_taken_in_one_currency():
+    prices = sweep.flight_sweep_prices(
+        run_result("kayak", kayak_result("$407", "€350", "$390"))
+    )
+
+    assert [(price.price_cents, price.currency) for price in prices] == [(39000, "USD")]
+
+
+def test_unreadable_calendar_has_no_prices():
+    invalid = run_result("kayak_flexible_dates", '{"prices": "none"}')
+
+    assert sweep.calendar_sweep_prices("kayak", invalid, [QUERY.date]) == []
+
+
+def test_unreadable_calendar_falls_back_to_date_searches(monkeypatch):
+    searched = []
+
+    async def fake_run_provider(
+        provider, agent_factory, departure, destination, date, *_
+    ):
+        searched.append((provider, date))
+        query = FlightQuery(departure=departure, destination=destination, date=date)
+        if provider == "kayak_flexible_dates":
+            return run_result(provider, "Sorry, the grid did not load", query)
+        return run_result(provider, kayak_result("$407"), query)
+
+    monkeypatch.setattr(sweep, "run_provider", fake_run_provider)
+
+    prices, run_results = asyncio.run(
+        sweep.run_sweep(
+            "SFO", "JFK", QUERY.date, flex_days=1, providers={"kayak": None}
+        )
+    )
+
+    assert sorted(searched) == [
+        ("kayak", "2025-10-09"),
+        ("kayak", "2025-10-10"),
+        ("kayak", "2025-10-11"),
+        ("kayak_flexible_dates", "2025-10-12"),
+    ]
+    assert sorted(price.date for price in prices) == [
+        "2025-10-09",
+        "2025-10-10",
+        "2025-10-11",
+    ]
+    assert len(run_results) == 4